@@ -1,9 +1,6 @@
-from collections import namedtuple
-
-import pygame
-import os
+# Game and layout constants only -- images and fonts are loaded on demand by src/gui/assets.py, so importing this module needs no display.
 
-pygame.font.init()
+from collections import namedtuple
 
 # --- colors
 
@@ -21,23 +18,19 @@ WIDTH = 700
 HEIGHT = 700
 FPS = 60
 PADDING = 20
+COMPUTER_MOVE_DELAY = 500 # ms, minimum time between the start of the computer's turn and its move being shown
+HARD_TIME_BUDGET = 2 # s, the HARD level searches less deep on the boards where its full depth would take longer
 
-BACKGROUND_SCROLL_IMAGE = pygame.image.load(os.path.join("gui", "assets", "Scroll_background.png"))
-BACKGROUND_SCROLL = pygame.transform.scale(BACKGROUND_SCROLL_IMAGE, (WIDTH - 2 * PADDING, HEIGHT - 2 * PADDING))
-
-UPDATE_RECTANGLE = pygame.rect.Rect(PADDING * 3, PADDING * 2, BACKGROUND_SCROLL.get_width() - 4 * PADDING, BACKGROUND_SCROLL.get_height() - 2 * PADDING)
+# part of the background scroll (WIDTH - 2 * PADDING by HEIGHT - 2 * PADDING, drawn at (PADDING, PADDING)) that holds the menus
+UPDATE_RECTANGLE = (PADDING * 3, PADDING * 2, WIDTH - 6 * PADDING, HEIGHT - 4 * PADDING)
 
 # --- board
 
+# any size works (the engine is not tied to 4 x 4), the board image is only used for 4 x 4 and a grid is drawn for the other sizes
 ROWS = 4
 COLUMNS = 4
-CELL_SIZE = WIDTH // COLUMNS
+CELL_SIZE = min(WIDTH // COLUMNS, HEIGHT // ROWS)
 CELL_BORDER_COLOR = WHITE
-MAXIMUM_NUMBER_PIECES = 8
-PIECE_RADIUS = CELL_SIZE // 2 - 2 * PADDING
-
-BOARD_IMAGE = pygame.image.load(os.path.join("gui", "assets", "Board.png"))
-BOARD = pygame.transform.scale(BOARD_IMAGE, (WIDTH, HEIGHT))
 
 # --- players
 
@@ -51,28 +44,14 @@ PLAYER_PIECE_COLOR = WHITE
 PLAYER_ACTIVE_PIECE_BORDER_COLOR = BLACK
 PLAYER_BOARD_COLOR = RED
 
-PLAYER_PIECE_IMAGE = pygame.image.load(os.path.join("gui", "assets", "White_piece.png"))
-PLAYER_PIECE = pygame.transform.scale(PLAYER_PIECE_IMAGE, (CELL_SIZE, CELL_SIZE))
-
-
 COMPUTER_PIECE_COLOR = BLACK
 COMPUTER_BOARD_COLOR = BLUE
 
-COMPUTER_PIECE_IMAGE = pygame.image.load(os.path.join("gui", "assets", "Black_piece.png"))
-COMPUTER_PIECE = pygame.transform.scale(COMPUTER_PIECE_IMAGE, (CELL_SIZE, CELL_SIZE))
-
 # --- texts
-FONT_NAME_PATH = os.path.join("gui", "assets", "KozGoPro-Light.otf")
 FONT_COLOR = '#26160F'
 MENU_SPACING = 50
 TEXT_SPACING = 10
 
-TITLE_FONT = pygame.font.Font(os.path.join("gui", "assets", "VINERITC.TTF"), 60)
-BUTTON_FONT = pygame.font.Font(FONT_NAME_PATH, 30)
-TEXT_FONT = pygame.font.Font(FONT_NAME_PATH, 17)
-PLAYER_TURN_FONT = pygame.font.Font(FONT_NAME_PATH, 40)
-SYMBOLS_FONT = pygame.font.SysFont("segoeuisymbol",30)
-
 PLAY_BUTTON_TEXT = "PLAY"
 RULES_BUTTON_TEXT = "RULES"
 QUIT_BUTTON_TEXT = "QUIT"
@@ -97,11 +76,4 @@ RULES_LINE_LENGTH = 60
 
 PLAYER_TURN_TEXT = "You start first with"
 COMPUTER_TURN_TEXT = "Computer starts first with"
-
-# --- winner/loser banners
-
-WINNER_BANNER_IMAGE = pygame.image.load(os.path.join("gui", "assets", "Winner_sign.png"))
-WINNER_BANNER = pygame.transform.scale_by(WINNER_BANNER_IMAGE, (3 * HEIGHT) / (4 * WINNER_BANNER_IMAGE.get_height()))
-
-LOSER_BANNER_IMAGE = pygame.image.load(os.path.join("gui", "assets", "Loser_sign.png"))
-LOSER_BANNER = pygame.transform.scale_by(LOSER_BANNER_IMAGE, (3 * HEIGHT) / (4 * LOSER_BANNER_IMAGE.get_height()))
\ No newline at end of file
+THINKING_TEXT = "Computer is thinking"
\ No newline at end of file
@@ -20,6 +20,11 @@ class IncorrectBoardMoveError(BoardError):
         self.__message = "Incorrect move, try again"
         super().__init__(self.__message)
 
+class NoValidMoveError(BoardError):
+    def __init__(self):
+        self.__message = "No valid move left"
+        super().__init__(self.__message)
+
 class GameOver(BoardError):
     def __init__(self, symbol):
         if symbol == 'O':
@@ -27,6 +32,14 @@ class GameOver(BoardError):
         else:
             super().__init__("You lost :(")
 
+# --- search
+
+class SearchTimeout(Exception):
+    """
+    Stops a computer search that used up its time or node budget.
+    """
+    pass
+
 # --- gui error
 
 class GUIGoToTitleWindow(Exception):
@@ -0,0 +1,110 @@
+import os
+
+import pygame
+
+from src.constants import WIDTH, HEIGHT, PADDING, CELL_BORDER_COLOR
+
+ASSETS_DIRECTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), "assets")
+
+# --- asset names
+
+BACKGROUND_SCROLL = "background_scroll"
+BOARD = "board"
+PLAYER_PIECE = "player_piece"
+COMPUTER_PIECE = "computer_piece"
+WINNER_BANNER = "winner_banner"
+LOSER_BANNER = "loser_banner"
+
+TITLE_FONT = "title_font"
+BUTTON_FONT = "button_font"
+TEXT_FONT = "text_font"
+PLAYER_TURN_FONT = "player_turn_font"
+SYMBOLS_FONT = "symbols_font"
+
+FONT_NAME_PATH = os.path.join(ASSETS_DIRECTORY, "KozGoPro-Light.otf")
+
+
+class AssetRegistry(object):
+    """
+    Surfaces and fonts of the GUI, each one is loaded (and scaled) the first time it is asked for and kept for the next calls.
+    Assets that depend on the board size are asked for with their size as arguments (always all of them, the arguments are part of the
+    key the asset is kept under), every size is kept apart.
+    """
+    def __init__(self):
+        self.__loaders = {}
+        self.__assets = {}
+
+    def register(self, name, loader):
+        """
+        :param name: name of the asset
+        :param loader: function that loads the asset, it is given the arguments of get()
+        :return: None
+        """
+        self.__loaders[name] = loader
+
+    def get(self, name, *arguments):
+        asset = self.__assets.get((name, arguments))
+
+        if asset is None:
+            asset = self.__loaders[name](*arguments)
+            self.__assets[(name, arguments)] = asset
+
+        return asset
+
+
+def get_cell_size(rows, columns):
+    """
+    :return: side in pixels of the cells of a board with 'rows' rows and 'columns' columns, the largest that fits in the window
+    """
+    return min(WIDTH // columns, HEIGHT // rows)
+
+
+def load_image(file_name):
+    return pygame.image.load(os.path.join(ASSETS_DIRECTORY, file_name))
+
+
+def load_font(file_path, size):
+    pygame.font.init()
+    return pygame.font.Font(file_path, size)
+
+
+def load_banner(file_name):
+    banner_image = load_image(file_name)
+    return pygame.transform.scale_by(banner_image, (3 * HEIGHT) / (4 * banner_image.get_height()))
+
+
+def load_board(rows, columns):
+    board_image = pygame.transform.scale(load_image("Board.png"), (WIDTH, HEIGHT))
+    if (rows, columns) == (4, 4):
+        return board_image
+
+    # the image shows a 4 x 4 grid: other sizes get its colour with their own grid
+    cell_size = get_cell_size(rows, columns)
+    board = pygame.Surface((WIDTH, HEIGHT))
+    board.fill(pygame.transform.average_color(board_image))
+    for row in range(rows):
+        for column in range(columns):
+            pygame.draw.rect(board, CELL_BORDER_COLOR, (column * cell_size, row * cell_size, cell_size, cell_size), 2)
+
+    return board
+
+
+def load_symbols_font():
+    pygame.font.init()
+    return pygame.font.SysFont("segoeuisymbol", 30)
+
+
+ASSETS = AssetRegistry()
+
+ASSETS.register(BACKGROUND_SCROLL, lambda: pygame.transform.scale(load_image("Scroll_background.png"), (WIDTH - 2 * PADDING, HEIGHT - 2 * PADDING)))
+ASSETS.register(BOARD, load_board)
+ASSETS.register(PLAYER_PIECE, lambda cell_size: pygame.transform.scale(load_image("White_piece.png"), (cell_size, cell_size)))
+ASSETS.register(COMPUTER_PIECE, lambda cell_size: pygame.transform.scale(load_image("Black_piece.png"), (cell_size, cell_size)))
+ASSETS.register(WINNER_BANNER, lambda: load_banner("Winner_sign.png"))
+ASSETS.register(LOSER_BANNER, lambda: load_banner("Loser_sign.png"))
+
+ASSETS.register(TITLE_FONT, lambda: load_font(os.path.join(ASSETS_DIRECTORY, "VINERITC.TTF"), 60))
+ASSETS.register(BUTTON_FONT, lambda: load_font(FONT_NAME_PATH, 30))
+ASSETS.register(TEXT_FONT, lambda: load_font(FONT_NAME_PATH, 17))
+ASSETS.register(PLAYER_TURN_FONT, lambda: load_font(FONT_NAME_PATH, 40))
+ASSETS.register(SYMBOLS_FONT, load_symbols_font)
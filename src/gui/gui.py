@@ -1,54 +1,71 @@
 import sys
+import threading
 import pygame
 import random
+from concurrent.futures import Future
 
 from src.services.board import Board
-from src.exceptions import GameOver, BoardError, GUIGoToTitleWindow
+from src.exceptions import GameOver, BoardError, GUIGoToTitleWindow, NoValidMoveError
 from src.services.game import Game
+from src.services.game_record import GameRecordWriter
 from src.gui.window_first_player import FirstPlayerWindow
-from src.constants import (ROWS, COLUMNS, COMPUTER_SYMBOL, PLAYER_SYMBOL, EMPTY_CELL_SYMBOL, WIDTH, HEIGHT, FPS, PLAYER_PIECE_COLOR, COMPUTER_PIECE_COLOR, PADDING, CELL_SIZE,
-                           GAME_TITLE, PLAY_BUTTON_TEXT, RULES_BUTTON_TEXT, WINNER_BANNER, LOSER_BANNER, BACKGROUND_SCROLL, BLACK, OPACITY_VALUE, HOVERING_SYMBOL, SYMBOLS_FONT)
+from src.constants import (COMPUTER_SYMBOL, PLAYER_SYMBOL, EMPTY_CELL_SYMBOL, WIDTH, HEIGHT, FPS, PLAYER_PIECE_COLOR, COMPUTER_PIECE_COLOR, PADDING,
+                           GAME_TITLE, PLAY_BUTTON_TEXT, RULES_BUTTON_TEXT, BLACK, OPACITY_VALUE, HOVERING_SYMBOL,
+                           COMPUTER_MOVE_DELAY, THINKING_TEXT, FONT_COLOR)
+from src.gui.assets import ASSETS, WINNER_BANNER, LOSER_BANNER, BACKGROUND_SCROLL, SYMBOLS_FONT, TEXT_FONT, get_cell_size
 from src.gui.window_levels import LevelsWindow
 from src.gui.window_rules import RulesWindow
 from src.gui.sprites import BoardDrawing, Piece
 from src.gui.window_title import TitleWindow
 
 class GUI(object):
-    def __init__(self):
+    def __init__(self, game_records_path = None, board: Board = None):
+        """
+        :param game_records_path: file the finished games are appended to (src/services/game_record.py), None to keep no records
+        :param board: board to play on, None for a ROWS x COLUMNS board -- the grid and the pieces are drawn for its size
+        """
         self.__width = WIDTH
         self.__height = HEIGHT
         self.__window = pygame.display.set_mode((self.__width, self.__height))
         pygame.display.set_caption(GAME_TITLE)
 
-        pygame.display.set_icon(SYMBOLS_FONT.render(HOVERING_SYMBOL, 1, BLACK))
+        pygame.display.set_icon(ASSETS.get(SYMBOLS_FONT).render(HOVERING_SYMBOL, 1, BLACK))
 
-        self.__board = Board()
+        self.__board = board if board is not None else Board()
+        self.__cell_size = get_cell_size(self.__board.rows, self.__board.columns)
         self.__game = None
+        self.__game_records_path = game_records_path
         self.__pieces = []
         self.__load_pieces()
 
-        self.__board_drawing = BoardDrawing(self.__window)
-        self.__levels_window = LevelsWindow(self.__window)
+        self.__board_drawing = BoardDrawing(self.__window, self.__board.rows, self.__board.columns)
         self.__title_window = TitleWindow(self.__window)
-        self.__rules_window = RulesWindow(self.__window)
-        self.__first_player_window = FirstPlayerWindow(self.__window)
+        # created when first shown, so their fonts are only loaded if needed
+        self.__levels_window = None
+        self.__rules_window = None
+        self.__first_player_window = None
 
         self.__player_turn = random.choice([True, False])
 
+        self.__computer_move_future = None
+        self.__computer_turn_start = 0
+        self.__thinking_text = None
+        self.__thinking_text_draw = None
+
     def __load_pieces(self):
         self.__pieces.clear()
 
-        for row in range(ROWS):
-            for column in range(COLUMNS):
+        for row in range(self.__board.rows):
+            for column in range(self.__board.columns):
                 if self.__board.get_board_symbol(row, column) == COMPUTER_SYMBOL:
-                    self.__pieces.append(Piece(self.__window, column * CELL_SIZE, row * CELL_SIZE, COMPUTER_PIECE_COLOR))
+                    self.__pieces.append(Piece(self.__window, column * self.__cell_size, row * self.__cell_size, COMPUTER_PIECE_COLOR, self.__cell_size))
                 elif self.__board.get_board_symbol(row, column) == PLAYER_SYMBOL:
-                    self.__pieces.append(Piece(self.__window, column * CELL_SIZE, row * CELL_SIZE, PLAYER_PIECE_COLOR))
+                    self.__pieces.append(Piece(self.__window, column * self.__cell_size, row * self.__cell_size, PLAYER_PIECE_COLOR, self.__cell_size))
 
     def open_game_application(self):
-        self.__draw()
+        self.__redraw_board()
         self.__dim_screen()
-        self.__window.blit(BACKGROUND_SCROLL, (PADDING, PADDING))
+        self.__window.blit(ASSETS.get(BACKGROUND_SCROLL), (PADDING, PADDING))
         pygame.display.update()
 
         self.__show_title_window()
@@ -65,10 +82,17 @@ class GUI(object):
             self.__show_rules_window()
 
     def __show_rules_window(self):
+        if self.__rules_window is None:
+            self.__rules_window = RulesWindow(self.__window)
+
         self.__rules_window.show_rules()
         self.__show_title_window()
 
     def __show_levels_window(self):
+        if self.__levels_window is None:
+            self.__levels_window = LevelsWindow(self.__window)
+            self.__first_player_window = FirstPlayerWindow(self.__window)
+
         try:
             computer_strategy = self.__levels_window.choose_level()
             self.__game = Game(self.__board, computer_strategy(self.__board))
@@ -90,10 +114,12 @@ class GUI(object):
 
         clock = pygame.time.Clock()
 
+        # the menus were drawn over the board
+        self.__board_drawing.mark_all_dirty()
+
         run = True
         while run:
             clock.tick(FPS)
-            pygame.display.update()
 
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
@@ -106,8 +132,8 @@ class GUI(object):
 
                     if chose_active_piece == True and self.__adjacent_empty_cell_clicked(mouse_x, mouse_y, active_piece):
                         # move active piece to adjacent empty cell
-                        adjacent_cell_x = (mouse_x // CELL_SIZE) * CELL_SIZE
-                        adjacent_cell_y = (mouse_y // CELL_SIZE) * CELL_SIZE
+                        adjacent_cell_x = (mouse_x // self.__cell_size) * self.__cell_size
+                        adjacent_cell_y = (mouse_y // self.__cell_size) * self.__cell_size
 
                         self.__move_to_adjacent_cell(active_piece, adjacent_cell_x, adjacent_cell_y)
 
@@ -148,22 +174,48 @@ class GUI(object):
 
                             piece_index += 1
 
-            if self.__player_turn == False:
-                pygame.time.delay(500)
+            computer_thinking = False
 
-                self.__computer_turn()
-                self.__player_turn = True
+            if self.__player_turn == False:
+                if self.__computer_move_future is None:
+                    self.__computer_move_future = self.__start_computer_move()
+                    self.__computer_turn_start = pygame.time.get_ticks()
+
+                # the move is shown at least COMPUTER_MOVE_DELAY ms after the turn started, even if the search finished earlier
+                if self.__computer_move_future.done() and pygame.time.get_ticks() - self.__computer_turn_start >= COMPUTER_MOVE_DELAY:
+                    computer_move_future = self.__computer_move_future
+                    self.__computer_move_future = None
+
+                    try:
+                        piece_position, move_position = computer_move_future.result()
+                    except NoValidMoveError:
+                        # the computer cannot move, the player wins
+                        self.__redraw_board()
+                        self.__draw_winner(PLAYER_SYMBOL)
+                        run = False
+                    else:
+                        self.__computer_turn(piece_position, move_position)
+                        self.__player_turn = True
 
-                if self.__is_game_won():
-                    run = False
+                        if self.__is_game_won():
+                            run = False
+                else:
+                    computer_thinking = True
 
-            self.__draw()
+            # only the changed areas are pushed to the screen
+            updated_rects = self.__draw(self.__thinking_indicator(computer_thinking))
+            if run and len(updated_rects) != 0:
+                pygame.display.update(updated_rects)
 
         self.__restart_game()
 
     def __is_empty_cell(self, mouse_x, mouse_y):
-        row = mouse_y // CELL_SIZE
-        column = mouse_x // CELL_SIZE
+        row = mouse_y // self.__cell_size
+        column = mouse_x // self.__cell_size
+
+        if row >= self.__board.rows or column >= self.__board.columns:
+            # the window is larger than the board when the board is not square
+            return False
 
         if self.__board.get_board_symbol(row, column) == EMPTY_CELL_SYMBOL:
             return True
@@ -174,29 +226,16 @@ class GUI(object):
         if not self.__is_empty_cell(mouse_x, mouse_y):
             return False
 
-        if piece.y < mouse_y < (piece.y + CELL_SIZE): # same row
-            if (piece.x - CELL_SIZE) < mouse_x < piece.x: # left cell
-                return True
-            elif (piece.x + CELL_SIZE) < mouse_x < (piece.x + 2 * CELL_SIZE): # right cell
-                return True
-
-        elif piece.x < mouse_x < (piece.x + CELL_SIZE): # same column
-            if (piece.y - CELL_SIZE) < mouse_y < piece.y: # top cell
-                return True
-            elif (piece.y + CELL_SIZE) < mouse_y < (piece.y + 2 * CELL_SIZE): # bottom cell
-                return True
-
-        return False
+        # orthogonal neighbour of the piece, from the precomputed move tables of the board
+        geometry = self.__board.geometry
+        return geometry.index(mouse_y // self.__cell_size, mouse_x // self.__cell_size) in geometry.steps[geometry.index(piece.row, piece.column)]
 
     def __move_to_adjacent_cell(self, active_piece, adjacent_cell_x, adjacent_cell_y):
         try:
-            self.__game.player_move(active_piece.row, active_piece.column, adjacent_cell_y // CELL_SIZE, adjacent_cell_x // CELL_SIZE)
+            self.__game.player_move(active_piece.row, active_piece.column, adjacent_cell_y // self.__cell_size, adjacent_cell_x // self.__cell_size)
             active_piece.x, active_piece.y = adjacent_cell_x, adjacent_cell_y
             active_piece.set_active_state(True)
             self.__player_turn = False
-
-            self.__draw()
-            pygame.display.update()
         except BoardError:
             pass
 
@@ -206,26 +245,42 @@ class GUI(object):
             active_piece.x = opponent_piece.x
             active_piece.y = opponent_piece.y
             self.__pieces.remove(opponent_piece)
+            self.__board_drawing.mark_dirty(opponent_piece.rect)
             active_piece.set_active_state(True)
             self.__player_turn = False
-
-            self.__draw()
-            pygame.display.update()
         except BoardError:
             pass
 
-    def __computer_turn(self):
-        piece_position, move_position = self.__game.computer_move()
+    def __start_computer_move(self):
+        """
+        Let the computer strategy search for its move on a worker thread, so the game window keeps handling events and drawing meanwhile.
+        The player cannot touch the board until the move is done.
+        :return: Future with the (piece_position, move_position) played by the computer
+        """
+        future = Future()
+
+        def computer_move():
+            try:
+                future.set_result(self.__game.computer_move())
+            except BaseException as error:
+                future.set_exception(error)
+
+        # daemon thread: closing the window does not wait for the search to end
+        threading.Thread(target=computer_move, daemon=True).start()
+
+        return future
 
-        for piece in self.__pieces:
+    def __computer_turn(self, piece_position, move_position):
+        for piece in self.__pieces[:]:
             if piece.row == move_position.x and piece.column == move_position.y and piece.color == PLAYER_PIECE_COLOR:
                 self.__pieces.remove(piece)
+                self.__board_drawing.mark_dirty(piece.rect)
 
             elif piece.row == piece_position.x and piece.column == piece_position.y and piece.color == COMPUTER_PIECE_COLOR:
                 active_piece = piece
 
-                active_piece.x = move_position.y * CELL_SIZE
-                active_piece.y = move_position.x * CELL_SIZE
+                active_piece.x = move_position.y * self.__cell_size
+                active_piece.y = move_position.x * self.__cell_size
 
     def __is_game_won(self):
         if self.__player_turn == False:
@@ -237,7 +292,7 @@ class GUI(object):
             self.__board.is_board_won(symbol)
             return False
         except GameOver:
-            self.__draw()
+            self.__redraw_board()
             self.__draw_winner(symbol)
             return True
 
@@ -245,26 +300,67 @@ class GUI(object):
         self.__dim_screen()
 
         if symbol == PLAYER_SYMBOL:
-            self.__window.blit(WINNER_BANNER, (WIDTH // 2 - WINNER_BANNER.get_width() // 2, HEIGHT // 2 - WINNER_BANNER.get_height() // 2))
+            banner = ASSETS.get(WINNER_BANNER)
         else:
-            self.__window.blit(LOSER_BANNER, (WIDTH // 2 - LOSER_BANNER.get_width() // 2, HEIGHT // 2 - LOSER_BANNER.get_height() // 2))
+            banner = ASSETS.get(LOSER_BANNER)
+
+        self.__window.blit(banner, (WIDTH // 2 - banner.get_width() // 2, HEIGHT // 2 - banner.get_height() // 2))
 
         pygame.display.update()
         pygame.time.delay(5000)
 
-    def __draw(self):
-        self.__board_drawing.draw()
+    def __thinking_indicator(self, computer_thinking):
+        """
+        Animated "thinking" text shown while the computer searches, its area is only redrawn when the text changes.
+        :param computer_thinking: True if the computer is searching for its move
+        :return: list of overlays to draw over the board
+        """
+        thinking_text = None
+        if computer_thinking:
+            thinking_text = THINKING_TEXT + "." * (pygame.time.get_ticks() // 400 % 4)
+
+        text_width, text_height = ASSETS.get(TEXT_FONT).size(THINKING_TEXT)
+        position = (WIDTH // 2 - text_width // 2, HEIGHT - PADDING - text_height)
+
+        if thinking_text != self.__thinking_text:
+            self.__thinking_text = thinking_text
+            self.__board_drawing.mark_dirty(pygame.Rect(position, ASSETS.get(TEXT_FONT).size(THINKING_TEXT + "...")))
+
+            if thinking_text is not None:
+                self.__thinking_text_draw = ASSETS.get(TEXT_FONT).render(thinking_text, 1, FONT_COLOR)
 
-        for piece in self.__pieces:
-            piece.draw()
+        if self.__thinking_text is None:
+            return []
+
+        return [(self.__thinking_text_draw, position)]
+
+    def __draw(self, overlays = ()):
+        """
+        Redraw the parts of the board that changed since the last draw.
+        :return: list with the redrawn rectangles
+        """
+        return self.__board_drawing.draw(self.__pieces, overlays)
+
+    def __redraw_board(self):
+        self.__board_drawing.mark_all_dirty()
+        self.__draw()
+
+    def __save_game_record(self):
+        if self.__game_records_path is None or self.__game is None or len(self.__game.history) == 0:
+            return
+
+        with GameRecordWriter(self.__game_records_path) as writer:
+            writer.write(self.__game.get_record())
 
     def __restart_game(self):
+        self.__save_game_record()
+
         self.__board.load_start_board()
         self.__load_pieces()
 
-        self.__draw()
+        self.__redraw_board()
         self.__dim_screen()
-        self.__window.blit(BACKGROUND_SCROLL, (PADDING, PADDING))
+        self.__window.blit(ASSETS.get(BACKGROUND_SCROLL), (PADDING, PADDING))
         pygame.display.update()
 
         self.__player_turn = random.choice([True, False])
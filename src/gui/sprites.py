@@ -1,19 +1,81 @@
-from src.constants import BOARD, ROWS, COLUMNS, PADDING, CELL_SIZE, PLAYER_PIECE_COLOR, PLAYER_PIECE, COMPUTER_PIECE_COLOR, COMPUTER_PIECE
+import pygame
+
+from src.constants import ROWS, COLUMNS, PADDING, CELL_SIZE, PLAYER_PIECE_COLOR, COMPUTER_PIECE_COLOR
+from src.gui.assets import ASSETS, BOARD, PLAYER_PIECE, COMPUTER_PIECE
 
 
 class BoardDrawing(object):
-    def __init__(self, window):
-        self.__rows = ROWS
-        self.__columns = COLUMNS
+    """
+    Draws the board and its pieces with dirty rectangles: only the areas touched since the last draw (moved, selected or removed pieces)
+    are redrawn, a frame without changes draws nothing.
+    """
+    def __init__(self, window, rows = ROWS, columns = COLUMNS):
+        self.__rows = rows
+        self.__columns = columns
         self.__window = window
+        self.__dirty_rects = []
 
-    def draw(self):
-        self.__window.blit(BOARD, (0, 0))
+    def mark_dirty(self, rect):
+        """
+        Redraw an area at the next draw.
+        :param rect: pygame.Rect of the area
+        :return: None
+        """
+        self.__dirty_rects.append(pygame.Rect(rect))
+
+    def mark_all_dirty(self):
+        """
+        Redraw the whole window at the next draw (after something else was drawn over the board, like a menu or a banner).
+        :return: None
+        """
+        self.mark_dirty(self.__window.get_rect())
+
+    def draw(self, pieces, overlays = ()):
+        """
+        Redraw the dirty areas: the board background and then the pieces and overlays overlapping them, clipped to the area.
+        :param pieces: all the pieces on the board
+        :param overlays: (surface, position) pairs drawn over the pieces, their area has to be marked dirty when they change
+        :return: list with the redrawn rectangles, to be passed to pygame.display.update()
+        """
+        for piece in pieces:
+            self.__dirty_rects.extend(piece.take_dirty_rects())
+
+        window_rect = self.__window.get_rect()
+        updated_rects = []
+
+        # a move reports the same cells more than once (x and y change separately)
+        dirty_rects = [pygame.Rect(rect) for rect in dict.fromkeys(tuple(rect.clip(window_rect)) for rect in self.__dirty_rects)]
+
+        for rect in dirty_rects:
+            if rect.width == 0 or rect.height == 0 or any(other is not rect and other.contains(rect) and other != rect for other in dirty_rects):
+                continue
+
+            self.__window.set_clip(rect)
+            self.__window.blit(ASSETS.get(BOARD, self.__rows, self.__columns), rect, rect)
+
+            for piece in pieces:
+                if rect.colliderect(piece.rect):
+                    piece.draw()
+
+            for surface, position in overlays:
+                if rect.colliderect(surface.get_rect(topleft=position)):
+                    self.__window.blit(surface, position)
+
+            updated_rects.append(rect)
+
+        self.__window.set_clip(None)
+        self.__dirty_rects.clear()
+
+        return updated_rects
 
 
 class Piece(object):
-    def __init__(self, window, x, y, color):
+    def __init__(self, window, x, y, color, cell_size = CELL_SIZE):
+        """
+        :param cell_size: side of the cells of the board in pixels (src/gui/assets.py get_cell_size() of the board size)
+        """
         self.__window = window
+        self.__cell_size = cell_size
 
         # x and y represent the top-left corner's coordinates of the piece image
         self.__x = x
@@ -22,13 +84,18 @@ class Piece(object):
         self.__color = color
         self.__is_active = False
 
+        # areas covered by the piece since it was last drawn
+        self.__dirty_rects = [self.rect]
+
     @property
     def x(self):
         return self.__x
 
     @x.setter
     def x(self, new_x):
+        self.__dirty_rects.append(self.rect)
         self.__x = new_x
+        self.__dirty_rects.append(self.rect)
 
     @property
     def y(self):
@@ -36,7 +103,13 @@ class Piece(object):
 
     @y.setter
     def y(self, new_y):
+        self.__dirty_rects.append(self.rect)
         self.__y = new_y
+        self.__dirty_rects.append(self.rect)
+
+    @property
+    def rect(self):
+        return pygame.Rect(self.__x, self.__y, self.__cell_size, self.__cell_size)
 
     @property
     def color(self):
@@ -45,13 +118,13 @@ class Piece(object):
     @property
     def row(self):
         if self.is_active:
-            return (self.y + PADDING) // CELL_SIZE
+            return (self.y + PADDING) // self.__cell_size
 
-        return self.y // CELL_SIZE
+        return self.y // self.__cell_size
 
     @property
     def column(self):
-        return self.x // CELL_SIZE
+        return self.x // self.__cell_size
 
     @property
     def is_active(self):
@@ -65,14 +138,23 @@ class Piece(object):
 
         self.__is_active = state
 
+    def take_dirty_rects(self):
+        """
+        :return: areas to redraw since the last call (the cells the piece left and the ones it moved to)
+        """
+        dirty_rects = self.__dirty_rects
+        self.__dirty_rects = []
+
+        return dirty_rects
+
     def was_clicked(self, mouse_x, mouse_y):
-        if self.x <= mouse_x <= (self.x + CELL_SIZE) and self.y <= mouse_y <= (self.y + CELL_SIZE):
+        if self.x <= mouse_x <= (self.x + self.__cell_size) and self.y <= mouse_y <= (self.y + self.__cell_size):
             return True
 
         return False
 
     def draw(self):
         if self.__color == PLAYER_PIECE_COLOR:
-            self.__window.blit(PLAYER_PIECE, (self.x, self.y))
+            self.__window.blit(ASSETS.get(PLAYER_PIECE, self.__cell_size), (self.x, self.y))
         elif self.__color == COMPUTER_PIECE_COLOR:
-            self.__window.blit(COMPUTER_PIECE, (self.x, self.y))
\ No newline at end of file
+            self.__window.blit(ASSETS.get(COMPUTER_PIECE, self.__cell_size), (self.x, self.y))
\ No newline at end of file
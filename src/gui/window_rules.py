@@ -1,21 +1,22 @@
 import sys
 import pygame
 
-from src.constants import (PADDING, FPS, RULES_TEXT, BUTTON_FONT, OK_BUTTON_TEXT, FONT_COLOR, HOVERING_SYMBOL, SYMBOLS_FONT, TEXT_FONT, TEXT_SPACING,
-                               MENU_SPACING, RULES_LINE_LENGTH, HEIGHT, WIDTH, BACKGROUND_SCROLL, UPDATE_RECTANGLE, HOVERING_SYMBOL_SPACING)
+from src.constants import (PADDING, FPS, RULES_TEXT, OK_BUTTON_TEXT, FONT_COLOR, HOVERING_SYMBOL, TEXT_SPACING, MENU_SPACING, RULES_LINE_LENGTH, HEIGHT, WIDTH,
+                           UPDATE_RECTANGLE, HOVERING_SYMBOL_SPACING)
+from src.gui.assets import ASSETS, BUTTON_FONT, SYMBOLS_FONT, TEXT_FONT, BACKGROUND_SCROLL
 
 
 class RulesWindow(object):
     def __init__(self, window):
         self.__window = window
 
-        self.__ok_button_draw = BUTTON_FONT.render(OK_BUTTON_TEXT, 1, FONT_COLOR)
+        self.__ok_button_draw = ASSETS.get(BUTTON_FONT).render(OK_BUTTON_TEXT, 1, FONT_COLOR)
         self.__ok_button_rect = pygame.rect.Rect(WIDTH // 2 - self.__ok_button_draw.get_width() // 2, HEIGHT - PADDING - self.__ok_button_draw.get_height() - MENU_SPACING, self.__ok_button_draw.get_width(), self.__ok_button_draw.get_height())
 
-        self.__hovering_symbol_draw = SYMBOLS_FONT.render(HOVERING_SYMBOL, 1, FONT_COLOR)
+        self.__hovering_symbol_draw = ASSETS.get(SYMBOLS_FONT).render(HOVERING_SYMBOL, 1, FONT_COLOR)
 
     def __draw(self):
-        self.__window.blit(BACKGROUND_SCROLL, (PADDING, PADDING))
+        self.__window.blit(ASSETS.get(BACKGROUND_SCROLL), (PADDING, PADDING))
 
         self.__draw__text()
         self.__window.blit(self.__ok_button_draw, (self.__ok_button_rect.x, self.__ok_button_rect.y))
@@ -44,7 +45,7 @@ class RulesWindow(object):
 
         y_position = 4 * PADDING
         for line in to_blit_lines:
-            line_draw = TEXT_FONT.render(str(line), 1, FONT_COLOR)
+            line_draw = ASSETS.get(TEXT_FONT).render(str(line), 1, FONT_COLOR)
             self.__window.blit(line_draw, (WIDTH // 2 - line_draw.get_width() // 2, y_position))
 
             y_position += line_draw.get_height() + TEXT_SPACING
@@ -79,7 +80,7 @@ class RulesWindow(object):
                         pygame.display.update(pygame.rect.Rect(self.__ok_button_rect.x - self.__hovering_symbol_draw.get_width() - HOVERING_SYMBOL_SPACING, self.__ok_button_rect.y - HOVERING_SYMBOL_SPACING, self.__hovering_symbol_draw.get_width(), self.__hovering_symbol_draw.get_height()))
 
                     elif not self.__hovered_ok_button_rect(mouse_x, mouse_y) and already_hovered_button == True:
-                        self.__window.blit(BACKGROUND_SCROLL, (PADDING, PADDING))
+                        self.__window.blit(ASSETS.get(BACKGROUND_SCROLL), (PADDING, PADDING))
                         pygame.display.update(pygame.rect.Rect(self.__ok_button_rect.x - self.__hovering_symbol_draw.get_width() - HOVERING_SYMBOL_SPACING, self.__ok_button_rect.y - HOVERING_SYMBOL_SPACING, self.__hovering_symbol_draw.get_width(), self.__hovering_symbol_draw.get_height()))
                         already_hovered_button = False
 
@@ -0,0 +1,396 @@
+# Asyncio server hosting many human vs computer games at once, one game session per connection.
+#
+#     python -m src.server.game_server [--host 127.0.0.1] [--port 7777] [--unix PATH] [--workers N] [--max-sessions 500] [--queue-size 256]
+#                                      [--records PATH]
+#
+# Line protocol (ASCII, one command or answer per line, positions are 'row column' pairs counted from 0):
+#   NEW <easy|medium|hard> [player|computer]  start a game (the first player is random if not given)
+#                                             -> OK NEW <rows> <columns> <player|computer>, then the computer move if it starts
+#   MOVE <row> <column> <row> <column>        move a player piece -> COMPUTER <row> <column> <row> <column> with the answer of the computer
+#   BOARD                                     -> BOARD <rows separated by '/', 'X' computer, 'O' player, '.' empty>
+#   QUIT                                      -> OK BYE, the connection is closed
+# Any answer can be ERROR <message>, a finished game is announced by GAMEOVER <winner symbol> (after the winning move).
+#
+# The computer moves of all the sessions are searched by one bounded process pool (EnginePool). Requests wait in a bounded FIFO queue: a
+# session has at most one request in it, so the sessions are served in turn. A full queue stops the sessions that want a move from reading
+# their next command, the clients see the usual TCP backpressure. The request of a client that disconnects is cancelled, it only keeps a
+# worker busy if the worker already started it.
+
+import argparse
+import asyncio
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+from src.constants import COMPUTER_SYMBOL, PLAYER_SYMBOL, EMPTY_CELL_SYMBOL, HARD_TIME_BUDGET, POSITION
+from src.exceptions import BoardError, NoValidMoveError
+from src.services.board import Board
+from src.services.game import Game
+from src.services.game_record import GameRecordWriter
+from src.services.computer_strategies.computer_capturing_strategy import ComputerCapturingStrategy
+from src.services.computer_strategies.computer_intelligent_strategy import ComputerIntelligentStrategy
+from src.services.computer_strategies.computer_random_strategy import ComputerRandomStrategy
+
+LEVELS = {
+    "easy": ComputerRandomStrategy,
+    "medium": ComputerCapturingStrategy,
+    "hard": partial(ComputerIntelligentStrategy, time_budget=HARD_TIME_BUDGET),
+}
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 7777
+DEFAULT_MAXIMUM_SESSIONS = 500
+DEFAULT_QUEUE_SIZE = 256
+# longest command accepted, longer lines close the connection
+MAXIMUM_LINE_LENGTH = 256
+
+# --- engine pool
+
+# strategies of a worker process by (level, rows, columns), the transposition tables of the hard level are kept between the requests
+worker_strategies = {}
+
+
+def search_move(level, rows, columns, player_pieces, computer_pieces):
+    """
+    Search a computer move in a worker process of the pool.
+    :return: (piece_index, move_index), None if the computer has no valid move
+    """
+    strategy = worker_strategies.get((level, rows, columns))
+
+    if strategy is None:
+        board = Board(rows, columns)
+        strategy = LEVELS[level](board)
+        worker_strategies[(level, rows, columns)] = (board, strategy)
+    else:
+        board, strategy = strategy
+
+    board.load_position(player_pieces, computer_pieces)
+
+    try:
+        piece_position, move_position = strategy.get_move()
+    except NoValidMoveError:
+        return None
+
+    return board.geometry.index(*piece_position), board.geometry.index(*move_position)
+
+
+class EnginePool(object):
+    """
+    Process pool searching the computer moves of all the sessions, fed by a bounded FIFO queue.
+    """
+    def __init__(self, workers = None, queue_size = DEFAULT_QUEUE_SIZE):
+        self.__workers = workers or os.cpu_count() or 1
+        self.__executor = ProcessPoolExecutor(max_workers=self.__workers)
+        self.__queue = asyncio.Queue(maxsize=queue_size)
+        self.__dispatchers = []
+
+    @property
+    def pending_requests(self):
+        return self.__queue.qsize()
+
+    def start(self):
+        """
+        Start one dispatcher task per worker, each one keeps one worker busy. Call it from the event loop, before any connection is open.
+        :return: None
+        """
+        # the first task starts the worker processes: forked later they would keep open the connections of that time, and their clients
+        # would not see them closed
+        self.__executor.submit(os.getpid)
+        self.__dispatchers = [asyncio.create_task(self.__dispatch()) for _ in range(self.__workers)]
+
+    async def search(self, level, board: Board):
+        """
+        Wait for a free place in the queue, then for the move of the computer.
+        :return: (piece_index, move_index), None if the computer has no valid move
+        """
+        future = asyncio.get_running_loop().create_future()
+        await self.__queue.put(((level, board.rows, board.columns, board.get_pieces_mask(PLAYER_SYMBOL), board.get_pieces_mask(COMPUTER_SYMBOL)), future))
+
+        return await future
+
+    async def close(self):
+        for dispatcher in self.__dispatchers:
+            dispatcher.cancel()
+        await asyncio.gather(*self.__dispatchers, return_exceptions=True)
+
+        self.__executor.shutdown(cancel_futures=True)
+
+    async def __dispatch(self):
+        loop = asyncio.get_running_loop()
+
+        while True:
+            arguments, future = await self.__queue.get()
+
+            if future.done():
+                # the session was closed while its request waited
+                continue
+
+            try:
+                result = await loop.run_in_executor(self.__executor, search_move, *arguments)
+            except Exception as error:
+                if not future.done():
+                    future.set_exception(error)
+            else:
+                if not future.done():
+                    future.set_result(result)
+
+# --- sessions
+
+
+class PooledStrategy(object):
+    """
+    Strategy of a session: the move is searched by the engine pool beforehand and only handed to Game here.
+    """
+    def __init__(self, board: Board):
+        self.__board = board
+        self.move = None
+
+    def get_move(self):
+        if self.move is None:
+            raise NoValidMoveError()
+
+        piece_index, move_index = self.move
+        self.move = None
+
+        return POSITION(*self.__board.geometry.row_column(piece_index)), POSITION(*self.__board.geometry.row_column(move_index))
+
+
+class GameSession(object):
+    """
+    State of one connection: its board, its Game and the level of the computer.
+    """
+    def __init__(self, pool: EnginePool, records_writer: GameRecordWriter = None):
+        self.__pool = pool
+        self.__records_writer = records_writer
+
+        self.__board = Board()
+        self.__strategy = PooledStrategy(self.__board)
+        self.__game = None
+        self.__level = None
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """
+        Answer the commands of the connection until QUIT or the end of the connection.
+        The next line is already read while a command is executed: if the client disconnects during a computer move, the command is
+        cancelled with its request to the engine pool (dropped from the queue if no worker took it yet).
+        """
+        next_line = asyncio.ensure_future(reader.readline())
+        execution = None
+
+        try:
+            while True:
+                try:
+                    line = await next_line
+                except ValueError:
+                    # longer than MAXIMUM_LINE_LENGTH
+                    break
+
+                if not line:
+                    break
+
+                next_line = asyncio.ensure_future(reader.readline())
+
+                try:
+                    fields = line.decode("ascii").split()
+                except UnicodeDecodeError:
+                    answers = ["ERROR commands are ASCII only"]
+                else:
+                    execution = asyncio.ensure_future(self.__execute(fields))
+                    await asyncio.wait([execution, next_line], return_when=asyncio.FIRST_COMPLETED)
+
+                    if not execution.done() and self.__is_disconnected(next_line):
+                        break
+                    answers = await execution
+
+                for answer in answers:
+                    writer.write(answer.encode("ascii", "replace") + b"\n")
+                await writer.drain()
+
+                if answers and answers[-1] == "OK BYE":
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            next_line.cancel()
+            if execution is not None:
+                execution.cancel()
+
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    @staticmethod
+    def __is_disconnected(next_line):
+        """
+        :param next_line: task reading the next command line
+        :return: True if the task found the end of the connection, else False (a line, or a line too long that ends the session later)
+        """
+        if not next_line.done() or next_line.cancelled():
+            return False
+
+        error = next_line.exception()
+        if error is not None:
+            return isinstance(error, ConnectionError)
+
+        return next_line.result() == b""
+
+    async def __execute(self, fields):
+        """
+        :param fields: words of a command line
+        :return: list of answer lines
+        """
+        if len(fields) == 0:
+            return ["ERROR empty command"]
+
+        command = fields[0].upper()
+
+        if command == "NEW":
+            return await self.__new_game(fields[1:])
+        if command == "MOVE":
+            return await self.__player_move(fields[1:])
+        if command == "BOARD":
+            return ["BOARD " + "/".join("".join(self.__board.get_board_symbol(row, column) for column in range(self.__board.columns)).replace(EMPTY_CELL_SYMBOL, ".")
+                                        for row in range(self.__board.rows))]
+        if command == "QUIT":
+            return ["OK BYE"]
+
+        return ["ERROR unknown command {}".format(fields[0])]
+
+    async def __new_game(self, arguments):
+        if len(arguments) == 0 or arguments[0].lower() not in LEVELS or (len(arguments) > 1 and arguments[1].lower() not in ("player", "computer")):
+            return ["ERROR usage: NEW <{}> [player|computer]".format("|".join(LEVELS))]
+
+        self.__level = arguments[0].lower()
+        first = arguments[1].lower() if len(arguments) > 1 else random.choice(["player", "computer"])
+
+        self.__board.load_start_board()
+        self.__game = Game(self.__board, self.__strategy)
+
+        answers = ["OK NEW {} {} {}".format(self.__board.rows, self.__board.columns, first)]
+        if first == "computer":
+            answers.extend(await self.__computer_move())
+
+        return answers
+
+    async def __player_move(self, arguments):
+        if self.__game is None:
+            return ["ERROR no game, start one with NEW"]
+
+        try:
+            piece_row, piece_column, move_row, move_column = (int(argument) for argument in arguments)
+        except ValueError:
+            return ["ERROR usage: MOVE <row> <column> <row> <column>"]
+
+        try:
+            self.__game.player_move(piece_row, piece_column, move_row, move_column)
+        except BoardError as error:
+            return ["ERROR {}".format(error)]
+
+        if self.__board.has_won(PLAYER_SYMBOL):
+            return self.__game_over(PLAYER_SYMBOL)
+
+        return await self.__computer_move()
+
+    async def __computer_move(self):
+        self.__strategy.move = await self.__pool.search(self.__level, self.__board)
+
+        if self.__strategy.move is None:
+            # the computer cannot move
+            return self.__game_over(PLAYER_SYMBOL)
+
+        piece_position, move_position = self.__game.computer_move()
+        answers = ["COMPUTER {} {} {} {}".format(*piece_position, *move_position)]
+
+        if self.__board.has_won(COMPUTER_SYMBOL) or len(self.__board.get_moves(PLAYER_SYMBOL)) == 0:
+            answers.extend(self.__game_over(COMPUTER_SYMBOL))
+
+        return answers
+
+    def __game_over(self, winner):
+        if self.__records_writer is not None:
+            self.__records_writer.write(self.__game.get_record())
+
+        self.__game = None
+
+        return ["GAMEOVER {}".format(winner)]
+
+
+class GameServer(object):
+    """
+    Accepts the connections and runs one GameSession per connection, up to maximum_sessions at once.
+    """
+    def __init__(self, pool: EnginePool, maximum_sessions = DEFAULT_MAXIMUM_SESSIONS, records_writer: GameRecordWriter = None):
+        self.__pool = pool
+        self.__maximum_sessions = maximum_sessions
+        self.__records_writer = records_writer
+        self.__sessions = 0
+
+    @property
+    def sessions(self):
+        return self.__sessions
+
+    async def start(self, host = DEFAULT_HOST, port = DEFAULT_PORT, unix_path = None):
+        """
+        :return: asyncio server listening on the unix socket if a path is given, else on the TCP address
+        """
+        self.__pool.start()
+
+        if unix_path is not None:
+            return await asyncio.start_unix_server(self.__accept, unix_path, limit=MAXIMUM_LINE_LENGTH, backlog=self.__maximum_sessions)
+
+        # the default backlog (100) drops connections when hundreds of clients connect at once
+        return await asyncio.start_server(self.__accept, host, port, limit=MAXIMUM_LINE_LENGTH, backlog=self.__maximum_sessions)
+
+    async def __accept(self, reader, writer):
+        if self.__sessions >= self.__maximum_sessions:
+            writer.write(b"ERROR server full\n")
+            await writer.drain()
+            writer.close()
+            await writer.wait_closed()
+            return
+
+        self.__sessions += 1
+        try:
+            writer.write(b"OK KONO\n")
+            await GameSession(self.__pool, self.__records_writer).handle(reader, writer)
+        finally:
+            self.__sessions -= 1
+
+
+async def serve(arguments):
+    pool = EnginePool(arguments.workers, arguments.queue_size)
+    # flushed after every game, the server runs until it is killed
+    records_writer = GameRecordWriter(arguments.records, flush=True) if arguments.records is not None else None
+    server = await GameServer(pool, arguments.max_sessions, records_writer).start(arguments.host, arguments.port, arguments.unix)
+
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        await pool.close()
+        if records_writer is not None:
+            records_writer.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve four-field Kono games against the computer over a line protocol.")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--unix", default=None, help="path of a unix socket to listen on instead of TCP")
+    parser.add_argument("--workers", type=int, default=None, help="number of engine processes (default: number of CPUs)")
+    parser.add_argument("--max-sessions", type=int, default=DEFAULT_MAXIMUM_SESSIONS)
+    parser.add_argument("--queue-size", type=int, default=DEFAULT_QUEUE_SIZE, help="computer moves waiting for the engine pool at most")
+    parser.add_argument("--records", default=None, help="game record file the finished games are appended to")
+    arguments = parser.parse_args()
+
+    try:
+        asyncio.run(serve(arguments))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
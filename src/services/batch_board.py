@@ -0,0 +1,266 @@
+# Many boards of the same size advanced in lockstep with numpy, for self-play, dataset generation and tuning.
+#
+# Every position is kept from the point of view of the player to move, as two int64 masks (own pieces, opponent pieces) with the same cell
+# numbering as src/services/bitboard.py, plus a flag telling if the computer is the player to move. A move swaps the two masks, so every
+# operation works on all the boards at once without looking at the colours.
+#
+# Moves are numbered by slot: one slot per (piece cell, destination cell) pair of the board geometry, see BatchBoard.moves.
+# Needs numpy.
+
+import numpy as np
+
+from src.constants import ROWS, COLUMNS, COMPUTER_SYMBOL, PLAYER_SYMBOL
+from src.services.board import Board
+from src.services.bitboard import get_geometry
+from src.services.evaluation import NUMBER_PIECES_COST, CAPTURE_MOVE_COST
+
+# masks are int64 and the shifts have to stay positive
+MAXIMUM_CELLS = 62
+
+NO_MOVE = -1
+
+
+class BatchBoard(object):
+    """
+    N positions of the same board size. The rules match Board.apply_move() and Board.has_won() position by position.
+    """
+    def __init__(self, own_pieces, opponent_pieces, computer_to_move, rows = ROWS, columns = COLUMNS):
+        """
+        :param own_pieces: masks of the pieces of the player to move, one per position
+        :param opponent_pieces: masks of the pieces of the other player
+        :param computer_to_move: True for the positions where the player to move plays the computer pieces
+        :param rows: number of rows of the boards
+        :param columns: number of columns of the boards
+        """
+        self.__geometry = get_geometry(rows, columns)
+        if self.__geometry.cells > MAXIMUM_CELLS:
+            raise ValueError("Batch boards are limited to {} cells".format(MAXIMUM_CELLS))
+
+        self.__own = np.array(own_pieces, dtype=np.int64)
+        self.__opponent = np.array(opponent_pieces, dtype=np.int64)
+        self.__computer_to_move = np.array(computer_to_move, dtype=np.bool_)
+
+        if not self.__own.shape == self.__opponent.shape == self.__computer_to_move.shape:
+            raise ValueError("Every position needs own pieces, opponent pieces and the player to move")
+
+        # (direction offset, step mask, jump mask) and the move slots grouped by kind of move and direction, capturing moves first like
+        # Board.get_moves(): slot -> (piece_index, jumped over index or NO_MOVE, move_index)
+        self.__directions = self.__geometry.directions
+        self.__moves = []
+        self.__slot_groups = []
+        for is_capture in (True, False):
+            for offset, step_mask, jump_mask in self.__directions:
+                piece_indexes = [index for index in range(self.__geometry.cells) if (jump_mask if is_capture else step_mask) >> index & 1]
+                self.__slot_groups.append((is_capture, offset, piece_indexes))
+
+                for index in piece_indexes:
+                    if is_capture:
+                        self.__moves.append((index, index + offset, index + 2 * offset))
+                    else:
+                        self.__moves.append((index, NO_MOVE, index + offset))
+
+        self.__piece_cells = np.array([np.int64(1) << piece_index for piece_index, _, _ in self.__moves], dtype=np.int64)
+        self.__move_cells = np.array([np.int64(1) << move_index for _, _, move_index in self.__moves], dtype=np.int64)
+        self.__count_type = np.int8 if len(self.__moves) <= np.iinfo(np.int8).max else np.int16
+
+        self.__popcount_table = np.array([bin(value).count("1") for value in range(256)], dtype=np.int64)
+
+    @classmethod
+    def start(cls, count, computer_first = True, rows = ROWS, columns = COLUMNS):
+        """
+        :param count: number of boards
+        :param computer_first: True if the computer moves first on every board
+        :return: BatchBoard with 'count' copies of the start board of Board.load_start_board()
+        """
+        board = Board(rows, columns)
+        return cls.from_boards([board] * count, [computer_first] * count)
+
+    @classmethod
+    def from_boards(cls, boards, computer_to_move):
+        """
+        :param boards: list of Board of the same size
+        :param computer_to_move: list with True for the boards where the computer moves next
+        :return: BatchBoard with the positions of the boards
+        """
+        rows, columns = boards[0].rows, boards[0].columns
+        own_pieces = []
+        opponent_pieces = []
+
+        for board, computer_moves in zip(boards, computer_to_move):
+            own_symbol, opponent_symbol = (COMPUTER_SYMBOL, PLAYER_SYMBOL) if computer_moves else (PLAYER_SYMBOL, COMPUTER_SYMBOL)
+            own_pieces.append(board.get_pieces_mask(own_symbol))
+            opponent_pieces.append(board.get_pieces_mask(opponent_symbol))
+
+        return cls(own_pieces, opponent_pieces, computer_to_move, rows, columns)
+
+    def __len__(self):
+        return len(self.__own)
+
+    @property
+    def moves(self):
+        """
+        (piece_index, move_index) of every move slot -- column 'slot' of legal_moves() is the move moves[slot].
+        """
+        return [(piece_index, move_index) for piece_index, _, move_index in self.__moves]
+
+    @property
+    def own_pieces(self):
+        return self.__own.copy()
+
+    @property
+    def opponent_pieces(self):
+        return self.__opponent.copy()
+
+    @property
+    def computer_to_move(self):
+        return self.__computer_to_move.copy()
+
+    def to_board(self, position):
+        """
+        :param position: number of the position
+        :return: (Board with the position, symbol of the player to move)
+        """
+        board = Board(self.__geometry.rows, self.__geometry.columns)
+        own_pieces, opponent_pieces = int(self.__own[position]), int(self.__opponent[position])
+
+        if self.__computer_to_move[position]:
+            board.load_position(opponent_pieces, own_pieces)
+            return board, COMPUTER_SYMBOL
+
+        board.load_position(own_pieces, opponent_pieces)
+        return board, PLAYER_SYMBOL
+
+    def legal_moves(self):
+        """
+        :return: bool array (positions, move slots), True where the move of the slot is valid for the player to move
+        """
+        own, opponent = self.__own, self.__opponent
+        empty = self.__geometry.full_mask & ~(own | opponent)
+
+        # filled one slot row at a time and returned transposed, so every write is contiguous
+        legal = np.empty((len(self.__moves), len(own)), dtype=np.bool_)
+        slot = 0
+
+        for is_capture, offset, piece_indexes in self.__slot_groups:
+            # the pieces that can make this kind of move in this direction, on all the boards at once
+            if is_capture:
+                pieces = own & self.__shift(own, -offset) & self.__shift(opponent, -2 * offset)
+            else:
+                pieces = own & self.__shift(empty, -offset)
+
+            for piece_index in piece_indexes:
+                legal[slot] = (pieces >> piece_index) & 1
+                slot += 1
+
+        return legal.T
+
+    def apply_moves(self, slots):
+        """
+        Execute one move per position without validating it (moves come from legal_moves()), the other player is to move next.
+        :param slots: int array with the move slot of every position, NO_MOVE leaves the position (and the player to move) as it is
+        :return: None
+        """
+        slots = np.asarray(slots)
+        moving = slots != NO_MOVE
+        move_slots = slots[moving]
+
+        own = self.__own[moving]
+        opponent = self.__opponent[moving]
+        move_cells = self.__move_cells[move_slots]
+
+        # a capture removes the opponent piece on the destination cell, then the players swap
+        self.__own[moving] = opponent & ~move_cells
+        self.__opponent[moving] = own ^ (self.__piece_cells[move_slots] | move_cells)
+        self.__computer_to_move[moving] = ~self.__computer_to_move[moving]
+
+    def random_moves(self, generator: np.random.Generator, legal = None):
+        """
+        Choose a valid move uniformly at random for every position.
+        :param generator: numpy random generator
+        :param legal: result of legal_moves() if already computed
+        :return: int array with the chosen move slots, NO_MOVE for the positions without valid moves
+        """
+        if legal is None:
+            legal = self.legal_moves()
+
+        # slot rows, contiguous for the arrays returned by legal_moves()
+        legal = legal.T
+        moves_so_far = np.cumsum(legal, axis=0, dtype=self.__count_type)
+        number_of_moves = moves_so_far[-1]
+        chosen = (generator.random(len(number_of_moves)) * number_of_moves).astype(self.__count_type)
+
+        slots = np.argmax(moves_so_far > chosen, axis=0)
+        slots[number_of_moves == 0] = NO_MOVE
+
+        return slots
+
+    def piece_counts(self):
+        """
+        :return: (number of pieces of the player to move, number of pieces of the other player) arrays
+        """
+        return self.__popcount(self.__own), self.__popcount(self.__opponent)
+
+    def capture_counts(self):
+        """
+        :return: (capturing moves of the player to move, capturing moves of the other player) arrays, counted like count_capturing_moves()
+        """
+        return self.__count_capturing_moves(self.__own, self.__opponent), self.__count_capturing_moves(self.__opponent, self.__own)
+
+    def is_lost(self):
+        """
+        Board.has_won() of the other player: the player to move has one piece left or all its pieces are surrounded by opponent pieces.
+        :return: bool array
+        """
+        return self.__has_won(self.__opponent, self.__own)
+
+    def is_won(self):
+        """
+        Board.has_won() of the player to move.
+        :return: bool array
+        """
+        return self.__has_won(self.__own, self.__opponent)
+
+    def evaluate(self, number_pieces_cost = NUMBER_PIECES_COST, capture_move_cost = CAPTURE_MOVE_COST):
+        """
+        Evaluator.evaluate() of every position, from the side of the player to move.
+        :return: int array
+        """
+        own_pieces, opponent_pieces = self.piece_counts()
+        own_captures, opponent_captures = self.capture_counts()
+
+        return number_pieces_cost * (own_pieces - opponent_pieces) + capture_move_cost * (own_captures - opponent_captures)
+
+    def __has_won(self, winner, loser):
+        free = np.zeros(len(loser), dtype=np.bool_)
+        not_winner = self.__geometry.full_mask & ~winner
+
+        for offset, step_mask, _ in self.__directions:
+            free |= (loser & step_mask & self.__shift(not_winner, -offset)) != 0
+
+        return (self.__popcount(loser) == 1) | ~free
+
+    def __count_capturing_moves(self, own, opponent):
+        count = np.zeros(len(own), dtype=np.int64)
+
+        for offset, _, jump_mask in self.__directions:
+            count += self.__popcount(own & jump_mask & self.__shift(own, -offset) & self.__shift(opponent, -2 * offset))
+
+        return count
+
+    @staticmethod
+    def __shift(masks, offset):
+        """
+        bitboard.shift() for mask arrays, masked by the callers.
+        """
+        if offset >= 0:
+            return masks << offset
+
+        return masks >> -offset
+
+    def __popcount(self, masks):
+        count = np.zeros(len(masks), dtype=np.int64)
+
+        for shift in range(0, self.__geometry.cells, 8):
+            count += self.__popcount_table[masks >> shift & 255]
+
+        return count
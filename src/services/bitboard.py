@@ -0,0 +1,245 @@
+# Bitboard representation of a Kono board.
+#
+# Cells are numbered row by row: index = row * columns + column, so on the 4 x 4 board
+#
+#  0 |  1 |  2 |  3
+#  4 |  5 |  6 |  7
+#  8 |  9 | 10 | 11
+# 12 | 13 | 14 | 15
+#
+# Every side is kept as one integer mask with bit 'index' set if one of its pieces is on that cell.
+# Moving a whole mask one cell in a direction is a shift by the direction offset (+-1 horizontally, +-columns vertically),
+# so move generation, capture detection and the immobilization check work on all pieces at once.
+
+from functools import lru_cache
+from itertools import product
+
+
+class BoardGeometry(object):
+    """
+    Precomputed masks and tables for a board with a given number of rows and columns.
+    Use get_geometry() instead of building instances directly, geometries are cached per board size.
+    """
+    def __init__(self, rows, columns):
+        self.rows = rows
+        self.columns = columns
+        self.cells = rows * columns
+        self.full_mask = (1 << self.cells) - 1
+
+        column_masks = [self.__column_mask(column) for column in range(columns)]
+        row_masks = [self.__row_mask(row) for row in range(rows)]
+
+        # (offset, cells that can step one cell in that direction, cells that can jump two cells in that direction)
+        # for east, west, south, north
+        self.directions = (
+            (1, self.full_mask & ~self.__union(column_masks[columns - 1:]), self.full_mask & ~self.__union(column_masks[columns - 2:])),
+            (-1, self.full_mask & ~self.__union(column_masks[:1]), self.full_mask & ~self.__union(column_masks[:2])),
+            (columns, self.full_mask & ~self.__union(row_masks[rows - 1:]), self.full_mask & ~self.__union(row_masks[rows - 2:])),
+            (-columns, self.full_mask & ~self.__union(row_masks[:1]), self.full_mask & ~self.__union(row_masks[:2])),
+        )
+
+        # per cell: mask of the orthogonal neighbours, neighbour indexes and (jumped over index, landing index) pairs
+        self.neighbour_masks = []
+        # per cell: (neighbour cell mask, mask of the neighbours of that neighbour) pairs
+        self.second_neighbours = []
+        self.steps = []
+        self.jumps = []
+        for index in range(self.cells):
+            cell = 1 << index
+            cell_steps = []
+            cell_jumps = []
+
+            for offset, step_mask, jump_mask in self.directions:
+                if cell & step_mask:
+                    cell_steps.append(index + offset)
+                if cell & jump_mask:
+                    cell_jumps.append((index + offset, index + 2 * offset))
+
+            self.steps.append(tuple(cell_steps))
+            self.jumps.append(tuple(cell_jumps))
+            self.neighbour_masks.append(self.__union(1 << step for step in cell_steps))
+
+        for index in range(self.cells):
+            self.second_neighbours.append(tuple((1 << step, self.neighbour_masks[step]) for step in self.steps[index]))
+
+    def __deepcopy__(self, memo):
+        # geometries are read-only and shared by every board of the same size
+        return self
+
+    def index(self, row, column):
+        return row * self.columns + column
+
+    def row_column(self, index):
+        return divmod(index, self.columns)
+
+    def __row_mask(self, row):
+        return ((1 << self.columns) - 1) << (row * self.columns)
+
+    def __column_mask(self, column):
+        return self.__union(1 << (row * self.columns + column) for row in range(self.rows))
+
+    @staticmethod
+    def __union(masks):
+        result = 0
+        for mask in masks:
+            result |= mask
+
+        return result
+
+
+@lru_cache(maxsize=None)
+def get_geometry(rows, columns):
+    return BoardGeometry(rows, columns)
+
+
+def shift(mask, offset):
+    """
+    Shift every bit of a mask by a cell offset (positive offsets move towards higher indexes).
+    Bits shifted past index 0 are dropped, callers mask the result to stay on the board.
+    """
+    if offset >= 0:
+        return mask << offset
+
+    return mask >> -offset
+
+
+def bit_indexes(mask):
+    """
+    Iterate over the indexes of the set bits of a mask, lowest first.
+    """
+    while mask:
+        lowest_bit = mask & -mask
+        yield lowest_bit.bit_length() - 1
+        mask ^= lowest_bit
+
+
+def generate_moves(geometry: BoardGeometry, own, opponent):
+    """
+    Find all the moves of the side owning the 'own' mask.
+    :param geometry: geometry of the board
+    :param own: mask of the pieces of the side to move
+    :param opponent: mask of the opponent pieces
+    :return: list of (piece_index, destination_index) pairs, capturing moves first
+    """
+    empty = geometry.full_mask & ~(own | opponent)
+    capturing_moves = []
+    moves = []
+
+    for offset, step_mask, jump_mask in geometry.directions:
+        # a capture needs an own piece one cell away and an opponent piece two cells away
+        capturing_pieces = own & jump_mask & shift(own, -offset) & shift(opponent, -2 * offset)
+        for index in bit_indexes(capturing_pieces):
+            capturing_moves.append((index, index + 2 * offset))
+
+        moving_pieces = own & step_mask & shift(empty, -offset)
+        for index in bit_indexes(moving_pieces):
+            moves.append((index, index + offset))
+
+    capturing_moves.extend(moves)
+    return capturing_moves
+
+
+def generate_capturing_moves(geometry: BoardGeometry, own, opponent):
+    """
+    Find the capturing moves of the side owning the 'own' mask (the first moves of generate_moves(), without the quiet ones).
+    :return: list of (piece_index, destination_index) pairs
+    """
+    capturing_moves = []
+
+    for offset, _, jump_mask in geometry.directions:
+        capturing_pieces = own & jump_mask & shift(own, -offset) & shift(opponent, -2 * offset)
+        for index in bit_indexes(capturing_pieces):
+            capturing_moves.append((index, index + 2 * offset))
+
+    return capturing_moves
+
+
+def count_capturing_moves(geometry: BoardGeometry, own, opponent):
+    """
+    Count the capturing moves available to the side owning the 'own' mask.
+    :return: number of (piece, direction) pairs that can capture
+    """
+    count = 0
+    for offset, _, jump_mask in geometry.directions:
+        count += (own & jump_mask & shift(own, -offset) & shift(opponent, -2 * offset)).bit_count()
+
+    return count
+
+
+@lru_cache(maxsize=None)
+def maximum_capture_gain(geometry: BoardGeometry):
+    """
+    Upper bound of how much one capture can raise count_capturing_moves() of the capturing side minus the one of its opponent.
+    A capture from 'piece' over 'over' to 'landing' only empties 'piece' and turns 'landing' from an opponent piece into an own piece,
+    so only the capturing moves through those two cells change. Each of them is counted with the most it can gain for some content of
+    its other cells, the bound is the largest total over all the captures of the board size.
+    :param geometry: geometry of the board
+    :return: int, number of capturing moves
+    """
+    # a capturing move is a (piece, over, landing) line of cells, it counts +1 for an own capture and -1 for an opponent capture
+    lines_by_cell = [[] for _ in range(geometry.cells)]
+    for index in range(geometry.cells):
+        for over, landing in geometry.jumps[index]:
+            for cell in (index, over, landing):
+                lines_by_cell[cell].append((index, over, landing))
+
+    def line_value(contents):
+        if contents == ("own", "own", "opponent"):
+            return 1
+        if contents == ("opponent", "opponent", "own"):
+            return -1
+        return 0
+
+    maximum_gain = 0
+    for piece in range(geometry.cells):
+        for over, landing in geometry.jumps[piece]:
+            before = {piece: "own", over: "own", landing: "opponent"}
+            after = {piece: None, over: "own", landing: "own"}
+
+            gain = 0
+            for line in set(lines_by_cell[piece] + lines_by_cell[landing]):
+                unknown_cells = [cell for cell in line if cell not in before]
+                line_gain = 0
+                for contents in product(("own", "opponent", None), repeat=len(unknown_cells)):
+                    others = dict(zip(unknown_cells, contents))
+                    line_gain = max(line_gain, line_value(tuple(after.get(cell, others.get(cell)) for cell in line))
+                                    - line_value(tuple(before.get(cell, others.get(cell)) for cell in line)))
+                gain += line_gain
+
+            maximum_gain = max(maximum_gain, gain)
+
+    return maximum_gain
+
+
+def mobile_pieces(geometry: BoardGeometry, pieces, blocking):
+    """
+    Find the pieces that have at least one side (inside the board) not blocked by a piece of 'blocking'.
+    :param geometry: geometry of the board
+    :param pieces: mask of the pieces to check
+    :param blocking: mask of the pieces that surround them
+    :return: mask of the pieces of 'pieces' that are not surrounded
+    """
+    not_blocking = geometry.full_mask & ~blocking
+    mobile = 0
+
+    for offset, step_mask, _ in geometry.directions:
+        mobile |= pieces & step_mask & shift(not_blocking, -offset)
+
+    return mobile
+
+
+def is_immobilized(geometry: BoardGeometry, pieces, blocking):
+    """
+    Check if every piece of 'pieces' is surrounded on all its sides (inside the board) by pieces of 'blocking'.
+    :param geometry: geometry of the board
+    :param pieces: mask of the pieces to check
+    :param blocking: mask of the pieces that surround them
+    :return: True if no piece has a side that is not blocked, else False
+    """
+    not_blocking = geometry.full_mask & ~blocking
+
+    for offset, step_mask, _ in geometry.directions:
+        if pieces & step_mask & shift(not_blocking, -offset):
+            return False
+
+    return True
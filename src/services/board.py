@@ -13,18 +13,28 @@
 # | O | O | O | O |
 # *---*---*---*---*
 
-# from texttable import Texttable
-
-from src.constants import EMPTY_CELL_SYMBOL, ROWS, COLUMNS, COMPUTER_SYMBOL, PLAYER_SYMBOL, MAXIMUM_NUMBER_PIECES
+from src.constants import EMPTY_CELL_SYMBOL, ROWS, COLUMNS, COMPUTER_SYMBOL, PLAYER_SYMBOL
 from src.exceptions import OutOfBoardError, NotOrthogonalBoardMoveError, IncorrectBoardMoveError, GameOver
+from src.services.bitboard import get_geometry, generate_moves, generate_capturing_moves, mobile_pieces
+from src.services.zobrist import get_zobrist_keys, compute_hash
 
 
 class Board(object):
+    """
+    Board backed by two bitboards, one integer mask per player (see src/services/bitboard.py).
+    Positions given to the public methods are POSITION(row, column), the search path can work directly on cell indexes.
+
+    The pieces that are not surrounded by opponent pieces (mobile pieces) are kept per player and updated by every move next to the moved
+    and captured cells only, so checking if the game is won (has_won(), get_winner()) costs a couple of comparisons.
+    """
     def __init__(self, rows = ROWS, columns = COLUMNS):
         self.__rows = rows
         self.__columns = columns
-        self.__board = []
-        self.__number_of_pieces = None
+        self.__geometry = get_geometry(rows, columns)
+        self.__pieces = {PLAYER_SYMBOL: 0, COMPUTER_SYMBOL: 0}
+        self.__mobile_pieces = {PLAYER_SYMBOL: 0, COMPUTER_SYMBOL: 0}
+        self.__zobrist_keys = get_zobrist_keys(self.__geometry.cells)
+        self.__hash = 0
 
         self.load_start_board()
 
@@ -36,21 +46,86 @@ class Board(object):
     def columns(self):
         return self.__columns
 
+    @property
+    def geometry(self):
+        return self.__geometry
+
+    @property
+    def zobrist_hash(self):
+        """
+        Zobrist hash of the pieces on the board, kept up to date by every move (does not include the player to move).
+        """
+        return self.__hash
+
     def load_start_board(self):
         """
-        Populate the board with pieces to start a game.
+        Populate the board with pieces to start a game: the computer fills the top half of the rows and the player the bottom half
+        (the middle row of a board with an odd number of rows stays empty).
         :return: None
         """
-        self.__board.clear()
-        self.__board = [[COMPUTER_SYMBOL for _ in range(self.__rows)] for _ in range(self.__columns // 2)]
-        self.__board.extend([[PLAYER_SYMBOL for _ in range(self.__rows)] for _ in range(self.__columns - self.__columns // 2)])
-        self.__number_of_pieces = {PLAYER_SYMBOL: MAXIMUM_NUMBER_PIECES, COMPUTER_SYMBOL: MAXIMUM_NUMBER_PIECES}
+        half_cells = self.__rows // 2 * self.__columns
+        computer_pieces = (1 << half_cells) - 1
+        player_pieces = computer_pieces << (self.__geometry.cells - half_cells)
+
+        self.load_position(player_pieces, computer_pieces)
+
+    def load_position(self, player_pieces, computer_pieces):
+        """
+        Set the pieces on the board.
+        :param player_pieces: bitboard with the cells of the player pieces
+        :param computer_pieces: bitboard with the cells of the computer pieces
+        :return: None
+        """
+        self.__pieces[PLAYER_SYMBOL] = player_pieces
+        self.__pieces[COMPUTER_SYMBOL] = computer_pieces
+        self.__mobile_pieces[PLAYER_SYMBOL] = mobile_pieces(self.__geometry, player_pieces, computer_pieces)
+        self.__mobile_pieces[COMPUTER_SYMBOL] = mobile_pieces(self.__geometry, computer_pieces, player_pieces)
+        self.__hash = compute_hash(self.__zobrist_keys, player_pieces, computer_pieces)
 
     def get_board_symbol(self, row: int, column: int):
         if not (0 <= row < self.__rows and 0 <= column < self.__columns):
             raise OutOfBoardError()
 
-        return self.__board[row][column]
+        cell = 1 << (row * self.__columns + column)
+
+        if self.__pieces[COMPUTER_SYMBOL] & cell:
+            return COMPUTER_SYMBOL
+        if self.__pieces[PLAYER_SYMBOL] & cell:
+            return PLAYER_SYMBOL
+
+        return EMPTY_CELL_SYMBOL
+
+    def get_pieces_mask(self, symbol):
+        """
+        :param symbol: PLAYER_SYMBOL or COMPUTER_SYMBOL
+        :return: bitboard with the cells occupied by the pieces of 'symbol'
+        """
+        return self.__pieces[symbol]
+
+    def get_mobile_pieces_mask(self, symbol):
+        """
+        :param symbol: PLAYER_SYMBOL or COMPUTER_SYMBOL
+        :return: bitboard with the pieces of 'symbol' that are not surrounded by opponent pieces, as kept up to date by the moves
+        """
+        return self.__mobile_pieces[symbol]
+
+    def get_number_of_pieces(self, symbol):
+        return self.__pieces[symbol].bit_count()
+
+    def get_moves(self, symbol):
+        """
+        Find all the valid moves of a player.
+        :param symbol: PLAYER_SYMBOL or COMPUTER_SYMBOL
+        :return: list of (piece_index, destination_index) cell index pairs, capturing moves first
+        """
+        return generate_moves(self.__geometry, self.__pieces[symbol], self.__pieces[self.get_opponent_symbol(symbol)])
+
+    def get_capturing_moves(self, symbol):
+        """
+        :param symbol: PLAYER_SYMBOL or COMPUTER_SYMBOL
+        :return: list of the capturing moves of the player, as (piece_index, destination_index) cell index pairs
+        """
+        return generate_capturing_moves(self.__geometry, self.__pieces[symbol], self.__pieces[self.get_opponent_symbol(symbol)])
 
     def move(self, piece_position, move_position, symbol):
         """
@@ -65,80 +140,54 @@ class Board(object):
         if not (0 <= piece_position.x < self.__rows and 0 <= piece_position.y < self.__columns and 0 <= move_position.x < self.__rows and 0 <= move_position.y < self.__columns):
             raise OutOfBoardError()
 
-        if self.__board[piece_position.x][piece_position.y] == EMPTY_CELL_SYMBOL:
+        if piece_position.x != move_position.x and piece_position.y != move_position.y:
+            # move is not orthogonally
+            if self.__pieces[symbol] & (1 << (piece_position.x * self.__columns + piece_position.y)):
+                raise NotOrthogonalBoardMoveError()
             raise IncorrectBoardMoveError()
 
-        if not self.__board[piece_position.x][piece_position.y] == symbol:
-            raise IncorrectBoardMoveError()
+        piece_index = piece_position.x * self.__columns + piece_position.y
+        move_index = move_position.x * self.__columns + move_position.y
 
-        if piece_position.x == move_position.x:
-            if abs(piece_position.y - move_position.y) == 1 and self.__board[move_position.x][move_position.y] == EMPTY_CELL_SYMBOL:
-                self.__board[piece_position.x][piece_position.y] = EMPTY_CELL_SYMBOL
-                self.__board[move_position.x][move_position.y] = symbol
-            elif abs(piece_position.y - move_position.y) == 2 and self.__board[piece_position.x][(piece_position.y + move_position.y) // 2] == symbol and self.__board[move_position.x][move_position.y] == self.get_opponent_symbol(symbol):
-                # capturing move
-                self.__board[piece_position.x][piece_position.y] = EMPTY_CELL_SYMBOL
-                self.__board[move_position.x][move_position.y] = symbol
-                self.__number_of_pieces[self.get_opponent_symbol(symbol)] -= 1
-            else:
-                raise IncorrectBoardMoveError()
-
-        elif piece_position.y == move_position.y:
-            if abs(piece_position.x - move_position.x) == 1 and self.__board[move_position.x][move_position.y] == EMPTY_CELL_SYMBOL:
-                self.__board[piece_position.x][piece_position.y] = EMPTY_CELL_SYMBOL
-                self.__board[move_position.x][move_position.y] = symbol
-            elif abs(piece_position.x - move_position.x) == 2 and self.__board[(piece_position.x + move_position.x) // 2][piece_position.y] == symbol and self.__board[move_position.x][move_position.y] == self.get_opponent_symbol(symbol):
-                # capturing move
-                self.__board[piece_position.x][piece_position.y] = EMPTY_CELL_SYMBOL
-                self.__board[move_position.x][move_position.y] = symbol
-                self.__number_of_pieces[self.get_opponent_symbol(symbol)] -= 1
-            else:
-                raise IncorrectBoardMoveError()
+        if not self.__is_valid_move(piece_index, move_index, symbol):
+            raise IncorrectBoardMoveError()
 
-        else:
-            # move is not orthogonally
-            raise NotOrthogonalBoardMoveError()
+        self.apply_move(piece_index, move_index, symbol)
 
     def is_board_won(self, symbol):
         """
-        Raise a GameOver error if the board is won by the player with the specified symbol -- opponent has only one piece left or opponent is immobilized (cannot make any move).
+        Raise a GameOver error if the board is won by the player with the specified symbol -- opponent has only one piece left or opponent is immobilized
+        (every opponent piece is surrounded on all its sides by pieces of 'symbol').
         :param symbol: symbol of the player to check if board is won for
         :return: None
         :raise GameOver: is board is won by 'symbol'
         """
-
-        if self.__number_of_pieces[self.get_opponent_symbol(symbol)] == 1:
+        if self.has_won(symbol):
             raise GameOver(symbol)
 
-        # check if opponent is immobilized
-        immobilized_pieces = 0
-        for row in range(self.__rows):
-            for column in range(self.__columns):
-                if self.get_board_symbol(row, column) == self.get_opponent_symbol(symbol):
-                    blocked_sides = 0
-                    if (row >= 0 and row < self.__rows - 1) and self.get_board_symbol(row + 1, column) == symbol:
-                        blocked_sides += 1
-
-                    if (row > 0 and row <= self.__rows - 1) and self.get_board_symbol(row - 1, column) == symbol:
-                        blocked_sides += 1
-
-                    if (column >= 0 and column < self.__columns - 1) and self.get_board_symbol(row, column + 1) == symbol:
-                        blocked_sides += 1
-
-                    if (column > 0 and column <= self.__columns - 1) and self.get_board_symbol(row, column - 1) == symbol:
-                        blocked_sides += 1
-
-                    # check if piece is completely immobilized
-                    if row == 0 or row == self.__rows - 1:
-                        if (column == 0 or column == self.__columns - 1) and blocked_sides == 2:
-                            immobilized_pieces += 1
-                        elif blocked_sides == 3:
-                            immobilized_pieces += 1
-                    elif blocked_sides == 4:
-                        immobilized_pieces += 1
-
-        if immobilized_pieces == self.__number_of_pieces[self.get_opponent_symbol(symbol)]:
-            raise GameOver(symbol)
+    def has_won(self, symbol):
+        """
+        Same check as is_board_won(), without raising.
+        :param symbol: symbol of the player to check if board is won for
+        :return: True if the board is won by 'symbol', else False
+        """
+        opponent_symbol = COMPUTER_SYMBOL if symbol == PLAYER_SYMBOL else PLAYER_SYMBOL
+
+        return self.__mobile_pieces[opponent_symbol] == 0 or self.__pieces[opponent_symbol].bit_count() == 1
+
+    def get_winner(self):
+        """
+        :return: COMPUTER_SYMBOL or PLAYER_SYMBOL if the board is won by that player (the computer is checked first), None if the game goes on
+        """
+        pieces = self.__pieces
+        mobile = self.__mobile_pieces
+
+        if mobile[PLAYER_SYMBOL] == 0 or pieces[PLAYER_SYMBOL].bit_count() == 1:
+            return COMPUTER_SYMBOL
+        if mobile[COMPUTER_SYMBOL] == 0 or pieces[COMPUTER_SYMBOL].bit_count() == 1:
+            return PLAYER_SYMBOL
+
+        return None
 
     def get_opponent_symbol(self, symbol):
         if symbol == PLAYER_SYMBOL:
@@ -154,40 +203,88 @@ class Board(object):
         :param symbol: what piece is moved (PLAYER_SYMBOl or COMPUTER_SYMBOL)
         :return: True if the move is possible, else False
         """
-        if not (0 <= piece_position.x < self.__rows or 0 <= piece_position.y < self.__columns or 0 <= move_position.x < self.__rows or 0 <= move_position.y < self.__columns):
+        if not (0 <= piece_position.x < self.__rows and 0 <= piece_position.y < self.__columns and 0 <= move_position.x < self.__rows and 0 <= move_position.y < self.__columns):
             return False
 
-        if self.__board[piece_position.x][piece_position.y] == EMPTY_CELL_SYMBOL:
-            return False
+        return self.__is_valid_move(piece_position.x * self.__columns + piece_position.y, move_position.x * self.__columns + move_position.y, symbol)
+
+    def __is_valid_move(self, piece_index, move_index, symbol):
+        """
+        Check a move given by cell indexes against the precomputed neighbour and jump tables.
+        :return: True if 'symbol' can move its piece from piece_index to move_index, else False
+        """
+        own = self.__pieces[symbol]
 
-        if not self.__board[piece_position.x][piece_position.y] == symbol:
+        if not own & (1 << piece_index):
             return False
 
-        if piece_position.x == move_position.x:
-            if abs(piece_position.y - move_position.y) == 1 and self.__board[move_position.x][move_position.y] == EMPTY_CELL_SYMBOL:
-                return True
-            elif abs(piece_position.y - move_position.y) == 2 and self.__board[piece_position.x][(piece_position.y + move_position.y) // 2] == symbol and self.__board[move_position.x][move_position.y] == self.get_opponent_symbol(symbol):
-                return True
+        if move_index in self.__geometry.steps[piece_index]:
+            return not (own | self.__pieces[self.get_opponent_symbol(symbol)]) & (1 << move_index)
 
-        elif piece_position.y == move_position.y:
-            if abs(piece_position.x - move_position.x) == 1 and self.__board[move_position.x][move_position.y] == EMPTY_CELL_SYMBOL:
-                return True
-            elif abs(piece_position.x - move_position.x) == 2 and self.__board[(piece_position.x + move_position.x) // 2][piece_position.y] == symbol and self.__board[move_position.x][move_position.y] == self.get_opponent_symbol(symbol):
-                return True
+        for over_index, landing_index in self.__geometry.jumps[piece_index]:
+            if landing_index == move_index:
+                # capturing move
+                return bool(own & (1 << over_index) and self.__pieces[self.get_opponent_symbol(symbol)] & (1 << move_index))
 
-        else:
-            return False
+        return False
+
+    def apply_move(self, piece_index, move_index, symbol):
+        """
+        Execute a move given by cell indexes without validating it (fast path for the search, moves come from get_moves()).
+        :param piece_index: cell index of the moved piece
+        :param move_index: cell index of the destination cell
+        :param symbol: what piece is moved (PLAYER_SYMBOl or COMPUTER_SYMBOL)
+        :return: undo record, give it to undo_move() to restore the board as it was before the move
+        """
+        pieces = self.__pieces
+        mobile = self.__mobile_pieces
+        neighbour_masks = self.__geometry.neighbour_masks
+        opponent_symbol = COMPUTER_SYMBOL if symbol == PLAYER_SYMBOL else PLAYER_SYMBOL
+        undo_record = (pieces[PLAYER_SYMBOL], pieces[COMPUTER_SYMBOL], self.__hash, mobile[PLAYER_SYMBOL], mobile[COMPUTER_SYMBOL])
+
+        symbol_keys = self.__zobrist_keys[symbol]
+        self.__hash ^= symbol_keys[piece_index] ^ symbol_keys[move_index]
+
+        move_cell = 1 << move_index
+        pieces[symbol] ^= (1 << piece_index) | move_cell
+        own_mobile = mobile[symbol] & ~(1 << piece_index)
+
+        if pieces[opponent_symbol] & move_cell:
+            # capturing move
+            pieces[opponent_symbol] ^= move_cell
+            self.__hash ^= self.__zobrist_keys[opponent_symbol][move_index]
+            # the own pieces next to the captured one are free on that side now
+            own_mobile |= pieces[symbol] & neighbour_masks[move_index]
+
+        opponent_pieces = pieces[opponent_symbol]
+        if neighbour_masks[move_index] & ~opponent_pieces:
+            own_mobile |= move_cell
+        mobile[symbol] = own_mobile
+
+        # the opponent pieces next to the left cell are free on that side, the ones next to the destination cell may be surrounded now
+        opponent_mobile = (mobile[opponent_symbol] & ~move_cell) | (opponent_pieces & neighbour_masks[piece_index])
+        if opponent_pieces & neighbour_masks[move_index]:
+            not_own_pieces = ~pieces[symbol]
+            for cell, cell_neighbours in self.__geometry.second_neighbours[move_index]:
+                if not cell_neighbours & not_own_pieces:
+                    # surrounded by own pieces (clearing a cell that is not an opponent piece changes nothing)
+                    opponent_mobile &= ~cell
+        mobile[opponent_symbol] = opponent_mobile
+
+        return undo_record
+
+    def undo_move(self, undo_record):
+        """
+        Take back the last move executed with apply_move() -- moves have to be undone in reverse order.
+        :param undo_record: record returned by apply_move()
+        :return: None
+        """
+        (self.__pieces[PLAYER_SYMBOL], self.__pieces[COMPUTER_SYMBOL], self.__hash,
+         self.__mobile_pieces[PLAYER_SYMBOL], self.__mobile_pieces[COMPUTER_SYMBOL]) = undo_record
+
+    def __str__(self):
+        lines = []
+        for row in range(self.__rows):
+            lines.append("| " + " | ".join(self.get_board_symbol(row, column) for column in range(self.__columns)) + " |")
 
-    # def __str__(self):
-    #     table = Texttable()
-    #     header = ["/"]
-    #     for index in range(self.__columns):
-    #         header.append(str(index))
-    #     table.header(header)
-    #
-    #     for row in range(self.__rows):
-    #         table_row = [str(row)]
-    #         table_row.extend(self.__board[row])
-    #         table.add_row(table_row)
-    #
-    #     return table.draw()
\ No newline at end of file
+        return "\n".join(lines)
@@ -1,70 +1,442 @@
 import copy
 import math
 import random
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
 
+from src.services.bitboard import maximum_capture_gain
 from src.services.board import Board
-from src.constants import COMPUTER_SYMBOL, PLAYER_SYMBOL, POSITION, EMPTY_CELL_SYMBOL
-from src.exceptions import GameOver, OutOfBoardError
+from src.services.evaluation import Evaluator, NUMBER_PIECES_COST, CAPTURE_MOVE_COST
+from src.services.opening_book import load_opening_book, DEFAULT_OPENING_BOOK_PATH
+from src.services.search_statistics import SearchStatistics, ITERATION, ROOT_MOVE_SEARCHED, ITERATION_COMPLETED
+from src.services.transposition_table import TranspositionTable, EXACT, LOWER_BOUND, UPPER_BOUND
+from src.services.zobrist import COMPUTER_TO_MOVE_KEY
+from src.constants import COMPUTER_SYMBOL, PLAYER_SYMBOL, POSITION
+from src.exceptions import SearchTimeout, NoValidMoveError
+
+# iterations shallower than this are searched in the calling process even with workers, they take less than sending the moves to the pool
+PARALLEL_MINIMUM_DEPTH = 4
+
+# one root move of a search: its minimax score (an upper bound if it is lower than the score of the chosen move, those moves are cut off)
+# and the static evaluation of the board after it
+ROOT_MOVE = namedtuple('RootMove', ['move', 'score', 'evaluation'])
+
+# captures searched at most below a leaf of the minimax search, the quiescence search values the board statically after them
+QUIESCENCE_MAXIMUM_DEPTH = 8
 
 
 class ComputerIntelligentStrategy(object):
     """
     Strategy that uses the minimax algorithm with alpha-beta pruning.
+    Search results are kept in a transposition table for the whole game, so later turns reuse the positions searched in earlier ones.
+
+    The search deepens iteratively, one ply at a time up to target_depth. With a time budget (seconds) and/or a node budget it stops
+    as soon as a budget is used up and plays the best move of the last completed iteration (the first iteration is always completed).
+
+    Positions of the opening book (src/tools/build_opening_book.py) are played from the book without searching, opening_book_path = None
+    disables the book.
+
+    The leaves are valued by an Evaluator (src/services/evaluation.py) with the weights number_pieces_cost and capture_move_cost.
+    With quiescence = True the leaves are not valued while the player to move can capture: only the capturing moves are searched further,
+    until the board is quiet (see __quiescence_search()), so a capture is never left just behind the horizon. With a budget the first
+    iteration values its leaves statically, the budget cannot stop it and the quiescence search could take any time on a large board.
+
+    With workers > 1 the root moves of the deeper iterations are searched in parallel by a process pool shared by all the strategies with
+    the same number of workers: the first move is searched here, the others by the pool with the score of the first move as lower bound.
+    The chosen move is the same as the one of the serial search. The node budget applies to every worker on its own.
+
+    Moves are searched in the order: principal variation move, transposition table move, capturing moves, killer moves (quiet moves that
+    caused a cut-off at the same ply) and the other quiet moves by their history score (cut-offs they caused, weighted by depth).
+    Root moves after the first are searched with the best score so far as lower bound. move_ordering = False keeps only the first two and
+    searches every root move with a full window, to measure what this saves (src/tools/node_count_benchmark.py).
+    Root moves that are equal in score and evaluation are chosen at random, from a private generator if a seed is given.
+    The ROOT_MOVE records the choice was made from are kept in root_moves.
+
+    A SearchStatistics given as statistics is reset and filled in by every search (src/services/search_statistics.py). search_callback is called
+    as search_callback(event, statistics) after every searched root move (ROOT_MOVE_SEARCHED, the record is statistics.root_moves[-1]) and
+    every completed iteration (ITERATION_COMPLETED, statistics.iterations[-1]), a callback without statistics gets its own SearchStatistics.
+    Without both the search only pays one comparison per node for them.
     """
-    def __init__(self, board: Board):
+    def __init__(self, board: Board, target_depth = 5, time_budget = None, node_budget = None, transposition_table_size = 1 << 16,
+                 opening_book_path = DEFAULT_OPENING_BOOK_PATH, number_pieces_cost = NUMBER_PIECES_COST, capture_move_cost = CAPTURE_MOVE_COST,
+                 workers = None, move_ordering = True, seed = None, statistics: SearchStatistics = None, search_callback = None, quiescence = False):
         self.__board = board
-        self.__target_depth = 5
+        self.__target_depth = target_depth
+        self.__time_budget = time_budget
+        self.__node_budget = node_budget
+        self.__transposition_table = TranspositionTable(transposition_table_size)
+        self.__evaluator = Evaluator(number_pieces_cost, capture_move_cost)
+        self.__workers = workers
+        self.__move_ordering = move_ordering
+        self.__quiescence = quiescence
+        # delta pruning margin of the quiescence search: one capture wins number_pieces_cost and raises the difference of capturing moves by
+        # at most maximum_capture_gain() for the board size, a board further below alpha than that cannot be raised above it by a capture
+        self.__delta_margin = number_pieces_cost + maximum_capture_gain(board.geometry) * capture_move_cost
+        self.__random = random.Random(seed) if seed is not None else random
+        self.__statistics = statistics if statistics is not None or search_callback is None else SearchStatistics()
+        self.__search_callback = search_callback
+        # everything a worker needs to build the same search (see search_root_move_in_worker())
+        self.__worker_options = (board.rows, board.columns, transposition_table_size, number_pieces_cost, capture_move_cost, move_ordering, quiescence)
+
+        self.__opening_book = load_opening_book(opening_book_path) if opening_book_path is not None else None
+        if self.__opening_book is not None and (self.__opening_book.rows, self.__opening_book.columns) != (board.rows, board.columns):
+            # the book was built for another board size
+            self.__opening_book = None
 
         self.__max_player = COMPUTER_SYMBOL
         self.__min_player = PLAYER_SYMBOL
 
+        self.__search_deadline = None
+        self.__nodes = 0
+        self.__can_stop_search = False
+        self.__search_quiescence = False
+        self.__iteration_depth = 0
+        self.__principal_variation = []
+        self.__root_moves = []
+
+        # killer moves: two per ply, history scores: one per move and player, both live for one search
+        self.__killer_moves = []
+        self.__history = {COMPUTER_SYMBOL: {}, PLAYER_SYMBOL: {}}
+
+    @property
+    def board(self):
+        return self.__board
+
+    @property
+    def nodes_searched(self):
+        """
+        Number of nodes visited by the last search.
+        """
+        return self.__nodes
+
+    @property
+    def root_moves(self):
+        """
+        ROOT_MOVE records of the last completed iteration of the last search, in search order (empty if the move came from the book).
+        """
+        return list(self.__root_moves)
+
+    @property
+    def statistics(self):
+        """
+        SearchStatistics of the last search, None if the strategy keeps none.
+        """
+        return self.__statistics
+
     def get_move(self):
-        move = self.__find_best_move()
+        """
+        :return: (piece_position, move_position) of the best move found
+        :raises NoValidMoveError: if the computer has no valid move
+        """
+        if len(self.__board.get_moves(self.__max_player)) == 0:
+            raise NoValidMoveError()
+
+        statistics = self.__statistics
+        if statistics is not None:
+            statistics.reset()
+
+        book_move = self.__get_book_move()
+
+        if book_move is not None:
+            self.__nodes = 0
+            self.__root_moves = []
+            piece_index, move_index = book_move
+        else:
+            self.__transposition_table.new_search()
+            piece_index, move_index = self.__iterative_deepening()
 
-        piece_position = POSITION(move["row"], move["column"])
-        move_position = move["move_position"]
+        if statistics is not None:
+            statistics.book_move = book_move is not None
+            statistics.nodes = self.__nodes
+            statistics.seconds = time.perf_counter() - statistics.start_time
+
+        piece_position = POSITION(*self.__board.geometry.row_column(piece_index))
+        move_position = POSITION(*self.__board.geometry.row_column(move_index))
 
         return piece_position, move_position
 
-    def __find_best_move(self):
+    def __get_book_move(self):
+        """
+        :return: move of the opening book for the current board, None if the board is not in the book
+        """
+        if self.__opening_book is None:
+            return None
+
+        book_move = self.__opening_book.get_board_move(self.__board, self.__max_player)
+        if book_move is not None and book_move in self.__board.get_moves(self.__max_player):
+            return book_move
+
+        return None
+
+    def __iterative_deepening(self):
         """
-        Find the best move from all the possible moves of the computer using the minimax algorithm.
-        :return: best move found
+        Search the current board with increasing depths until the target depth is reached or the budget is used up.
+        Every iteration starts with the principal variation (best line of play) found by the previous one.
+        :return: best move of the last completed iteration
         """
-        max_player_moves = self.__get_moves_of_player(self.__board, self.__max_player)
+        # the whole search makes and unmakes moves on this single copy of the game board
+        # (an iteration stopped by the budget leaves it in the middle of a line, it is not used after that)
+        board = copy.deepcopy(self.__board)
+
+        search_start = time.perf_counter()
+        self.__search_deadline = search_start + self.__time_budget if self.__time_budget is not None else None
+        self.__nodes = 0
+        self.__can_stop_search = False
+        self.__principal_variation = []
+        self.__root_moves = []
+        self.__reset_move_ordering(self.__target_depth)
 
-        best_evaluation = -math.inf
         best_move = None
+        for depth in range(self.__target_depth + 1):
+            self.__iteration_depth = depth
+            self.__search_quiescence = self.__quiescence and (self.__can_stop_search or (self.__time_budget is None and self.__node_budget is None))
+            iteration_start, iteration_nodes = time.perf_counter(), self.__nodes
 
-        for move in max_player_moves:
-            board_copy = copy.deepcopy(self.__board)
-            board_copy.move(POSITION(move["row"], move["column"]), move["move_position"], self.__max_player)
+            if self.__statistics is not None:
+                self.__statistics.ensure_plies(depth + 2)
+                self.__statistics.root_moves = []
 
             try:
-                board_copy.is_board_won(self.__max_player)
-            except GameOver:
-                return move
+                if self.__workers is not None and self.__workers > 1 and depth >= PARALLEL_MINIMUM_DEPTH:
+                    root_moves = self.__find_best_move_in_parallel(board, depth)
+                else:
+                    root_moves = self.__find_best_move(board, depth)
+            except SearchTimeout:
+                break
+
+            self.__root_moves = root_moves
+            best_move = self.__select_root_move(root_moves)
+
+            self.__principal_variation = self.__find_principal_variation(board, best_move)
+            self.__can_stop_search = True
+
+            if self.__statistics is not None:
+                self.__statistics.iterations.append(ITERATION(depth, time.perf_counter() - iteration_start, self.__nodes - iteration_nodes, best_move,
+                                                              list(self.__principal_variation)))
+                self.__statistics.nodes = self.__nodes
+                if self.__search_callback is not None:
+                    self.__search_callback(ITERATION_COMPLETED, self.__statistics)
+
+            if self.__search_deadline is not None and time.perf_counter() - search_start > (self.__search_deadline - search_start) / 2:
+                # the next iteration takes longer than all the previous ones together, it would not finish in time
+                break
 
-            current_evaluation, _ = self.__minimax_algorithm(board_copy, self.__target_depth, -math.inf, math.inf, False)
+        return best_move
 
-            if current_evaluation == best_evaluation and best_move != None:
-                current_board_evaluation = self.__evaluation_value(board_copy)
+    def __check_budget(self):
+        """
+        Count a searched node and stop the current iteration if the time or node budget is used up.
+        :raises SearchTimeout: if the budget is used up and a previous iteration already found a move
+        """
+        self.__nodes += 1
 
-                board_copy_best_move_simulation = copy.deepcopy(self.__board)
-                board_copy_best_move_simulation.move(POSITION(best_move["row"], best_move["column"]), best_move["move_position"], self.__max_player)
-                best_move_board_evaluation = self.__evaluation_value(board_copy_best_move_simulation)
+        if not self.__can_stop_search:
+            return
 
-                if current_board_evaluation > best_move_board_evaluation:
-                    best_evaluation = current_evaluation
-                    best_move = move
+        if self.__node_budget is not None and self.__nodes >= self.__node_budget:
+            raise SearchTimeout()
+
+        if self.__search_deadline is not None and self.__nodes & 255 == 0 and time.perf_counter() >= self.__search_deadline:
+            raise SearchTimeout()
+
+    def __find_best_move(self, board: Board, depth):
+        """
+        Search all the possible moves of the computer using the minimax algorithm.
+        :param board: board to search on, the same board is returned to its state at the end of the search
+        :param depth: depth of the minimax search of each move
+        :return: ROOT_MOVE records of the searched moves, give them to __select_root_move() -- stops at a move that wins the game
+        """
+        max_player_moves = self.__get_moves_of_player(board, self.__max_player)
+        if len(self.__principal_variation) != 0:
+            self.__move_to_front(max_player_moves, self.__principal_variation[0])
+
+        root_moves = []
+        best_score = -math.inf
+
+        if self.__statistics is not None:
+            self.__statistics.expanded_nodes_per_ply[0] += 1
+
+        for move in max_player_moves:
+            undo_record = board.apply_move(*move, self.__max_player)
 
-            elif current_evaluation >= best_evaluation:
-                best_evaluation = current_evaluation
-                best_move = move
+            if board.has_won(self.__max_player):
+                root_moves.append(ROOT_MOVE(move, math.inf, self.__evaluation_value(board)))
+                board.undo_move(undo_record)
+
+                if self.__statistics is not None:
+                    self.__root_move_searched(root_moves[-1])
+                return root_moves[-1:]
+
+            # a move can only be chosen if it scores at least as much as the best one so far, anything lower may be cut off
+            alpha = math.nextafter(best_score, -math.inf) if self.__move_ordering else -math.inf
+            is_principal_variation = len(self.__principal_variation) != 0 and move == self.__principal_variation[0]
+            score, _ = self.__minimax_algorithm(board, depth, alpha, math.inf, False, is_principal_variation)
+
+            root_moves.append(ROOT_MOVE(move, score, self.__evaluation_value(board)))
+            best_score = max(best_score, score)
+            board.undo_move(undo_record)
+
+            if self.__statistics is not None:
+                self.__root_move_searched(root_moves[-1])
+
+        return root_moves
+
+    def __find_best_move_in_parallel(self, board: Board, depth):
+        """
+        Same result as __find_best_move(), with the root moves after the first one searched by the process pool.
+        :param board: board to search on, the same board is returned to its state at the end of the search
+        :param depth: depth of the minimax search of each move
+        :return: ROOT_MOVE records of the searched moves, as __find_best_move()
+        :raises SearchTimeout: if the budget is used up before every root move is searched
+        """
+        max_player_moves = self.__get_moves_of_player(board, self.__max_player)
+        if len(self.__principal_variation) != 0:
+            self.__move_to_front(max_player_moves, self.__principal_variation[0])
+
+        for move in max_player_moves:
+            undo_record = board.apply_move(*move, self.__max_player)
+            if board.has_won(self.__max_player):
+                root_move = ROOT_MOVE(move, math.inf, self.__evaluation_value(board))
+                board.undo_move(undo_record)
+
+                if self.__statistics is not None:
+                    self.__root_move_searched(root_move)
+                return [root_move]
+
+            board.undo_move(undo_record)
+
+        first_move = max_player_moves[0]
+        undo_record = board.apply_move(*first_move, self.__max_player)
+        first_score, _ = self.__minimax_algorithm(board, depth, -math.inf, math.inf, False, len(self.__principal_variation) != 0)
+        root_moves = [ROOT_MOVE(first_move, first_score, self.__evaluation_value(board))]
+        board.undo_move(undo_record)
+
+        if self.__statistics is not None:
+            self.__statistics.expanded_nodes_per_ply[0] += 1
+            self.__root_move_searched(root_moves[-1])
+
+        # a move can only be chosen if it scores at least as much as the first one, anything lower is cut off in the workers
+        alpha = math.nextafter(first_score, -math.inf)
+
+        time_budget = None
+        if self.__search_deadline is not None:
+            time_budget = max(self.__search_deadline - time.perf_counter(), 0)
+
+        pool = get_search_pool(self.__workers)
+        futures = [pool.submit(search_root_move_in_worker, self.__worker_options, board.get_pieces_mask(PLAYER_SYMBOL), board.get_pieces_mask(COMPUTER_SYMBOL),
+                               move, depth, alpha, time_budget, self.__node_budget)
+                   for move in max_player_moves[1:]]
+
+        timed_out = False
+        for move, future in zip(max_player_moves[1:], futures):
+            result = future.result()
+            if result is None:
+                timed_out = True
+                continue
+
+            score, evaluation, nodes = result
+            self.__nodes += nodes
+            root_moves.append(ROOT_MOVE(move, score, evaluation))
+
+            if self.__statistics is not None:
+                self.__root_move_searched(root_moves[-1])
+
+        if timed_out:
+            raise SearchTimeout()
+
+        return root_moves
+
+    def __root_move_searched(self, root_move):
+        self.__statistics.root_moves.append(root_move)
+        self.__statistics.nodes = self.__nodes
+
+        if self.__search_callback is not None:
+            self.__search_callback(ROOT_MOVE_SEARCHED, self.__statistics)
+
+    def __select_root_move(self, root_moves):
+        """
+        Choose the move with the highest score, ties go to the higher evaluation of the board after the move, then at random.
+        :param root_moves: ROOT_MOVE records of a completed iteration
+        :return: the chosen move
+        """
+        best_move, best_score, best_evaluation, ties = None, -math.inf, None, 0
+
+        for move, score, evaluation in root_moves:
+            if score == best_score and best_move != None:
+                if evaluation > best_evaluation:
+                    best_move, best_evaluation, ties = move, evaluation, 1
+                elif evaluation == best_evaluation:
+                    ties += 1
+                    if self.__is_tie_winner(ties):
+                        best_move = move
+
+            elif score >= best_score:
+                best_move, best_score, best_evaluation, ties = move, score, evaluation, 1
 
         return best_move
 
-    def __minimax_algorithm(self, board: Board, depth, alpha, beta, maximize_player):
+    def search_root_move(self, move, depth, alpha = -math.inf, time_budget = None, node_budget = None, new_search = False):
+        """
+        Search one computer move of the current board, the way __find_best_move() searches each root move (used by the process pool workers).
+        :param move: (piece_index, move_index) of the computer
+        :param depth: depth of the minimax search of the move
+        :param alpha: the score only has to be exact if it is higher than alpha
+        :param time_budget: seconds the search may take, None for no limit
+        :param node_budget: number of nodes the search may visit, None for no limit
+        :param new_search: True if the move is not from the same search as the previous call, the entries of the transposition table
+                           stored until now are then replaced first (as get_move() does for every search)
+        :return: (score of the move, evaluation of the board after the move, number of nodes visited)
+        :raises SearchTimeout: if a budget is used up
+        """
+        if new_search:
+            self.__transposition_table.new_search()
+
+        self.__search_deadline = time.perf_counter() + time_budget if time_budget is not None else None
+        self.__node_budget = node_budget
+        self.__nodes = 0
+        self.__can_stop_search = time_budget is not None or node_budget is not None
+        self.__search_quiescence = self.__quiescence
+        self.__iteration_depth = depth
+        self.__principal_variation = []
+        self.__reset_move_ordering(depth)
+        if self.__statistics is not None:
+            self.__statistics.ensure_plies(depth + 2)
+
+        undo_record = self.__board.apply_move(*move, self.__max_player)
+        try:
+            value, _ = self.__minimax_algorithm(self.__board, depth, alpha, math.inf, False)
+            board_evaluation = self.__evaluation_value(self.__board)
+        finally:
+            self.__board.undo_move(undo_record)
+
+        return value, board_evaluation, self.__nodes
+
+    def __find_principal_variation(self, board: Board, best_move):
+        """
+        Follow the best moves stored in the transposition table, starting with the best move found at the root.
+        :return: list of moves, alternating computer and player moves
+        """
+        principal_variation = []
+        undo_records = []
+        symbol = self.__max_player
+        move = best_move
+
+        while move is not None and len(principal_variation) <= self.__iteration_depth and move in board.get_moves(symbol):
+            principal_variation.append(move)
+            undo_records.append(board.apply_move(*move, symbol))
+            symbol = board.get_opponent_symbol(symbol)
+
+            position_key = board.zobrist_hash ^ COMPUTER_TO_MOVE_KEY if symbol == self.__max_player else board.zobrist_hash
+            table_entry = self.__transposition_table.get(position_key)
+            move = table_entry[3] if table_entry is not None else None
+
+        for undo_record in reversed(undo_records):
+            board.undo_move(undo_record)
+
+        return principal_variation
+
+    def __minimax_algorithm(self, board: Board, depth, alpha, beta, maximize_player, is_principal_variation = False):
         """
         Minimax algorithm using alpha-beta pruning.
         - recursive algorithm that finds in its search tree the best move based on the values associated to the leaves (reached the target depth or is a terminal node)
@@ -84,35 +456,175 @@ class ComputerIntelligentStrategy(object):
         :param alpha: minimum score that the maximizing player is assured of
         :param beta: maximum score that the minimizing player is assured of
         :param maximize_player: True if it's the computer's turn, False if it's the human player's turn
+        :param is_principal_variation: True if the board was reached by following the principal variation of the previous iteration
         :return: value of the evaluated current board and the best move found
         """
-        try:
-            board.is_board_won(self.__max_player)
-        except GameOver:
-            return math.inf, None
+        self.__check_budget()
 
-        try:
-            board.is_board_won(self.__min_player)
-        except GameOver:
+        if self.__statistics is not None:
+            self.__statistics.nodes_per_ply[self.__iteration_depth - depth + 1] += 1
+
+        winner = board.get_winner()
+        if winner == self.__max_player:
+            return math.inf, None
+        elif winner == self.__min_player:
             return -math.inf, None
 
         if depth == 0:
+            if self.__search_quiescence:
+                return self.__quiescence_search(board, alpha, beta, maximize_player, QUIESCENCE_MAXIMUM_DEPTH), None
+
+            if self.__statistics is not None:
+                self.__statistics.leaf_evaluations += 1
             return self.__evaluation_value(board), None
 
+        position_key = board.zobrist_hash ^ COMPUTER_TO_MOVE_KEY if maximize_player else board.zobrist_hash
+        table_move = None
+
+        table_entry = self.__transposition_table.get(position_key)
+        if table_entry is not None:
+            table_depth, table_value, table_bound, table_move = table_entry
+
+            if table_depth >= depth:
+                if table_bound == EXACT:
+                    return table_value, table_move
+                elif table_bound == LOWER_BOUND:
+                    alpha = max(alpha, table_value)
+                else:
+                    beta = min(beta, table_value)
+
+                if alpha >= beta:
+                    return table_value, table_move
+
+        principal_variation_move = None
+        if is_principal_variation:
+            ply = self.__iteration_depth - depth + 1
+            if ply < len(self.__principal_variation):
+                principal_variation_move = self.__principal_variation[ply]
+
+        value, best_move = self.__search_children(board, depth, alpha, beta, maximize_player, table_move, principal_variation_move)
+
+        if value <= alpha:
+            bound = UPPER_BOUND
+        elif value >= beta:
+            bound = LOWER_BOUND
+        else:
+            bound = EXACT
+        self.__transposition_table.store(position_key, depth, value, bound, best_move)
+
+        return value, best_move
+
+    def __quiescence_search(self, board: Board, alpha, beta, maximize_player, depth):
+        """
+        Search only the capturing moves from a leaf of the minimax search, until the player to move has no capture left or 'depth'
+        captures were played.
+        - stand pat: the player to move does not have to capture, the evaluation of the board is a bound of its value
+        - delta pruning: if even winning a piece (the evaluation moves by at most the delta margin) cannot bring the evaluation back inside
+          the alpha-beta window, the captures are not searched (unless one of them wins the game: the opponent is left one piece or is
+          immobilized)
+        The boards of the quiescence search are not stored in the transposition table.
+        :param board: board of a leaf or of a capture below it, the game is not over
+        :param alpha: minimum score that the maximizing player is assured of
+        :param beta: maximum score that the minimizing player is assured of
+        :param maximize_player: True if it's the computer's turn, False if it's the human player's turn
+        :param depth: number of captures that may still be searched
+        :return: value of the board
+        """
+        stand_pat = self.__evaluation_value(board)
+        if self.__statistics is not None:
+            self.__statistics.leaf_evaluations += 1
+
+        if depth == 0:
+            return stand_pat
+
+        if maximize_player:
+            if stand_pat >= beta:
+                return stand_pat
+            symbol = self.__max_player
+            capturing_moves = board.get_capturing_moves(symbol)
+            if stand_pat + self.__delta_margin <= alpha and not self.__has_winning_move(board, capturing_moves, symbol):
+                return alpha
+            alpha = max(alpha, stand_pat)
+        else:
+            if stand_pat <= alpha:
+                return stand_pat
+            symbol = self.__min_player
+            capturing_moves = board.get_capturing_moves(symbol)
+            if stand_pat - self.__delta_margin >= beta and not self.__has_winning_move(board, capturing_moves, symbol):
+                return beta
+            beta = min(beta, stand_pat)
+
+        value = stand_pat
+
+        for move in capturing_moves:
+            undo_record = board.apply_move(*move, symbol)
+            self.__check_budget()
+
+            if self.__statistics is not None:
+                self.__statistics.quiescence_nodes += 1
+
+            winner = board.get_winner()
+            if winner == self.__max_player:
+                new_value = math.inf
+            elif winner == self.__min_player:
+                new_value = -math.inf
+            else:
+                new_value = self.__quiescence_search(board, alpha, beta, not maximize_player, depth - 1)
+            board.undo_move(undo_record)
+
+            if maximize_player:
+                value = max(value, new_value)
+                alpha = max(alpha, value)
+            else:
+                value = min(value, new_value)
+                beta = min(beta, value)
+
+            if alpha >= beta:
+                break
+
+        return value
+
+    @staticmethod
+    def __has_winning_move(board: Board, moves, symbol):
+        """
+        :param moves: moves of 'symbol'
+        :return: True if one of the moves wins the game for 'symbol' (checked on the mobile pieces kept by the board), else False
+        """
+        for move in moves:
+            undo_record = board.apply_move(*move, symbol)
+            has_won = board.has_won(symbol)
+            board.undo_move(undo_record)
+
+            if has_won:
+                return True
+
+        return False
+
+    def __search_children(self, board: Board, depth, alpha, beta, maximize_player, table_move, principal_variation_move):
+        """
+        Search all the moves of the player to move, in the order of __order_moves().
+        :param table_move: best move found for this position by an earlier search, None if there is no such move
+        :param principal_variation_move: move played here by the previous principal variation, None if the board is not on it
+        :return: value of the current board and the best move found
+        """
+        ply = self.__iteration_depth - depth + 1
+
+        if self.__statistics is not None:
+            self.__statistics.expanded_nodes_per_ply[ply] += 1
+
         if maximize_player == True:
             value = -math.inf
 
-            player_moves = self.__get_moves_of_player(board, self.__max_player)
+            player_moves = self.__order_moves(board, self.__get_moves_of_player(board, self.__max_player), self.__max_player, ply, table_move, principal_variation_move)
 
             best_move = None
             if len(player_moves) != 0:
-                best_move = random.choice(player_moves)
+                best_move = player_moves[0]
 
             for move in player_moves:
-                board_copy = copy.deepcopy(board)
-                board_copy.move(POSITION(move["row"], move["column"]), move["move_position"], self.__max_player)
-
-                new_value, _ = self.__minimax_algorithm(board_copy, depth - 1, alpha, beta, False)
+                undo_record = board.apply_move(*move, self.__max_player)
+                new_value, _ = self.__minimax_algorithm(board, depth - 1, alpha, beta, False, principal_variation_move is not None and move == principal_variation_move)
+                board.undo_move(undo_record)
 
                 if new_value > value:
                     value = new_value
@@ -121,6 +633,9 @@ class ComputerIntelligentStrategy(object):
                 alpha = max(alpha, value)
 
                 if alpha >= beta:
+                    self.__store_cut_off(board, move, self.__max_player, ply, depth)
+                    if self.__statistics is not None:
+                        self.__statistics.beta_cut_offs_per_ply[ply] += 1
                     break # beta cut-off
 
             return value, best_move
@@ -128,17 +643,16 @@ class ComputerIntelligentStrategy(object):
         elif maximize_player == False:
             value = math.inf
 
-            player_moves = self.__get_moves_of_player(board, self.__min_player)
+            player_moves = self.__order_moves(board, self.__get_moves_of_player(board, self.__min_player), self.__min_player, ply, table_move, principal_variation_move)
 
             best_move = None
             if len(player_moves) != 0:
-                best_move = random.choice(player_moves)
+                best_move = player_moves[0]
 
             for move in player_moves:
-                board_copy = copy.deepcopy(board)
-                board_copy.move(POSITION(move["row"], move["column"]), move["move_position"], self.__min_player)
-
-                new_value, _ = self.__minimax_algorithm(board_copy, depth - 1, alpha, beta, True)
+                undo_record = board.apply_move(*move, self.__min_player)
+                new_value, _ = self.__minimax_algorithm(board, depth - 1, alpha, beta, True, principal_variation_move is not None and move == principal_variation_move)
+                board.undo_move(undo_record)
 
                 if new_value < value:
                     value = new_value
@@ -146,147 +660,152 @@ class ComputerIntelligentStrategy(object):
 
                 beta = min(beta, value)
                 if beta <= alpha:
+                    self.__store_cut_off(board, move, self.__min_player, ply, depth)
+                    if self.__statistics is not None:
+                        self.__statistics.alpha_cut_offs_per_ply[ply] += 1
                     break # alpha cut-off
 
             return value, best_move
 
-    def __evaluation_value(self, board):
+    def __order_moves(self, board: Board, moves, symbol, ply, table_move, principal_variation_move):
         """
-        Evaluate the board -- associate a value to it based on how well it behaves for the maximizing player
-        :param board: the board to evaluate
-        :return: associated value
+        :param moves: moves of 'symbol', capturing moves first (as generated by the board)
+        :return: the moves in search order -- principal variation move, transposition table move, capturing moves, killer moves, other moves by history score
+        """
+        if not self.__move_ordering:
+            self.__move_to_front(moves, table_move)
+            self.__move_to_front(moves, principal_variation_move)
+            return moves
+
+        first_moves = []
+        if principal_variation_move is not None and principal_variation_move in moves:
+            first_moves.append(principal_variation_move)
+        if table_move is not None and table_move != principal_variation_move and table_move in moves:
+            first_moves.append(table_move)
+
+        opponent_pieces = board.get_pieces_mask(board.get_opponent_symbol(symbol))
+        killer_moves = self.__killer_moves[ply] if ply < len(self.__killer_moves) else ()
+        capturing_moves = []
+        killers = []
+        quiet_moves = []
+
+        for move in moves:
+            if move in first_moves:
+                continue
+
+            if opponent_pieces >> move[1] & 1:
+                capturing_moves.append(move)
+            elif move in killer_moves:
+                killers.append(move)
+            else:
+                quiet_moves.append(move)
+
+        if len(quiet_moves) > 1:
+            history = self.__history[symbol]
+            # stable sort, moves without history keep the order of the board
+            quiet_moves.sort(key=lambda move: history.get(move, 0), reverse=True)
+
+        return first_moves + capturing_moves + killers + quiet_moves
+
+    def __store_cut_off(self, board: Board, move, symbol, ply, depth):
+        """
+        Remember a quiet move that caused a cut-off as killer move of the ply and raise its history score.
         """
-        number_pieces = {self.__min_player: 0, self.__max_player: 0}
-        number_capturing_moves = {self.__min_player: 0, self.__max_player: 0}
+        if not self.__move_ordering or board.get_pieces_mask(board.get_opponent_symbol(symbol)) >> move[1] & 1:
+            # capturing moves are searched early anyway (the move is already undone, so a capture still has the opponent piece on its destination)
+            return
 
-        for row in range(board.rows):
-            for column in range(board.columns):
-                cell_symbol = board.get_board_symbol(row, column)
-                if cell_symbol != EMPTY_CELL_SYMBOL:
-                    number_pieces[cell_symbol] += 1
+        if ply < len(self.__killer_moves):
+            killer_moves = self.__killer_moves[ply]
+            if killer_moves[0] != move:
+                killer_moves[1] = killer_moves[0]
+                killer_moves[0] = move
 
-                    active_piece = POSITION(row, column)
-                    adjacent_piece_cells = self.__adjacent_symbol_cells(board, active_piece, cell_symbol)
+        history = self.__history[symbol]
+        history[move] = history.get(move, 0) + depth * depth
 
-                    for adjacent_piece in adjacent_piece_cells:
-                        opponent_piece = self.__check_can_capture_opponent_piece(board, active_piece, adjacent_piece, board.get_opponent_symbol(cell_symbol))
-                        if opponent_piece != None:
-                            number_capturing_moves[cell_symbol] += 1
+    def __reset_move_ordering(self, depth):
+        """
+        Forget the killer moves and history scores of the previous search.
+        :param depth: deepest iteration of the new search
+        """
+        self.__killer_moves = [[None, None] for _ in range(depth + 2)]
+        self.__history = {COMPUTER_SYMBOL: {}, PLAYER_SYMBOL: {}}
 
-        number_pieces_cost = 10
-        capture_move_cost = 5
+    def __is_tie_winner(self, ties):
+        """
+        :param ties: number of root moves tied so far, including the current one
+        :return: True if the current move replaces the chosen one, every tied move is chosen with probability 1 / ties in the end
+        """
+        return self.__random.random() * ties < 1
 
-        evaluation_value = number_pieces_cost * (number_pieces[self.__max_player] - number_pieces[self.__min_player]) + capture_move_cost * (number_capturing_moves[self.__max_player] - number_capturing_moves[self.__min_player])
+    @staticmethod
+    def __move_to_front(moves, move):
+        if move is not None and move in moves:
+            moves.remove(move)
+            moves.insert(0, move)
 
-        return evaluation_value
+    def __evaluation_value(self, board):
+        """
+        Evaluate the board -- associate a value to it based on how well it behaves for the maximizing player
+        :param board: the board to evaluate
+        :return: associated value
+        """
+        return self.__evaluator.evaluate(board)
 
     def __get_moves_of_player(self, board: Board, player_symbol):
         """
         Find all available moves for a specific player and board.
         :param board: board to search on
         :param player_symbol: symbol of pieces to check
-        :return: list with all the moves found
-        """
-        moves = []
-
-        for row in range(board.rows):
-            for column in range(board.columns):
-                if board.get_board_symbol(row, column) == player_symbol:
-                    piece_moves = self.__get_moves_of_piece(board, row, column, player_symbol)
-                    for move in piece_moves:
-                        moves.append({"row": row, "column": column, "move_position": move})
-
-        return moves
-
-    def __get_moves_of_piece(self, board: Board, piece_row, piece_column, piece_symbol):
-        """
-        Find all the available moves for a specific  piece and board.
-        :param board: board to search on
-        :param piece_row: row of piece to search for
-        :param piece_column: column of piece to search for
-        :param piece_symbol: symbol of piece to search for
-        :return: list of all the moves found for the piece
+        :return: list with all the moves found, as (piece_index, destination_index) pairs
         """
-        moves = []
-        piece_position = POSITION(piece_row, piece_column)
+        return board.get_moves(player_symbol)
 
-        # possible moves to empty adjacent cells
-        moves.extend(self.__adjacent_symbol_cells(board, piece_position, EMPTY_CELL_SYMBOL))
 
-        # possible capturing moves
-        moves.extend(self.__find_capturing_moves(board, piece_position, piece_symbol))
+# --- parallel search
 
-        return moves
+# process pools by number of workers, shared by all the strategies of the process
+search_pools = {}
 
-    def __adjacent_symbol_cells(self, board: Board, cell_position, symbol):
-        """
-        Find all the adjacent cells of a specific position with a specific symbol.
-        :param board: board to search on
-        :param cell_position: cell for which to find adjacent cells (x, y) = (row, column)
-        :param symbol: the symbol to be found in the adjacent cells
-        :return: list with the adjacent cells found
-        """
-        adjacent_cells_positions = []
+# strategies of a worker process by search options, their transposition tables are kept between the searches
+worker_strategies = {}
 
-        if (cell_position.x >= 0 and cell_position.x < board.rows - 1) and board.get_board_symbol(cell_position.x + 1, cell_position.y) == symbol:
-            adjacent_cells_positions.append(POSITION(cell_position.x + 1, cell_position.y))
-        if (cell_position.x > 0 and cell_position.x <= board.rows - 1) and board.get_board_symbol(cell_position.x - 1, cell_position.y) == symbol:
-            adjacent_cells_positions.append(POSITION(cell_position.x - 1, cell_position.y))
-        if (cell_position.y >= 0 and cell_position.y < board.columns - 1) and board.get_board_symbol(cell_position.x, cell_position.y + 1) == symbol:
-            adjacent_cells_positions.append(POSITION(cell_position.x, cell_position.y + 1))
-        if (cell_position.y > 0 and cell_position.y <= board.columns - 1) and board.get_board_symbol(cell_position.x, cell_position.y - 1) == symbol:
-            adjacent_cells_positions.append(POSITION(cell_position.x, cell_position.y - 1))
+# root position (player_pieces, computer_pieces) of the last move searched by the strategies of worker_strategies
+worker_root_positions = {}
 
-        return adjacent_cells_positions
 
-    def __find_capturing_moves(self, board: Board, piece, piece_symbol):
-        """
-        Find all the capturing moves available for a specific piece and board.
-        :param board: board to search on
-        :param piece: the piece for which to find capturing moves
-        :param piece_symbol: the symbol of the piece to found moves for
-        :return: list with all the capturing moves found for piece
-        """
-        capturing_positions = []
-        adjacent_pieces_list = self.__adjacent_symbol_cells(board, piece, piece_symbol)
-
-        for adjacent_piece in adjacent_pieces_list:
-            opponent_captured_piece = self.__check_can_capture_opponent_piece(board, piece, adjacent_piece, board.get_opponent_symbol(piece_symbol))
-
-            if opponent_captured_piece != None:
-                capturing_positions.append(opponent_captured_piece)
+def get_search_pool(workers):
+    pool = search_pools.get(workers)
 
-        return capturing_positions
+    if pool is None:
+        pool = ProcessPoolExecutor(max_workers=workers)
+        search_pools[workers] = pool
 
-    def __check_can_capture_opponent_piece(self, board: Board, active_piece, jumped_over_piece, opponent_symbol):
-        """
-        Check if with the given pieces can be executed a capturing move.
-        :param board: board to check on
-        :param active_piece: position of piece that will jump
-        :param jumped_over_piece: position of piece that will be jumped over
-        :param opponent_symbol: symbol of piece that should be found to capture
-        :return: position of the captured piece = destination cell if found, else None
-        """
-        if active_piece.x == jumped_over_piece.x:
-            step = active_piece.y - jumped_over_piece.y
+    return pool
 
-            opponent_y = active_piece.y - step * 2
 
-            try:
-                if board.get_board_symbol(active_piece.x, opponent_y) == opponent_symbol:
-                    return POSITION(active_piece.x, opponent_y)
-            except OutOfBoardError:
-                return None
+def search_root_move_in_worker(worker_options, player_pieces, computer_pieces, move, depth, alpha, time_budget, node_budget):
+    """
+    Search a root move in a worker process of the pool (see ComputerIntelligentStrategy.search_root_move()).
+    :return: (score of the move, evaluation of the board after the move, number of nodes visited), None if a budget was used up
+    """
+    strategy = worker_strategies.get(worker_options)
 
-        elif active_piece.y == jumped_over_piece.y:
-            step = active_piece.x - jumped_over_piece.x
+    if strategy is None:
+        rows, columns, transposition_table_size, number_pieces_cost, capture_move_cost, move_ordering, quiescence = worker_options
+        strategy = ComputerIntelligentStrategy(Board(rows, columns), transposition_table_size=transposition_table_size, opening_book_path=None,
+                                               number_pieces_cost=number_pieces_cost, capture_move_cost=capture_move_cost, move_ordering=move_ordering,
+                                               quiescence=quiescence)
+        worker_strategies[worker_options] = strategy
 
-            opponent_x = active_piece.x - step * 2
+    strategy.board.load_position(player_pieces, computer_pieces)
 
-            try:
-                if board.get_board_symbol(opponent_x, active_piece.y) == opponent_symbol:
-                    return POSITION(opponent_x, active_piece.y)
-            except OutOfBoardError:
-                return None
+    # the moves of one search share their root position, another position starts a new search
+    new_search = worker_root_positions.get(worker_options) != (player_pieces, computer_pieces)
+    worker_root_positions[worker_options] = (player_pieces, computer_pieces)
 
-        return None
\ No newline at end of file
+    try:
+        return strategy.search_root_move(move, depth, alpha, time_budget, node_budget, new_search)
+    except SearchTimeout:
+        return None
@@ -2,29 +2,31 @@ import random
 
 from src.services.board import Board
 from src.constants import POSITION, COMPUTER_SYMBOL
+from src.exceptions import NoValidMoveError
 
 
 class ComputerRandomStrategy(object):
     """
-    Strategy that chooses a random valid move for the computer.
+    Strategy that chooses a random valid move for the computer, every valid move with the same probability.
+    With a seed the moves come from a private random generator and a game can be reproduced, without one the shared 'random' module is used.
     """
-    def __init__(self, board: Board):
+    def __init__(self, board: Board, seed = None):
         self.__board = board
+        self.__random = random.Random(seed) if seed is not None else random
 
     def get_move(self):
         """
-        Generates random positions for the piece to move and the destination cell until it finds a valid move for the pair of possitions
+        Choose one of the valid moves of the computer (one move generation and one random draw).
         :return: corresponding positions for the random valid move found
+        :raises NoValidMoveError: if the computer has no valid move
         """
-        while True:
-            piece_row = random.randint(0, self.__board.rows - 1)
-            piece_column = random.randint(0,self.__board.columns - 1)
+        moves = self.__board.get_moves(COMPUTER_SYMBOL)
+        if len(moves) == 0:
+            raise NoValidMoveError()
 
-            move_row = random.randint(0,self.__board.rows - 1)
-            move_column = random.randint(0,self.__board.columns - 1)
+        piece_index, move_index = self.__random.choice(moves)
 
-            piece_position = POSITION(piece_row, piece_column)
-            move_position = POSITION(move_row, move_column)
+        piece_position = POSITION(*self.__board.geometry.row_column(piece_index))
+        move_position = POSITION(*self.__board.geometry.row_column(move_index))
 
-            if self.__board.check_valid_move(piece_position, move_position, COMPUTER_SYMBOL):
-                return piece_position, move_position
+        return piece_position, move_position
@@ -0,0 +1,65 @@
+import os
+
+from src.services.board import Board
+from src.services.tablebase import Tablebase, DEFAULT_TABLEBASE_PATH, WIN, LOSS
+from src.constants import COMPUTER_SYMBOL, PLAYER_SYMBOL, POSITION
+from src.exceptions import NoValidMoveError
+
+
+class ComputerTablebaseStrategy(object):
+    """
+    Strategy that plays perfectly by looking up every move in the precomputed endgame tablebase (src/tools/generate_tablebase.py).
+    Prefers the fastest win, then a draw, then the slowest loss.
+    """
+    def __init__(self, board: Board, tablebase_path = DEFAULT_TABLEBASE_PATH):
+        if not os.path.exists(tablebase_path):
+            raise FileNotFoundError("Tablebase not found at {}, generate it with 'python -m src.tools.generate_tablebase'".format(tablebase_path))
+
+        self.__board = board
+        self.__tablebase = Tablebase(tablebase_path)
+
+        if (self.__tablebase.rows, self.__tablebase.columns) != (board.rows, board.columns):
+            raise ValueError("Tablebase is for a {}x{} board".format(self.__tablebase.rows, self.__tablebase.columns))
+
+    def get_move(self):
+        computer_pieces = self.__board.get_pieces_mask(COMPUTER_SYMBOL)
+        player_pieces = self.__board.get_pieces_mask(PLAYER_SYMBOL)
+
+        best_move = None
+        best_score = None
+
+        for piece_index, move_index in self.__board.get_moves(COMPUTER_SYMBOL):
+            # the position after the move, seen from the side of the player (next to move)
+            player_after_move = player_pieces & ~(1 << move_index)
+            computer_after_move = computer_pieces ^ ((1 << piece_index) | (1 << move_index))
+
+            score = self.__move_score(self.__tablebase.probe(player_after_move, computer_after_move))
+            if best_score is None or score > best_score:
+                best_score = score
+                best_move = (piece_index, move_index)
+
+        if best_move is None:
+            raise NoValidMoveError()
+
+        piece_position = POSITION(*self.__board.geometry.row_column(best_move[0]))
+        move_position = POSITION(*self.__board.geometry.row_column(best_move[1]))
+
+        return piece_position, move_position
+
+    @staticmethod
+    def __move_score(player_result):
+        """
+        :param player_result: tablebase result of the position after the move, for the player
+        :return: comparable score of the move for the computer (higher is better)
+        """
+        if player_result is None:
+            # position not in the tablebase, rated as a draw
+            return 1, 0
+
+        result, distance = player_result
+        if result == LOSS:
+            return 2, -distance
+        elif result == WIN:
+            return 0, distance
+
+        return 1, 0
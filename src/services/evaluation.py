@@ -0,0 +1,56 @@
+from src.services.bitboard import count_capturing_moves
+from src.services.board import Board
+from src.constants import COMPUTER_SYMBOL, PLAYER_SYMBOL
+
+NUMBER_PIECES_COST = 10
+CAPTURE_MOVE_COST = 5
+
+
+class Evaluator(object):
+    """
+    Static evaluation of a board for the computer: number_pieces_cost * (difference of pieces) + capture_move_cost * (difference of capturing moves).
+
+    Both terms are read from the bitboards in a few shifts (all pieces at once, see count_capturing_moves() in src/services/bitboard.py).
+    The values are also kept by position hash in a fixed size table (slot key % cache_size), the same leaves come back through
+    transpositions and in every iteration of the search.
+    """
+    def __init__(self, number_pieces_cost = NUMBER_PIECES_COST, capture_move_cost = CAPTURE_MOVE_COST, cache_size = 1 << 16):
+        self.__number_pieces_cost = number_pieces_cost
+        self.__capture_move_cost = capture_move_cost
+        self.__cache_size = cache_size
+        self.__cache = [None] * cache_size
+
+    @property
+    def number_pieces_cost(self):
+        return self.__number_pieces_cost
+
+    @property
+    def capture_move_cost(self):
+        return self.__capture_move_cost
+
+    def clear(self):
+        self.__cache = [None] * self.__cache_size
+
+    def evaluate(self, board: Board):
+        """
+        :param board: board to evaluate
+        :return: value of the board, higher is better for the computer
+        """
+        key = board.zobrist_hash
+        entry = self.__cache[key % self.__cache_size]
+        if entry is not None and entry[0] == key:
+            return entry[1]
+
+        computer_pieces = board.get_pieces_mask(COMPUTER_SYMBOL)
+        player_pieces = board.get_pieces_mask(PLAYER_SYMBOL)
+
+        # capturing moves of the computer minus the ones of the player
+        number_capturing_moves = (count_capturing_moves(board.geometry, computer_pieces, player_pieces)
+                                  - count_capturing_moves(board.geometry, player_pieces, computer_pieces))
+
+        number_pieces = computer_pieces.bit_count() - player_pieces.bit_count()
+        value = self.__number_pieces_cost * number_pieces + self.__capture_move_cost * number_capturing_moves
+
+        self.__cache[key % self.__cache_size] = (key, value)
+
+        return value
@@ -1,4 +1,5 @@
 from src.services.board import Board
+from src.services.game_record import GameRecord
 from src.constants import PLAYER_SYMBOL, COMPUTER_SYMBOL, POSITION
 
 class Game(object):
@@ -6,15 +7,45 @@ class Game(object):
         self.__board = board
         self.__computer_strategy = computer_strategy
 
+        # start position and (symbol, piece_index, move_index) of every move made through the game
+        self.__start_pieces = (board.get_pieces_mask(PLAYER_SYMBOL), board.get_pieces_mask(COMPUTER_SYMBOL))
+        self.__history = []
+
+    @property
+    def history(self):
+        return list(self.__history)
+
     def player_move(self, piece_row, piece_column, move_row, move_column):
         piece_position = POSITION(piece_row, piece_column)
         move_position = POSITION(move_row, move_column)
 
         self.__board.move(piece_position, move_position, PLAYER_SYMBOL)
+        self.__add_to_history(piece_position, move_position, PLAYER_SYMBOL)
 
     def computer_move(self):
         piece_position, move_position = self.__computer_strategy.get_move()
 
         self.__board.move(piece_position, move_position, COMPUTER_SYMBOL)
+        self.__add_to_history(piece_position, move_position, COMPUTER_SYMBOL)
+
+        return piece_position, move_position
+
+    def get_record(self):
+        """
+        :return: GameRecord of the moves made so far, the winner is the one of the board or, if the player to move cannot move, the other player
+        """
+        winner = self.__board.get_winner()
+
+        if winner is None and len(self.__history) != 0:
+            symbol_to_move = self.__board.get_opponent_symbol(self.__history[-1][0])
+            if len(self.__board.get_moves(symbol_to_move)) == 0:
+                winner = self.__board.get_opponent_symbol(symbol_to_move)
+
+        first_symbol = self.__history[0][0] if len(self.__history) != 0 else None
+        moves = [(piece_index, move_index) for _, piece_index, move_index in self.__history]
+
+        return GameRecord(self.__board.rows, self.__board.columns, *self.__start_pieces, first_symbol, moves, winner)
 
-        return piece_position, move_position
\ No newline at end of file
+    def __add_to_history(self, piece_position, move_position, symbol):
+        geometry = self.__board.geometry
+        self.__history.append((symbol, geometry.index(*piece_position), geometry.index(*move_position)))
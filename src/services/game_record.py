@@ -0,0 +1,171 @@
+# Game records: one line of text per game, so millions of games can be archived in one file and read back as a stream.
+#
+# Line layout (fields separated by one space):
+#   rows columns player_pieces computer_pieces first winner move move ...
+# - player_pieces, computer_pieces: hexadecimal masks of the start position (see src/services/bitboard.py for the cell numbering)
+# - first: symbol of the player that made the first move, winner: symbol of the winner, '-' if there is none
+# - every move is one integer, piece_index * (rows * columns) + move_index, the players alternate starting with 'first'
+#
+# For example the first two moves of a 4 x 4 game from the start board, the computer starting, no winner yet:
+#   4 4 ff00 ff X - 8 213
+
+from src.constants import ROWS, COLUMNS, COMPUTER_SYMBOL, PLAYER_SYMBOL, POSITION
+from src.services.board import Board
+
+NO_SYMBOL = '-'
+
+
+class GameRecord(object):
+    def __init__(self, rows = ROWS, columns = COLUMNS, player_pieces = None, computer_pieces = None, first_symbol = None, moves = None, winner = None):
+        """
+        :param player_pieces: mask of the player pieces at the start, None for the pieces of Board.load_start_board()
+        :param computer_pieces: mask of the computer pieces at the start, None for the pieces of Board.load_start_board()
+        :param first_symbol: PLAYER_SYMBOL or COMPUTER_SYMBOL, the player that moves first -- None if no move was made
+        :param moves: list of (piece_index, move_index), the players alternate
+        :param winner: PLAYER_SYMBOL, COMPUTER_SYMBOL or None
+        """
+        if player_pieces is None or computer_pieces is None:
+            board = Board(rows, columns)
+            player_pieces, computer_pieces = board.get_pieces_mask(PLAYER_SYMBOL), board.get_pieces_mask(COMPUTER_SYMBOL)
+
+        self.__rows = rows
+        self.__columns = columns
+        self.__player_pieces = player_pieces
+        self.__computer_pieces = computer_pieces
+        self.__first_symbol = first_symbol
+        self.__moves = list(moves or [])
+        self.__winner = winner
+
+    @property
+    def rows(self):
+        return self.__rows
+
+    @property
+    def columns(self):
+        return self.__columns
+
+    @property
+    def player_pieces(self):
+        return self.__player_pieces
+
+    @property
+    def computer_pieces(self):
+        return self.__computer_pieces
+
+    @property
+    def first_symbol(self):
+        return self.__first_symbol
+
+    @property
+    def moves(self):
+        return list(self.__moves)
+
+    @property
+    def winner(self):
+        return self.__winner
+
+    def __len__(self):
+        return len(self.__moves)
+
+    def get_symbol(self, ply):
+        """
+        :param ply: number of the move, starting at 0
+        :return: symbol of the player that makes the move
+        """
+        if ply % 2 == 0:
+            return self.__first_symbol
+
+        return COMPUTER_SYMBOL if self.__first_symbol == PLAYER_SYMBOL else PLAYER_SYMBOL
+
+    def replay(self, plies = None):
+        """
+        Rebuild a position of the game by playing the moves again on a new board, every move is validated by Board.move().
+        :param plies: number of moves to play, None for all of them
+        :return: Board with the position after 'plies' moves
+        :raises BoardError: if a move of the record is not valid
+        """
+        board = Board(self.__rows, self.__columns)
+        board.load_position(self.__player_pieces, self.__computer_pieces)
+
+        for ply, (piece_index, move_index) in enumerate(self.__moves[:plies]):
+            board.move(POSITION(*board.geometry.row_column(piece_index)), POSITION(*board.geometry.row_column(move_index)), self.get_symbol(ply))
+
+        return board
+
+    def to_line(self):
+        """
+        :return: the record in the line layout of this module, without the line end
+        """
+        cells = self.__rows * self.__columns
+        fields = [str(self.__rows), str(self.__columns), format(self.__player_pieces, "x"), format(self.__computer_pieces, "x"),
+                  self.__first_symbol or NO_SYMBOL, self.__winner or NO_SYMBOL]
+        fields.extend(str(piece_index * cells + move_index) for piece_index, move_index in self.__moves)
+
+        return " ".join(fields)
+
+    @classmethod
+    def from_line(cls, line):
+        """
+        :param line: line written by to_line(), the line end is ignored
+        :return: GameRecord
+        :raises ValueError: if the line does not follow the layout
+        """
+        fields = line.split()
+        if len(fields) < 6:
+            raise ValueError("Game record line with {} fields, at least 6 are needed".format(len(fields)))
+
+        rows, columns = int(fields[0]), int(fields[1])
+        cells = rows * columns
+
+        first_symbol = cls.__read_symbol(fields[4])
+        winner = cls.__read_symbol(fields[5])
+        moves = [divmod(int(field), cells) for field in fields[6:]]
+
+        return cls(rows, columns, int(fields[2], 16), int(fields[3], 16), first_symbol, moves, winner)
+
+    @staticmethod
+    def __read_symbol(field):
+        if field == NO_SYMBOL:
+            return None
+        if field not in (PLAYER_SYMBOL, COMPUTER_SYMBOL):
+            raise ValueError("Unknown symbol in game record: {!r}".format(field))
+
+        return field
+
+
+class GameRecordWriter(object):
+    """
+    Appends game records to a file, one line per record. Use it as a context manager or close() it.
+    With flush = True every record is flushed to the file as soon as it is written, a process that is killed loses none of them.
+    """
+    def __init__(self, path, append = True, flush = False):
+        self.__file = open(path, "a" if append else "w", encoding="ascii")
+        self.__flush = flush
+
+    def write(self, record: GameRecord):
+        self.__file.write(record.to_line())
+        self.__file.write("\n")
+
+        if self.__flush:
+            self.__file.flush()
+
+    def close(self):
+        self.__file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def read_game_records(path):
+    """
+    Read the records of a file one at a time, the file is never loaded as a whole.
+    :param path: file written by GameRecordWriter
+    :return: generator of GameRecord, empty lines are skipped
+    """
+    with open(path, encoding="ascii") as file:
+        for line in file:
+            if line.strip():
+                yield GameRecord.from_line(line)
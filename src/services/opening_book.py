@@ -0,0 +1,134 @@
+# Opening book: the best move of the first plies of the game, found offline by deep searches from the start board
+# (src/tools/build_opening_book.py).
+#
+# Like the tablebase, positions are stored from the point of view of the player to move ('own' pieces against 'opponent' pieces), so the
+# same entry answers for the computer and for the player. Only the canonical form of every position is stored (src/services/symmetry.py),
+# one entry answers for all the positions symmetric to it, its move is mapped back to the position asked for.
+#
+# File layout (little endian):
+#   header: magic (8 bytes), rows (1 byte), columns (1 byte), 2 padding bytes, number of entries (4 bytes)
+#   entries sorted by position: own pieces mask (8 bytes), opponent pieces mask (8 bytes), piece index (1 byte), destination index (1 byte)
+#   (books written before the entries were canonical are read as well, their symmetric entries are merged on reading)
+
+import os
+import struct
+from functools import lru_cache
+
+from src.services.board import Board
+from src.services.symmetry import get_symmetries, canonicalize, canonical_key
+
+OPENING_BOOK_MAGIC = b"KONOBK01"
+OPENING_BOOK_HEADER = struct.Struct("<8sBB2xI")
+OPENING_BOOK_ENTRY = struct.Struct("<QQBB")
+
+# masks are stored in 8 bytes
+MAXIMUM_CELLS = 64
+
+DEFAULT_OPENING_BOOK_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "kono_4x4.book")
+
+
+class OpeningBook(object):
+    def __init__(self, rows, columns, moves = None):
+        """
+        :param rows: number of rows of the board
+        :param columns: number of columns of the board
+        :param moves: dictionary (own pieces mask, opponent pieces mask) -> (piece_index, move_index)
+        """
+        if rows * columns > MAXIMUM_CELLS:
+            raise ValueError("Opening books are limited to boards of {} cells".format(MAXIMUM_CELLS))
+
+        self.__rows = rows
+        self.__columns = columns
+        self.__symmetries = get_symmetries(rows, columns)
+        # canonical (own pieces mask, opponent pieces mask) -> move on the canonical position
+        self.__moves = {}
+
+        for (own_pieces, opponent_pieces), move in (moves or {}).items():
+            self.add(own_pieces, opponent_pieces, move)
+
+    @property
+    def rows(self):
+        return self.__rows
+
+    @property
+    def columns(self):
+        return self.__columns
+
+    def __len__(self):
+        """
+        :return: number of entries, one per class of symmetric positions
+        """
+        return len(self.__moves)
+
+    def add(self, own_pieces, opponent_pieces, move):
+        """
+        Add the move of a position, it replaces the move of any symmetric position already in the book.
+        """
+        own_pieces, opponent_pieces, symmetry = canonicalize(self.__symmetries, own_pieces, opponent_pieces)
+        self.__moves[(own_pieces, opponent_pieces)] = symmetry.transform_move(move)
+
+    def get_move(self, own_pieces, opponent_pieces):
+        """
+        :param own_pieces: mask of the pieces of the player to move
+        :param opponent_pieces: mask of the pieces of the other player
+        :return: book move (piece_index, move_index), None if neither the position nor a symmetric one is in the book
+        """
+        own_pieces, opponent_pieces, symmetry = canonicalize(self.__symmetries, own_pieces, opponent_pieces)
+        move = self.__moves.get((own_pieces, opponent_pieces))
+
+        return symmetry.restore_move(move) if move is not None else None
+
+    def get_board_move(self, board: Board, symbol):
+        """
+        :param board: board of the size of the book
+        :param symbol: symbol of the player to move
+        :return: book move (piece_index, move_index) of 'symbol' on the board, None if neither the board nor a symmetric one is in the book
+        """
+        position, symmetry = canonical_key(board, symbol)
+        move = self.__moves.get(position)
+
+        return symmetry.restore_move(move) if move is not None else None
+
+    def write(self, path):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+        with open(path, "wb") as file:
+            file.write(OPENING_BOOK_HEADER.pack(OPENING_BOOK_MAGIC, self.__rows, self.__columns, len(self.__moves)))
+
+            for (own_pieces, opponent_pieces), (piece_index, move_index) in sorted(self.__moves.items()):
+                file.write(OPENING_BOOK_ENTRY.pack(own_pieces, opponent_pieces, piece_index, move_index))
+
+    @classmethod
+    def read(cls, path):
+        """
+        :param path: path of a file written by OpeningBook.write()
+        :return: OpeningBook
+        :raises ValueError: if the file is not an opening book
+        """
+        with open(path, "rb") as file:
+            data = file.read()
+
+        if len(data) < OPENING_BOOK_HEADER.size:
+            raise ValueError("{} is not an opening book".format(path))
+
+        magic, rows, columns, number_of_entries = OPENING_BOOK_HEADER.unpack_from(data)
+        if magic != OPENING_BOOK_MAGIC or len(data) != OPENING_BOOK_HEADER.size + number_of_entries * OPENING_BOOK_ENTRY.size:
+            raise ValueError("{} is not an opening book".format(path))
+
+        moves = {}
+        for own_pieces, opponent_pieces, piece_index, move_index in OPENING_BOOK_ENTRY.iter_unpack(data[OPENING_BOOK_HEADER.size:]):
+            moves[(own_pieces, opponent_pieces)] = (piece_index, move_index)
+
+        return cls(rows, columns, moves)
+
+
+@lru_cache(maxsize=None)
+def load_opening_book(path = DEFAULT_OPENING_BOOK_PATH):
+    """
+    Read an opening book once per process, the strategies of all the games share it.
+    :return: OpeningBook, None if the file does not exist
+    """
+    if not os.path.exists(path):
+        return None
+
+    return OpeningBook.read(path)
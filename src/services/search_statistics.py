@@ -0,0 +1,84 @@
+# Statistics of a ComputerIntelligentStrategy search, filled in while it runs, to see where the time of a move goes.
+#
+# Plies are counted from the board the search starts on: the root is ply 0, the boards after a computer move are ply 1 and so on.
+
+import time
+from collections import namedtuple
+
+# events given to the search callback of ComputerIntelligentStrategy
+ROOT_MOVE_SEARCHED = "root move searched"
+ITERATION_COMPLETED = "iteration completed"
+
+# one completed iteration of the iterative deepening: its depth, the seconds and nodes it took, the move it chose and its principal variation
+ITERATION = namedtuple('Iteration', ['depth', 'seconds', 'nodes', 'best_move', 'principal_variation'])
+
+
+class SearchStatistics(object):
+    """
+    Counters of the last search. The counters per ply are lists indexed by ply.
+    With a process pool (workers > 1) the root moves searched by the workers only add their number of nodes.
+    """
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        """
+        Clear the counters, called by the strategy at the start of every search.
+        :return: None
+        """
+        self.nodes = 0
+        self.leaf_evaluations = 0
+        # nodes of the quiescence search, boards after a capture below the leaves (they are counted in nodes too, not per ply)
+        self.quiescence_nodes = 0
+        # nodes visited, nodes whose moves were searched and cut-offs, per ply
+        self.nodes_per_ply = [0]
+        self.expanded_nodes_per_ply = [0]
+        self.beta_cut_offs_per_ply = [0]
+        self.alpha_cut_offs_per_ply = [0]
+        # ITERATION records of the completed iterations, root move records of the iteration being searched
+        self.iterations = []
+        self.root_moves = []
+        self.book_move = False
+        self.start_time = time.perf_counter()
+        self.seconds = 0.0
+
+    def ensure_plies(self, plies):
+        """
+        Make room for the counters of 'plies' plies.
+        :return: None
+        """
+        for counters in (self.nodes_per_ply, self.expanded_nodes_per_ply, self.beta_cut_offs_per_ply, self.alpha_cut_offs_per_ply):
+            counters.extend([0] * (plies - len(counters)))
+
+    @property
+    def branching_factor(self):
+        """
+        Average number of moves searched per expanded node (after the cut-offs), 0 if no node was expanded.
+        """
+        expanded_nodes = sum(self.expanded_nodes_per_ply)
+
+        return sum(self.nodes_per_ply) / expanded_nodes if expanded_nodes != 0 else 0.0
+
+    @property
+    def principal_variation(self):
+        """
+        Principal variation of the last completed iteration, empty if there is none.
+        """
+        return self.iterations[-1].principal_variation if len(self.iterations) != 0 else []
+
+    def as_dict(self):
+        """
+        :return: the statistics as a dictionary of numbers and lists, for logging
+        """
+        return {
+            "nodes": self.nodes,
+            "leaf_evaluations": self.leaf_evaluations,
+            "quiescence_nodes": self.quiescence_nodes,
+            "branching_factor": self.branching_factor,
+            "seconds": self.seconds,
+            "book_move": self.book_move,
+            "nodes_per_ply": list(self.nodes_per_ply),
+            "beta_cut_offs_per_ply": list(self.beta_cut_offs_per_ply),
+            "alpha_cut_offs_per_ply": list(self.alpha_cut_offs_per_ply),
+            "iterations": [iteration._asdict() for iteration in self.iterations],
+        }
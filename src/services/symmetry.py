@@ -0,0 +1,143 @@
+# Symmetries of a Kono board: the permutations of the cells that keep the rules, so positions that only differ by one of them have the same value.
+#
+# Every rectangular board can be mirrored left-right, flipped upside down and turned by 180 degrees. A square board can also be transposed
+# and turned by 90 degrees (8 symmetries in all). Pieces move orthogonally by one or two cells, so every symmetry maps moves to moves.
+#
+# Seen from the player to move ('own' pieces against 'opponent' pieces, like the tablebase and the opening book) the rules do not depend on
+# the colour of the pieces either. The colour swap plus vertical flip that maps the start board to itself is then just the vertical flip.
+#
+# The canonical form of a position is the smallest (first mask, second mask) pair over all the symmetries. A cache keyed by the canonical
+# form keeps one entry per class of symmetric positions, the symmetry returned with it maps the stored moves back to the position.
+
+from functools import lru_cache
+
+from src.constants import ROWS, COLUMNS
+from src.services.bitboard import get_geometry, bit_indexes
+
+IDENTITY = "identity"
+MIRROR = "mirror" # left-right
+FLIP = "flip" # upside down
+ROTATE_180 = "rotate 180"
+TRANSPOSE = "transpose" # square boards only, over the main diagonal
+ANTI_TRANSPOSE = "anti-transpose" # square boards only, over the other diagonal
+ROTATE_90 = "rotate 90" # square boards only, clockwise
+ROTATE_270 = "rotate 270" # square boards only, clockwise
+
+
+class Symmetry(object):
+    """
+    One symmetry of a board size: the cell permutation and byte tables to apply it to a whole mask at once.
+    Use get_symmetries() instead of building instances directly, symmetries are cached per board size.
+    """
+    def __init__(self, name, permutation):
+        """
+        :param name: IDENTITY, MIRROR, FLIP, ...
+        :param permutation: tuple, permutation[index] is the cell index 'index' is mapped to
+        """
+        self.name = name
+        self.permutation = tuple(permutation)
+        self.inverse_permutation = tuple(sorted(range(len(self.permutation)), key=self.permutation.__getitem__))
+
+        # byte_tables[byte][value]: mask of the cells the bits 'value' of byte 'byte' of a mask are mapped to
+        self.__byte_tables = tuple(tuple(self.__map_bits(value, 8 * byte) for value in range(256)) for byte in range((len(self.permutation) + 7) // 8))
+
+    def __deepcopy__(self, memo):
+        # symmetries are read-only and shared like the geometries
+        return self
+
+    def __repr__(self):
+        return "Symmetry({!r})".format(self.name)
+
+    def transform_mask(self, mask):
+        """
+        :return: mask with every set cell moved to the cell the symmetry maps it to
+        """
+        result = 0
+        for table in self.__byte_tables:
+            result |= table[mask & 255]
+            mask >>= 8
+
+        return result
+
+    def transform_move(self, move):
+        """
+        :param move: (piece_index, move_index) on the original position
+        :return: the same move on the transformed position
+        """
+        return self.permutation[move[0]], self.permutation[move[1]]
+
+    def restore_move(self, move):
+        """
+        :param move: (piece_index, move_index) on the transformed position
+        :return: the same move on the original position
+        """
+        return self.inverse_permutation[move[0]], self.inverse_permutation[move[1]]
+
+    def __map_bits(self, value, first_index):
+        result = 0
+        for index in bit_indexes(value):
+            if first_index + index < len(self.permutation):
+                result |= 1 << self.permutation[first_index + index]
+
+        return result
+
+
+@lru_cache(maxsize=None)
+def get_symmetries(rows = ROWS, columns = COLUMNS):
+    """
+    :return: tuple of the Symmetry of the board size, IDENTITY first
+    """
+    geometry = get_geometry(rows, columns)
+
+    transforms = [
+        (IDENTITY, lambda row, column: (row, column)),
+        (MIRROR, lambda row, column: (row, columns - 1 - column)),
+        (FLIP, lambda row, column: (rows - 1 - row, column)),
+        (ROTATE_180, lambda row, column: (rows - 1 - row, columns - 1 - column)),
+    ]
+    if rows == columns:
+        transforms.extend([
+            (TRANSPOSE, lambda row, column: (column, row)),
+            (ANTI_TRANSPOSE, lambda row, column: (columns - 1 - column, rows - 1 - row)),
+            (ROTATE_90, lambda row, column: (column, rows - 1 - row)),
+            (ROTATE_270, lambda row, column: (columns - 1 - column, row)),
+        ])
+
+    return tuple(Symmetry(name, (geometry.index(*transform(*geometry.row_column(index))) for index in range(geometry.cells)))
+                 for name, transform in transforms)
+
+
+def canonicalize(symmetries, first, second):
+    """
+    Find the canonical form of a position given by two masks, (own pieces, opponent pieces) or (player pieces, computer pieces).
+    :param symmetries: symmetries returned by get_symmetries() for the board size
+    :param first: first mask of the position
+    :param second: second mask of the position
+    :return: (first mask, second mask, Symmetry) -- the smallest transformed pair, and the symmetry that maps the position to it
+    """
+    best_first, best_second, best_symmetry = first, second, symmetries[0]
+
+    for symmetry in symmetries[1:]:
+        transformed_first = symmetry.transform_mask(first)
+        if transformed_first > best_first:
+            continue
+
+        transformed_second = symmetry.transform_mask(second)
+        if transformed_first < best_first or transformed_second < best_second:
+            best_first, best_second, best_symmetry = transformed_first, transformed_second, symmetry
+
+    return best_first, best_second, best_symmetry
+
+
+def canonical_key(board, symbol):
+    """
+    Canonical key of a board with 'symbol' to move, the same for every board symmetric to it (whatever the colour of the player to move).
+    :param board: Board
+    :param symbol: symbol of the player to move
+    :return: ((own pieces mask, opponent pieces mask), Symmetry) -- the canonical position and the symmetry that maps the board to it,
+             moves of the board go to the key with symmetry.transform_move() and come back with symmetry.restore_move()
+    """
+    own, opponent, symmetry = canonicalize(get_symmetries(board.rows, board.columns), board.get_pieces_mask(symbol),
+                                           board.get_pieces_mask(board.get_opponent_symbol(symbol)))
+
+    return (own, opponent), symmetry
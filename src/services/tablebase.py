@@ -0,0 +1,120 @@
+# Endgame tablebase: the game theoretic value of every position reachable from the start board.
+#
+# Positions are stored from the point of view of the player to move ('own' pieces against 'opponent' pieces). The rules do not depend on
+# the colour of the pieces, so the same entry answers for the computer and for the player.
+#
+# File layout (little endian):
+#   header: magic (8 bytes), rows (1 byte), columns (1 byte), 6 padding bytes
+#   one byte per ternary index -- index = sum(3^cell for own pieces) + 2 * sum(3^cell for opponent pieces)
+#
+# Entry byte: 0 = position is not reachable, 1 = draw, 2 + 2 * distance = win, 3 + 2 * distance = loss, distance = plies until the game ends.
+
+import mmap
+import os
+import struct
+from functools import lru_cache
+
+TABLEBASE_MAGIC = b"KONOTB01"
+TABLEBASE_HEADER = struct.Struct("<8sBB6x")
+
+DEFAULT_TABLEBASE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "kono_4x4.tablebase")
+
+NOT_REACHABLE = 0
+DRAW = 1
+MAXIMUM_DISTANCE = 126
+
+WIN = "win"
+LOSS = "loss"
+DRAW_RESULT = "draw"
+
+
+def encode_entry(result, distance):
+    """
+    :param result: WIN, LOSS or DRAW_RESULT (for the player to move)
+    :param distance: number of plies until the game ends (ignored for draws)
+    :return: entry byte
+    :raises ValueError: if the distance does not fit in an entry
+    """
+    if result == DRAW_RESULT:
+        return DRAW
+
+    if not 0 <= distance <= MAXIMUM_DISTANCE:
+        raise ValueError("Distance {} does not fit in a tablebase entry".format(distance))
+
+    return (2 if result == WIN else 3) + 2 * distance
+
+
+def decode_entry(entry):
+    """
+    :param entry: entry byte
+    :return: (result, distance) for the player to move, None if the position is not reachable
+    """
+    if entry == NOT_REACHABLE:
+        return None
+
+    if entry == DRAW:
+        return DRAW_RESULT, None
+
+    return (WIN if entry % 2 == 0 else LOSS), (entry - 2) // 2
+
+
+@lru_cache(maxsize=None)
+def ternary_byte_table():
+    """
+    :return: tuple with sum(3^bit) for the set bits of every byte value
+    """
+    return tuple(sum(3 ** bit for bit in range(8) if value >> bit & 1) for value in range(256))
+
+
+def position_index(own, opponent):
+    """
+    Ternary index of a position, each cell is a digit: 0 empty, 1 piece of the player to move, 2 opponent piece.
+    :param own: bitboard of the player to move
+    :param opponent: bitboard of the opponent
+    :return: index of the position in the tablebase
+    """
+    table = ternary_byte_table()
+    index = 0
+    weight = 1
+
+    while own or opponent:
+        index += (table[own & 255] + 2 * table[opponent & 255]) * weight
+        own >>= 8
+        opponent >>= 8
+        weight *= 6561 # 3^8
+
+    return index
+
+
+class Tablebase(object):
+    """
+    Read-only tablebase file mapped in memory, every probe is a single byte lookup.
+    """
+    def __init__(self, path = DEFAULT_TABLEBASE_PATH):
+        self.__file = open(path, "rb")
+        self.__data = mmap.mmap(self.__file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, self.__rows, self.__columns = TABLEBASE_HEADER.unpack_from(self.__data, 0)
+        if magic != TABLEBASE_MAGIC or len(self.__data) != TABLEBASE_HEADER.size + 3 ** (self.__rows * self.__columns):
+            self.close()
+            raise ValueError("{} is not a tablebase file".format(path))
+
+    @property
+    def rows(self):
+        return self.__rows
+
+    @property
+    def columns(self):
+        return self.__columns
+
+    def probe(self, own, opponent):
+        """
+        :param own: bitboard of the player to move
+        :param opponent: bitboard of the opponent
+        :return: (result, distance) for the player to move, None if the position is not in the tablebase
+        """
+        return decode_entry(self.__data[TABLEBASE_HEADER.size + position_index(own, opponent)])
+
+    def close(self):
+        self.__data.close()
+        self.__file.close()
@@ -0,0 +1,60 @@
+EXACT = 0
+LOWER_BOUND = 1 # the search failed high, the real value is at least the stored one
+UPPER_BOUND = 2 # the search failed low, the real value is at most the stored one
+
+
+class TranspositionTable(object):
+    """
+    Fixed size table of search results indexed by position hash.
+    Every entry keeps (key, depth, value, bound, best move, generation) and lives in the slot key % size.
+
+    Replacement policy: a new result replaces the stored one if the slot is empty, the stored entry comes from an older search
+    (generation), it is for the same position, or it was searched to at most the same depth. Deeper results of the current search are kept.
+    """
+    def __init__(self, size = 1 << 16):
+        self.__size = size
+        self.__slots = [None] * size
+        self.__generation = 0
+
+    @property
+    def size(self):
+        return self.__size
+
+    def new_search(self):
+        """
+        Mark the entries stored until now as older than the ones of the next search (they can still be found, but are replaced first).
+        :return: None
+        """
+        self.__generation += 1
+
+    def clear(self):
+        self.__slots = [None] * self.__size
+        self.__generation = 0
+
+    def get(self, key):
+        """
+        :param key: position hash
+        :return: (depth, value, bound, best_move) stored for the position, or None if not found
+        """
+        entry = self.__slots[key % self.__size]
+
+        if entry is None or entry[0] != key:
+            return None
+
+        return entry[1], entry[2], entry[3], entry[4]
+
+    def store(self, key, depth, value, bound, best_move):
+        """
+        Store a search result, following the replacement policy.
+        :param key: position hash
+        :param depth: remaining depth the position was searched to
+        :param value: value found by the search
+        :param bound: EXACT, LOWER_BOUND or UPPER_BOUND
+        :param best_move: best move found, can be None
+        :return: None
+        """
+        index = key % self.__size
+        entry = self.__slots[index]
+
+        if entry is None or entry[5] != self.__generation or entry[0] == key or entry[1] <= depth:
+            self.__slots[index] = (key, depth, value, bound, best_move, self.__generation)
@@ -0,0 +1,45 @@
+# Zobrist hashing: every (symbol, cell) pair gets a random 64 bit key and a position hashes to the xor of the keys of its pieces.
+# Moving a piece only xors out its old cell and xors in the new one (plus the captured piece), so Board keeps its hash up to date in O(1).
+
+import random
+from functools import lru_cache
+
+from src.constants import PLAYER_SYMBOL, COMPUTER_SYMBOL
+from src.services.bitboard import bit_indexes
+
+ZOBRIST_SEED = 0x4B6F6E6F
+
+# xor-ed into a board hash when the computer is the one to move, positions with different players to move must not share an entry
+COMPUTER_TO_MOVE_KEY = random.Random(ZOBRIST_SEED - 1).getrandbits(64)
+
+
+@lru_cache(maxsize=None)
+def get_zobrist_keys(cells):
+    """
+    Keys are generated from a fixed seed so hashes stay the same between runs (and processes) for the same board size.
+    :param cells: number of cells of the board
+    :return: dictionary symbol -> tuple with the key of every cell
+    """
+    generator = random.Random(ZOBRIST_SEED + cells)
+
+    return {
+        PLAYER_SYMBOL: tuple(generator.getrandbits(64) for _ in range(cells)),
+        COMPUTER_SYMBOL: tuple(generator.getrandbits(64) for _ in range(cells)),
+    }
+
+
+def compute_hash(keys, player_pieces, computer_pieces):
+    """
+    Hash a position from scratch.
+    :param keys: keys returned by get_zobrist_keys()
+    :param player_pieces: bitboard of the player pieces
+    :param computer_pieces: bitboard of the computer pieces
+    :return: zobrist hash of the position
+    """
+    position_hash = 0
+
+    for symbol, pieces in ((PLAYER_SYMBOL, player_pieces), (COMPUTER_SYMBOL, computer_pieces)):
+        for index in bit_indexes(pieces):
+            position_hash ^= keys[symbol][index]
+
+    return position_hash
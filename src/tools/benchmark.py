@@ -0,0 +1,247 @@
+# Benchmarks of the engine hot paths on a fixed corpus of positions (src/tools/node_count_benchmark.py builds it by seeded random play).
+#
+#     python -m src.tools.benchmark [--positions 40] [--maximum-depth 7] [--repeat 5] [--output results.json]
+#                                   [--baseline baseline.json] [--threshold 0.1] [--save-baseline baseline.json]
+#
+# Every benchmark reports its wall time (best of --repeat runs), operations per second, nodes per second for the searches and the peak
+# memory allocated while it runs (measured with tracemalloc in one more run, tracing slows the code down so it is not timed).
+#
+# Results can be saved as a baseline and compared with one: a benchmark whose time per operation grew by more than --threshold is flagged
+# as a regression and the exit code is 1. Baselines only compare on the same machine and Python version.
+
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+from src.constants import ROWS, COLUMNS, COMPUTER_SYMBOL, PLAYER_SYMBOL, POSITION
+from src.exceptions import GameOver
+from src.services.board import Board
+from src.services.tablebase import DEFAULT_TABLEBASE_PATH
+from src.services.computer_strategies.computer_capturing_strategy import ComputerCapturingStrategy
+from src.services.computer_strategies.computer_intelligent_strategy import ComputerIntelligentStrategy
+from src.services.computer_strategies.computer_random_strategy import ComputerRandomStrategy
+from src.services.computer_strategies.computer_tablebase_strategy import ComputerTablebaseStrategy
+from src.tools.node_count_benchmark import build_corpus
+
+DEFAULT_POSITIONS = 40
+DEFAULT_MAXIMUM_DEPTH = 7
+DEFAULT_REPEAT = 5
+DEFAULT_THRESHOLD = 0.1
+
+# the board benchmarks go over their corpus this many times per run, once takes a few milliseconds
+BOARD_ROUNDS = 50
+
+
+class Benchmark(object):
+    """
+    One benchmark: run() does the measured work once and returns (number of operations, number of nodes searched or None).
+    """
+    def __init__(self, name, run):
+        self.name = name
+        self.run = run
+
+    def measure(self, repeat):
+        """
+        :return: dictionary with the measurements of the benchmark
+        """
+        best_time = None
+        operations, nodes = 0, None
+
+        for _ in range(repeat):
+            start = time.perf_counter()
+            operations, nodes = self.run()
+            elapsed = time.perf_counter() - start
+
+            if best_time is None or elapsed < best_time:
+                best_time = elapsed
+
+        tracemalloc.start()
+        self.run()
+        _, peak_memory = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        result = {
+            "name": self.name,
+            "operations": operations,
+            "seconds": best_time,
+            "seconds_per_operation": best_time / operations,
+            "operations_per_second": operations / best_time,
+            "peak_memory_bytes": peak_memory,
+        }
+        if nodes is not None:
+            result["nodes"] = nodes
+            result["nodes_per_second"] = nodes / best_time
+
+        return result
+
+
+def get_benchmarks(corpus, maximum_depth, rows = ROWS, columns = COLUMNS):
+    """
+    :param corpus: list of (player_pieces, computer_pieces), computer to move
+    :param maximum_depth: deepest ComputerIntelligentStrategy search
+    :return: list of Benchmark
+    """
+    board = Board(rows, columns)
+    geometry = board.geometry
+
+    # (player_pieces, computer_pieces, piece_position, move_position, symbol) of every valid move of both players in the corpus
+    moves = []
+    for player_pieces, computer_pieces in corpus:
+        board.load_position(player_pieces, computer_pieces)
+        for symbol in (COMPUTER_SYMBOL, PLAYER_SYMBOL):
+            for piece_index, move_index in board.get_moves(symbol):
+                moves.append((player_pieces, computer_pieces, POSITION(*geometry.row_column(piece_index)), POSITION(*geometry.row_column(move_index)), symbol))
+
+    # every (piece cell, cell up to two cells away in a row or column) pair, valid or not
+    move_checks = [(POSITION(*geometry.row_column(piece_index)), POSITION(*geometry.row_column(move_index)))
+                   for piece_index in range(geometry.cells)
+                   for move_index in list(geometry.steps[piece_index]) + [landing_index for _, landing_index in geometry.jumps[piece_index]]]
+
+    # the board benchmarks include loading the position (Board.load_position()) before every move
+    def board_move():
+        for _ in range(BOARD_ROUNDS):
+            for player_pieces, computer_pieces, piece_position, move_position, symbol in moves:
+                board.load_position(player_pieces, computer_pieces)
+                board.move(piece_position, move_position, symbol)
+
+        return BOARD_ROUNDS * len(moves), None
+
+    def board_check_valid_move():
+        for _ in range(BOARD_ROUNDS):
+            for player_pieces, computer_pieces in corpus:
+                board.load_position(player_pieces, computer_pieces)
+                for piece_position, move_position in move_checks:
+                    board.check_valid_move(piece_position, move_position, COMPUTER_SYMBOL)
+                    board.check_valid_move(piece_position, move_position, PLAYER_SYMBOL)
+
+        return BOARD_ROUNDS * 2 * len(corpus) * len(move_checks), None
+
+    def board_is_board_won():
+        for _ in range(BOARD_ROUNDS):
+            for player_pieces, computer_pieces, piece_position, move_position, symbol in moves:
+                board.load_position(player_pieces, computer_pieces)
+                board.move(piece_position, move_position, symbol)
+                try:
+                    board.is_board_won(symbol)
+                except GameOver:
+                    pass
+
+        return BOARD_ROUNDS * len(moves), None
+
+    def strategy_get_move(strategy_class, **options):
+        def run():
+            nodes = 0
+            for player_pieces, computer_pieces in corpus:
+                board.load_position(player_pieces, computer_pieces)
+                strategy = strategy_class(board, **options)
+                strategy.get_move()
+                nodes += getattr(strategy, "nodes_searched", 0)
+
+            return len(corpus), nodes or None
+
+        return run
+
+    benchmarks = [
+        Benchmark("board.move", board_move),
+        Benchmark("board.check_valid_move", board_check_valid_move),
+        Benchmark("board.is_board_won", board_is_board_won),
+        Benchmark("random.get_move", strategy_get_move(ComputerRandomStrategy, seed=0)),
+        Benchmark("capturing.get_move", strategy_get_move(ComputerCapturingStrategy)),
+        Benchmark("intelligent.get_move", strategy_get_move(ComputerIntelligentStrategy, seed=0)),
+    ]
+
+    if (rows, columns) == (ROWS, COLUMNS) and os.path.exists(DEFAULT_TABLEBASE_PATH):
+        benchmarks.append(Benchmark("tablebase.get_move", strategy_get_move(ComputerTablebaseStrategy)))
+
+    for depth in range(1, maximum_depth + 1):
+        # no opening book, every position is searched with an empty transposition table
+        benchmarks.append(Benchmark("search.depth_{}".format(depth), strategy_get_move(ComputerIntelligentStrategy, target_depth=depth, opening_book_path=None, seed=0)))
+
+    return benchmarks
+
+
+def find_regressions(results, baseline, threshold = DEFAULT_THRESHOLD):
+    """
+    :param results: list of results of Benchmark.measure()
+    :param baseline: dictionary saved by --save-baseline
+    :param threshold: allowed growth of the time per operation, 0.1 for 10%
+    :return: list of (name, baseline seconds per operation, seconds per operation) of the benchmarks slower than the baseline allows
+    """
+    baseline_results = {result["name"]: result for result in baseline["results"]}
+    regressions = []
+
+    for result in results:
+        baseline_result = baseline_results.get(result["name"])
+        if baseline_result is None:
+            continue
+
+        if result["seconds_per_operation"] > baseline_result["seconds_per_operation"] * (1 + threshold):
+            regressions.append((result["name"], baseline_result["seconds_per_operation"], result["seconds_per_operation"]))
+
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the board operations, the strategies and the searches.")
+    parser.add_argument("--positions", type=int, default=DEFAULT_POSITIONS)
+    parser.add_argument("--seed", type=int, default=0, help="seed of the random play that builds the positions")
+    parser.add_argument("--maximum-depth", type=int, default=DEFAULT_MAXIMUM_DEPTH)
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="the best time of this many runs is kept")
+    parser.add_argument("--only", default=None, help="run only the benchmarks whose name starts with this prefix")
+    parser.add_argument("--output", default=None, help="JSON file to write the results to")
+    parser.add_argument("--baseline", default=None, help="results saved with --save-baseline to compare with")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="allowed slowdown against the baseline, 0.1 for 10%%")
+    parser.add_argument("--save-baseline", default=None, help="JSON file to save the results to as the new baseline")
+    arguments = parser.parse_args()
+
+    corpus = build_corpus(arguments.positions, arguments.seed)
+    benchmarks = get_benchmarks(corpus, arguments.maximum_depth)
+    if arguments.only is not None:
+        benchmarks = [benchmark for benchmark in benchmarks if benchmark.name.startswith(arguments.only)]
+
+    results = []
+    print("{:24} {:>10} {:>10} {:>14} {:>14} {:>12}".format("benchmark", "operations", "seconds", "operations/s", "nodes/s", "peak KiB"))
+    for benchmark in benchmarks:
+        result = benchmark.measure(arguments.repeat)
+        results.append(result)
+
+        nodes_per_second = "{:14.0f}".format(result["nodes_per_second"]) if "nodes_per_second" in result else "{:>14}".format("-")
+        print("{:24} {:10} {:10.4f} {:14.1f} {} {:12.1f}".format(result["name"], result["operations"], result["seconds"], result["operations_per_second"],
+                                                              nodes_per_second, result["peak_memory_bytes"] / 1024), flush=True)
+
+    report = {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "positions": arguments.positions,
+        "seed": arguments.seed,
+        "results": results,
+    }
+
+    for path in (arguments.output, arguments.save_baseline):
+        if path is not None:
+            with open(path, "w") as file:
+                json.dump(report, file, indent=2)
+
+    if arguments.baseline is not None:
+        with open(arguments.baseline) as file:
+            baseline = json.load(file)
+
+        if (baseline["positions"], baseline["seed"]) != (arguments.positions, arguments.seed):
+            parser.error("the baseline was measured on another corpus ({} positions, seed {})".format(baseline["positions"], baseline["seed"]))
+
+        regressions = find_regressions(results, baseline, arguments.threshold)
+        for name, baseline_time, current_time in regressions:
+            print("REGRESSION {}: {:.3g}s -> {:.3g}s per operation ({:+.1%})".format(name, baseline_time, current_time, current_time / baseline_time - 1), file=sys.stderr)
+
+        if len(regressions) != 0:
+            sys.exit(1)
+
+        print("no regression beyond {:.0%} against {}".format(arguments.threshold, arguments.baseline), file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
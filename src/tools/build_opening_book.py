@@ -0,0 +1,107 @@
+# Offline builder of the opening book read by ComputerIntelligentStrategy (see src/services/opening_book.py for the file format).
+#
+#     python -m src.tools.build_opening_book [--plies 6] [--depth 9] [--output PATH]
+#
+# Walks the game tree from Board.load_start_board() for the first --plies plies, with the book side playing first and second and with
+# either half of the board. Where the book side is to move, the position is searched with ComputerIntelligentStrategy at --depth and only
+# the best move is followed; where the other side is to move, every move is followed. Lines that lead to positions symmetric to explored ones
+# are not walked again, the book keeps one entry for all of them (src/services/symmetry.py).
+
+import argparse
+import time
+
+from src.constants import ROWS, COLUMNS, COMPUTER_SYMBOL, PLAYER_SYMBOL
+from src.services.board import Board
+from src.services.opening_book import OpeningBook, DEFAULT_OPENING_BOOK_PATH
+from src.services.symmetry import get_symmetries, canonicalize
+from src.services.computer_strategies.computer_intelligent_strategy import ComputerIntelligentStrategy
+
+DEFAULT_PLIES = 6
+DEFAULT_DEPTH = 9
+
+
+class OpeningBookBuilder(object):
+    def __init__(self, rows = ROWS, columns = COLUMNS, plies = DEFAULT_PLIES, depth = DEFAULT_DEPTH, log = print):
+        # the book side always plays the computer pieces of this board
+        self.__board = Board(rows, columns)
+        self.__strategy = ComputerIntelligentStrategy(self.__board, target_depth=depth, opening_book_path=None)
+        self.__plies = plies
+        self.__log = log
+
+        self.__book = OpeningBook(rows, columns)
+        self.__symmetries = get_symmetries(rows, columns)
+        # canonical positions explored, with the plies explored from them and the side to move
+        self.__visited = set()
+
+    def build(self):
+        """
+        :return: OpeningBook with the best move of every position the book side can meet in the first plies
+        """
+        start = time.perf_counter()
+
+        self.__board.load_start_board()
+        top_pieces = self.__board.get_pieces_mask(COMPUTER_SYMBOL)
+        bottom_pieces = self.__board.get_pieces_mask(PLAYER_SYMBOL)
+
+        for own_pieces, opponent_pieces in ((top_pieces, bottom_pieces), (bottom_pieces, top_pieces)):
+            self.__explore(own_pieces, opponent_pieces, self.__plies, True)
+            self.__explore(own_pieces, opponent_pieces, self.__plies, False)
+
+        self.__log("{} positions ({:.1f}s)".format(len(self.__book), time.perf_counter() - start))
+
+        return self.__book
+
+    def __explore(self, own_pieces, opponent_pieces, plies, book_to_move):
+        """
+        :param own_pieces: mask of the pieces of the player to move
+        :param opponent_pieces: mask of the pieces of the other player
+        :param plies: number of plies left to explore
+        :param book_to_move: True if the book side is to move
+        """
+        if plies == 0:
+            return
+
+        canonical_own_pieces, canonical_opponent_pieces, _ = canonicalize(self.__symmetries, own_pieces, opponent_pieces)
+        if (canonical_own_pieces, canonical_opponent_pieces, plies, book_to_move) in self.__visited:
+            return
+        self.__visited.add((canonical_own_pieces, canonical_opponent_pieces, plies, book_to_move))
+
+        self.__board.load_position(opponent_pieces, own_pieces)
+
+        if self.__board.has_won(PLAYER_SYMBOL):
+            # the player to move lost with the previous move
+            return
+
+        moves = self.__board.get_moves(COMPUTER_SYMBOL)
+        if len(moves) == 0:
+            return
+
+        if book_to_move:
+            move = self.__book.get_move(own_pieces, opponent_pieces)
+            if move is None:
+                piece_position, move_position = self.__strategy.get_move()
+                move = (self.__board.geometry.index(*piece_position), self.__board.geometry.index(*move_position))
+                self.__book.add(own_pieces, opponent_pieces, move)
+
+            moves = [move]
+
+        for piece_index, move_index in moves:
+            # the position after the move, seen from the side of the next player to move
+            next_own_pieces = opponent_pieces & ~(1 << move_index)
+            next_opponent_pieces = own_pieces ^ ((1 << piece_index) | (1 << move_index))
+
+            self.__explore(next_own_pieces, next_opponent_pieces, plies - 1, not book_to_move)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the four-field Kono opening book.")
+    parser.add_argument("--plies", type=int, default=DEFAULT_PLIES, help="number of plies from the start board covered by the book")
+    parser.add_argument("--depth", type=int, default=DEFAULT_DEPTH, help="search depth of the book moves")
+    parser.add_argument("--output", default=DEFAULT_OPENING_BOOK_PATH, help="opening book file to write")
+    arguments = parser.parse_args()
+
+    OpeningBookBuilder(plies=arguments.plies, depth=arguments.depth).build().write(arguments.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,250 @@
+# Offline generator of the endgame tablebase read by ComputerTablebaseStrategy (see src/services/tablebase.py for the file format).
+#
+#     python -m src.tools.generate_tablebase [--output PATH]
+#
+# 1. enumerates every position reachable from Board.load_start_board() with either player moving first (breadth-first, a game stops at the
+#    first position won by the player that just moved)
+# 2. labels the positions by retrograde analysis: a position where the player to move has lost (Board.is_board_won() of the opponent) or
+#    cannot move is lost in 0 plies, a position with a move to a lost position is won, a position where every move leads to a won position
+#    is lost -- working backwards one ply at a time gives the distance to the end of the game; positions never labelled are draws
+#
+# The position space is 3^cells, so only the 4 x 4 board (43 million entries) is practical. Needs numpy.
+
+import argparse
+import os
+import time
+
+import numpy as np
+
+from src.constants import ROWS, COLUMNS, COMPUTER_SYMBOL, PLAYER_SYMBOL
+from src.services.board import Board
+from src.services.tablebase import (TABLEBASE_MAGIC, TABLEBASE_HEADER, DEFAULT_TABLEBASE_PATH, NOT_REACHABLE, DRAW, WIN, LOSS,
+                                    encode_entry, ternary_byte_table)
+
+CHUNK_SIZE = 1 << 21
+
+
+class TablebaseGenerator(object):
+    def __init__(self, rows = ROWS, columns = COLUMNS, log = print):
+        self.__board = Board(rows, columns)
+        self.__geometry = self.__board.geometry
+        self.__cells = self.__geometry.cells
+        self.__size = 3 ** self.__cells
+        self.__log = log
+
+        self.__ternary_table = np.array(ternary_byte_table(), dtype=np.int64)
+        self.__popcount_table = np.array([bin(value).count("1") for value in range(256)], dtype=np.int64)
+
+        # (piece cell, jumped over cell or -1 for a move to an adjacent empty cell, destination cell)
+        self.__move_slots = []
+        for index in range(self.__cells):
+            for step in self.__geometry.steps[index]:
+                self.__move_slots.append((index, -1, step))
+            for over_index, landing_index in self.__geometry.jumps[index]:
+                self.__move_slots.append((index, over_index, landing_index))
+
+        self.__reachable = None
+        self.__entries = None
+
+    def generate(self):
+        """
+        :return: numpy uint8 array with the entry of every position index
+        """
+        start = time.perf_counter()
+        self.__find_reachable_positions()
+        self.__log("reachable positions: {} ({:.1f}s)".format(int(self.__reachable.sum()), time.perf_counter() - start))
+
+        self.__retrograde_analysis()
+        self.__log("labelled positions ({:.1f}s)".format(time.perf_counter() - start))
+
+        return self.__entries
+
+    def write(self, path):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+        with open(path, "wb") as file:
+            file.write(TABLEBASE_HEADER.pack(TABLEBASE_MAGIC, self.__geometry.rows, self.__geometry.columns))
+            file.write(self.__entries.tobytes())
+
+    def __find_reachable_positions(self):
+        self.__reachable = np.zeros(self.__size, dtype=np.bool_)
+
+        computer_pieces = self.__board.get_pieces_mask(COMPUTER_SYMBOL)
+        player_pieces = self.__board.get_pieces_mask(PLAYER_SYMBOL)
+        own = np.array([computer_pieces, player_pieces], dtype=np.int64)
+        opponent = np.array([player_pieces, computer_pieces], dtype=np.int64)
+        self.__reachable[self.__indexes(own, opponent)] = True
+
+        while len(own) != 0:
+            next_own = []
+            next_opponent = []
+
+            for chunk in range(0, len(own), CHUNK_SIZE):
+                chunk_own = own[chunk:chunk + CHUNK_SIZE]
+                chunk_opponent = opponent[chunk:chunk + CHUNK_SIZE]
+
+                playing = ~self.__is_lost(chunk_own, chunk_opponent)
+                chunk_own = chunk_own[playing]
+                chunk_opponent = chunk_opponent[playing]
+
+                for child_own, child_opponent in self.__children(chunk_own, chunk_opponent):
+                    indexes, first = np.unique(self.__indexes(child_own, child_opponent), return_index=True)
+                    new = ~self.__reachable[indexes]
+                    self.__reachable[indexes[new]] = True
+                    next_own.append(child_own[first[new]])
+                    next_opponent.append(child_opponent[first[new]])
+
+            own = np.concatenate(next_own) if next_own else np.zeros(0, dtype=np.int64)
+            opponent = np.concatenate(next_opponent) if next_opponent else np.zeros(0, dtype=np.int64)
+
+    def __retrograde_analysis(self):
+        self.__entries = np.zeros(self.__size, dtype=np.uint8)
+        remaining_moves = np.zeros(self.__size, dtype=np.uint8)
+        reachable_indexes = np.flatnonzero(self.__reachable)
+
+        # positions lost for the player to move: opponent won with its last move or no move is left
+        for chunk in range(0, len(reachable_indexes), CHUNK_SIZE):
+            indexes = reachable_indexes[chunk:chunk + CHUNK_SIZE]
+            own, opponent = self.__positions(indexes)
+
+            number_of_moves = np.zeros(len(indexes), dtype=np.uint8)
+            for child_own, _, selected in self.__children(own, opponent, with_selection=True):
+                number_of_moves[selected] += 1
+
+            lost = self.__is_lost(own, opponent) | (number_of_moves == 0)
+            self.__entries[indexes[lost]] = encode_entry(LOSS, 0)
+            remaining_moves[indexes] = number_of_moves
+
+        distance = 0
+        new_losses = np.flatnonzero(self.__entries == encode_entry(LOSS, 0))
+        new_wins = np.zeros(0, dtype=np.int64)
+
+        while len(new_losses) != 0 or len(new_wins) != 0:
+            self.__log("distance {}: {} wins, {} losses".format(distance, len(new_wins), len(new_losses)))
+
+            # a move to a lost position wins
+            winning = self.__unlabelled_predecessors(new_losses)
+            winning = np.unique(winning)
+            self.__entries[winning] = encode_entry(WIN, distance + 1)
+
+            # every move leads to a won position: lost
+            predecessors, counts = np.unique(self.__unlabelled_predecessors(new_wins), return_counts=True)
+            remaining_moves[predecessors] -= counts.astype(np.uint8)
+            losing = predecessors[remaining_moves[predecessors] == 0]
+            self.__entries[losing] = encode_entry(LOSS, distance + 1)
+
+            new_wins = winning
+            new_losses = losing
+            distance += 1
+
+        self.__entries[self.__reachable & (self.__entries == NOT_REACHABLE)] = DRAW
+
+    def __unlabelled_predecessors(self, indexes):
+        """
+        Find the positions from which a move leads to one of the given positions (one result per such move).
+        :param indexes: indexes of labelled positions
+        :return: indexes of the reachable, not yet labelled, predecessor positions
+        """
+        found = []
+
+        for chunk in range(0, len(indexes), CHUNK_SIZE):
+            own, opponent = self.__positions(indexes[chunk:chunk + CHUNK_SIZE])
+            empty = ~(own | opponent)
+
+            # the opponent moved last, take its move back
+            for piece_index, over_index, move_index in self.__move_slots:
+                selected = (opponent >> move_index & 1).astype(np.bool_) & (empty >> piece_index & 1).astype(np.bool_)
+                if over_index >= 0:
+                    selected &= (opponent >> over_index & 1).astype(np.bool_)
+
+                previous_opponent = opponent[selected] ^ ((1 << piece_index) | (1 << move_index))
+                previous_own = own[selected]
+                if over_index >= 0:
+                    # put back the captured piece
+                    previous_own = previous_own | (1 << move_index)
+
+                predecessors = self.__indexes(previous_opponent, previous_own)
+                predecessors = predecessors[self.__reachable[predecessors]]
+                found.append(predecessors[self.__entries[predecessors] == NOT_REACHABLE])
+
+        return np.concatenate(found) if found else np.zeros(0, dtype=np.int64)
+
+    def __children(self, own, opponent, with_selection = False):
+        """
+        Play every move of the player to move (own pieces).
+        :return: generator of (child own, child opponent[, selection]) arrays, the children are seen from the side of the next player to move
+        """
+        empty = ~(own | opponent)
+
+        for piece_index, over_index, move_index in self.__move_slots:
+            if over_index < 0:
+                selected = (own >> piece_index & 1).astype(np.bool_) & (empty >> move_index & 1).astype(np.bool_)
+            else:
+                selected = ((own >> piece_index & 1) & (own >> over_index & 1) & (opponent >> move_index & 1)).astype(np.bool_)
+
+            child_opponent = own[selected] ^ ((1 << piece_index) | (1 << move_index))
+            child_own = opponent[selected] & ~(1 << move_index)
+
+            if with_selection:
+                yield child_own, child_opponent, np.flatnonzero(selected)
+            else:
+                yield child_own, child_opponent
+
+    def __is_lost(self, own, opponent):
+        """
+        Vectorized Board.is_board_won(opponent symbol): the player to move has one piece left or all its pieces are surrounded by opponent pieces.
+        """
+        lost = self.__popcount(own) == 1
+
+        free = np.zeros(len(own), dtype=np.bool_)
+        not_opponent = self.__geometry.full_mask & ~opponent
+        for offset, step_mask, _ in self.__geometry.directions:
+            shifted = not_opponent >> offset if offset > 0 else not_opponent << -offset
+            free |= (own & step_mask & shifted) != 0
+
+        return lost | ~free
+
+    def __indexes(self, own, opponent):
+        indexes = np.zeros(len(own), dtype=np.int64)
+        weight = 1
+
+        for shift in range(0, self.__cells, 8):
+            indexes += (self.__ternary_table[own >> shift & 255] + 2 * self.__ternary_table[opponent >> shift & 255]) * weight
+            weight *= 6561
+
+        return indexes
+
+    def __positions(self, indexes):
+        own = np.zeros(len(indexes), dtype=np.int64)
+        opponent = np.zeros(len(indexes), dtype=np.int64)
+
+        remaining = indexes.copy()
+        for cell in range(self.__cells):
+            digit = remaining % 3
+            remaining //= 3
+            own |= (digit == 1).astype(np.int64) << cell
+            opponent |= (digit == 2).astype(np.int64) << cell
+
+        return own, opponent
+
+    def __popcount(self, masks):
+        count = np.zeros(len(masks), dtype=np.int64)
+
+        for shift in range(0, self.__cells, 8):
+            count += self.__popcount_table[masks >> shift & 255]
+
+        return count
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate the four-field Kono endgame tablebase.")
+    parser.add_argument("--output", default=DEFAULT_TABLEBASE_PATH, help="tablebase file to write")
+    arguments = parser.parse_args()
+
+    generator = TablebaseGenerator()
+    generator.generate()
+    generator.write(arguments.output)
+
+
+if __name__ == "__main__":
+    main()
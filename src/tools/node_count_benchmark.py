@@ -0,0 +1,98 @@
+# Node count benchmark of the move ordering of ComputerIntelligentStrategy.
+#
+#     python -m src.tools.node_count_benchmark [--positions 40] [--depth 6] [--seed 0] [--rows 4] [--columns 4] [--quiescence]
+#
+# Searches the same corpus of positions (reached by seeded random play from the start board) with the killer/history move ordering on and
+# off and prints the nodes searched and the effective branching factor, nodes ** (1 / depth) per position, of both. With --quiescence both
+# searches go on with the capturing moves below their leaves (the nodes of the quiescence search are counted too).
+
+import argparse
+import math
+import random
+import time
+
+from src.constants import ROWS, COLUMNS, COMPUTER_SYMBOL, PLAYER_SYMBOL
+from src.services.board import Board
+from src.services.computer_strategies.computer_intelligent_strategy import ComputerIntelligentStrategy
+
+DEFAULT_POSITIONS = 40
+DEFAULT_DEPTH = 6
+MAXIMUM_OPENING_PLIES = 12
+
+
+def build_corpus(positions, seed = 0, rows = ROWS, columns = COLUMNS):
+    """
+    :param positions: number of positions
+    :param seed: seed of the random play
+    :return: list of (player_pieces, computer_pieces) with the computer to move and the game not over
+    """
+    generator = random.Random(seed)
+    board = Board(rows, columns)
+    corpus = []
+
+    while len(corpus) < positions:
+        board.load_start_board()
+        symbol = COMPUTER_SYMBOL if generator.random() < 0.5 else PLAYER_SYMBOL
+
+        for _ in range(generator.randrange(MAXIMUM_OPENING_PLIES + 1)):
+            moves = board.get_moves(symbol)
+            if len(moves) == 0 or board.get_winner() is not None:
+                break
+            board.apply_move(*generator.choice(moves), symbol)
+            symbol = board.get_opponent_symbol(symbol)
+
+        if symbol == COMPUTER_SYMBOL and board.get_winner() is None and len(board.get_moves(COMPUTER_SYMBOL)) != 0:
+            corpus.append((board.get_pieces_mask(PLAYER_SYMBOL), board.get_pieces_mask(COMPUTER_SYMBOL)))
+
+    return corpus
+
+
+def count_nodes(corpus, depth, move_ordering, rows = ROWS, columns = COLUMNS, quiescence = False):
+    """
+    Search every position of the corpus with a new strategy (empty transposition table).
+    :return: (list with the nodes searched per position, seconds taken)
+    """
+    board = Board(rows, columns)
+    nodes = []
+    start = time.perf_counter()
+
+    for player_pieces, computer_pieces in corpus:
+        board.load_position(player_pieces, computer_pieces)
+        strategy = ComputerIntelligentStrategy(board, target_depth=depth, opening_book_path=None, move_ordering=move_ordering, seed=0, quiescence=quiescence)
+        strategy.get_move()
+        nodes.append(strategy.nodes_searched)
+
+    return nodes, time.perf_counter() - start
+
+
+def effective_branching_factor(nodes, depth):
+    """
+    :return: geometric mean over the positions of nodes ** (1 / depth)
+    """
+    return math.exp(sum(math.log(max(count, 1)) for count in nodes) / len(nodes) / depth)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the nodes searched with and without the killer/history move ordering.")
+    parser.add_argument("--positions", type=int, default=DEFAULT_POSITIONS)
+    parser.add_argument("--depth", type=int, default=DEFAULT_DEPTH)
+    parser.add_argument("--seed", type=int, default=0, help="seed of the random play that builds the positions")
+    parser.add_argument("--rows", type=int, default=ROWS)
+    parser.add_argument("--columns", type=int, default=COLUMNS)
+    parser.add_argument("--quiescence", action="store_true", help="search the capturing moves below the leaves (quiescence search)")
+    arguments = parser.parse_args()
+
+    corpus = build_corpus(arguments.positions, arguments.seed, arguments.rows, arguments.columns)
+
+    results = {}
+    for move_ordering in (False, True):
+        nodes, seconds = count_nodes(corpus, arguments.depth, move_ordering, arguments.rows, arguments.columns, arguments.quiescence)
+        results[move_ordering] = sum(nodes)
+        print("move ordering {:3}: {:10} nodes, effective branching factor {:.2f}, {:.1f}s".format(
+            "on" if move_ordering else "off", sum(nodes), effective_branching_factor(nodes, arguments.depth), seconds))
+
+    print("nodes saved: {:.1%}".format(1 - results[True] / results[False]))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,201 @@
+# Headless strategy-vs-strategy tournament, no pygame window and no delays between turns.
+#
+#     python -m src.tools.tournament intelligent random --games 10000 --workers 8 [--records games.txt] > results.jsonl
+#
+# Games are spread over a process pool and every finished game is written as one JSON line as soon as it arrives, followed by a summary
+# on stderr. The strategies alternate the first move. With --records the moves of every game are appended to a game record file
+# (src/services/game_record.py), the first strategy playing the computer pieces.
+
+import argparse
+import json
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from src.constants import COMPUTER_SYMBOL, PLAYER_SYMBOL
+from src.services.board import Board
+from src.services.game import Game
+from src.services.game_record import GameRecord, GameRecordWriter
+from src.services.computer_strategies.computer_capturing_strategy import ComputerCapturingStrategy
+from src.services.computer_strategies.computer_intelligent_strategy import ComputerIntelligentStrategy
+from src.services.computer_strategies.computer_random_strategy import ComputerRandomStrategy
+from src.services.computer_strategies.computer_tablebase_strategy import ComputerTablebaseStrategy
+
+STRATEGIES = {
+    "random": ComputerRandomStrategy,
+    "capturing": ComputerCapturingStrategy,
+    "intelligent": ComputerIntelligentStrategy,
+    "tablebase": ComputerTablebaseStrategy,
+}
+
+FIRST_STRATEGY = "a"
+SECOND_STRATEGY = "b"
+
+DEFAULT_MAXIMUM_PLIES = 200
+
+
+class TournamentPlayer(object):
+    """
+    One side of a headless game. Every strategy plays the computer pieces, so each side has its own board where its pieces are the computer
+    ones and the opponent's pieces are the player ones. Moves are forwarded to both boards through Game.
+    """
+    def __init__(self, strategy_class, strategy_options, board: Board):
+        self.__board = board
+        self.__strategy = strategy_class(board, **strategy_options)
+        self.__game = Game(board, self.__strategy)
+
+        self.move_times = []
+        self.nodes_searched = None
+
+    @property
+    def board(self):
+        return self.__board
+
+    def play(self):
+        """
+        Let the strategy choose and execute its move.
+        :return: (piece_position, move_position) played
+        """
+        start = time.perf_counter()
+        piece_position, move_position = self.__game.computer_move()
+        self.move_times.append(time.perf_counter() - start)
+
+        nodes = getattr(self.__strategy, "nodes_searched", None)
+        if nodes is not None:
+            self.nodes_searched = (self.nodes_searched or 0) + nodes
+
+        return piece_position, move_position
+
+    def opponent_played(self, piece_position, move_position):
+        self.__game.player_move(piece_position.x, piece_position.y, move_position.x, move_position.y)
+
+    def has_moves(self):
+        return len(self.__board.get_moves(COMPUTER_SYMBOL)) != 0
+
+    def has_won(self):
+        return self.__board.has_won(COMPUTER_SYMBOL)
+
+    def get_record(self):
+        return self.__game.get_record()
+
+
+def play_game(game_number, first_strategy, second_strategy, first_options = None, second_options = None, seed = None, maximum_plies = DEFAULT_MAXIMUM_PLIES,
+              keep_record = False):
+    """
+    Play one game between two strategies.
+    :param game_number: number of the game in the tournament, the first strategy moves first in the even games
+    :param first_strategy: name of the first strategy (key of STRATEGIES)
+    :param second_strategy: name of the second strategy (key of STRATEGIES)
+    :param first_options: keyword arguments for the constructor of the first strategy
+    :param second_options: keyword arguments for the constructor of the second strategy
+    :param seed: seed of the random generator used by the strategies, the game can be replayed with the same seed
+    :param maximum_plies: the game is a draw after this many plies
+    :param keep_record: True to add the game record line (GameRecord.to_line()) of the game to the result, under "record"
+    :return: dictionary with the result of the game
+    """
+    random.seed(seed)
+
+    first_board = Board()
+    second_board = Board()
+    # colours swapped: on the second board the second strategy's pieces are the computer ones
+    second_board.load_position(first_board.get_pieces_mask(COMPUTER_SYMBOL), first_board.get_pieces_mask(PLAYER_SYMBOL))
+
+    players = {
+        FIRST_STRATEGY: TournamentPlayer(STRATEGIES[first_strategy], first_options or {}, first_board),
+        SECOND_STRATEGY: TournamentPlayer(STRATEGIES[second_strategy], second_options or {}, second_board),
+    }
+
+    turn = FIRST_STRATEGY if game_number % 2 == 0 else SECOND_STRATEGY
+    starting = turn
+    winner = None
+    reason = "maximum plies"
+    plies = 0
+
+    while plies < maximum_plies:
+        player = players[turn]
+        opponent_turn = SECOND_STRATEGY if turn == FIRST_STRATEGY else FIRST_STRATEGY
+
+        if not player.has_moves():
+            winner = opponent_turn
+            reason = "no moves"
+            break
+
+        piece_position, move_position = player.play()
+        players[opponent_turn].opponent_played(piece_position, move_position)
+        plies += 1
+
+        if player.has_won():
+            winner = turn
+            reason = "won"
+            break
+
+        turn = opponent_turn
+
+    result = {"game": game_number, "seed": seed, "first": starting, "winner": winner, "reason": reason, "plies": plies}
+    for name, player in players.items():
+        result[name] = {
+            "strategy": first_strategy if name == FIRST_STRATEGY else second_strategy,
+            "moves": len(player.move_times),
+            "mean_move_time": sum(player.move_times) / len(player.move_times) if player.move_times else 0.0,
+            "max_move_time": max(player.move_times, default=0.0),
+            "nodes_searched": player.nodes_searched,
+        }
+
+    if keep_record:
+        # every move went through both boards, the board of the first strategy has them all
+        result["record"] = players[FIRST_STRATEGY].get_record().to_line()
+
+    return result
+
+
+def run_tournament(first_strategy, second_strategy, games, workers = None, first_options = None, second_options = None, seed = 0, maximum_plies = DEFAULT_MAXIMUM_PLIES,
+                   keep_records = False):
+    """
+    Play a number of games on a process pool.
+    :return: generator of the game results, in the order the games finish
+    """
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(play_game, game_number, first_strategy, second_strategy, first_options, second_options, seed + game_number, maximum_plies,
+                                   keep_records)
+                   for game_number in range(games)]
+
+        for future in as_completed(futures):
+            yield future.result()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Play headless games between two computer strategies.")
+    parser.add_argument("first_strategy", choices=sorted(STRATEGIES))
+    parser.add_argument("second_strategy", choices=sorted(STRATEGIES))
+    parser.add_argument("--games", type=int, default=100)
+    parser.add_argument("--workers", type=int, default=None, help="number of processes (default: number of CPUs)")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the first game, game i uses seed + i")
+    parser.add_argument("--maximum-plies", type=int, default=DEFAULT_MAXIMUM_PLIES)
+    parser.add_argument("--first-options", type=json.loads, default=None, help="JSON object with constructor arguments of the first strategy")
+    parser.add_argument("--second-options", type=json.loads, default=None, help="JSON object with constructor arguments of the second strategy")
+    parser.add_argument("--records", default=None, help="game record file the moves of every game are appended to")
+    arguments = parser.parse_args()
+
+    writer = GameRecordWriter(arguments.records) if arguments.records is not None else None
+
+    wins = {FIRST_STRATEGY: 0, SECOND_STRATEGY: 0, None: 0}
+    start = time.perf_counter()
+
+    for result in run_tournament(arguments.first_strategy, arguments.second_strategy, arguments.games, arguments.workers,
+                                 arguments.first_options, arguments.second_options, arguments.seed, arguments.maximum_plies, writer is not None):
+        if writer is not None:
+            writer.write(GameRecord.from_line(result.pop("record")))
+
+        wins[result["winner"]] += 1
+        print(json.dumps(result), flush=True)
+
+    if writer is not None:
+        writer.close()
+
+    print("{}: {} wins, {}: {} wins, {} draws ({} games in {:.1f}s)".format(arguments.first_strategy, wins[FIRST_STRATEGY], arguments.second_strategy,
+                                                                           wins[SECOND_STRATEGY], wins[None], arguments.games, time.perf_counter() - start), file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
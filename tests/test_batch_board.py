@@ -0,0 +1,64 @@
+import unittest
+
+import numpy as np
+
+from src.constants import COMPUTER_SYMBOL, PLAYER_SYMBOL
+from src.services.batch_board import BatchBoard, NO_MOVE
+from src.services.board import Board
+from src.services.evaluation import Evaluator
+
+BOARD_SIZES = [(4, 4), (3, 4), (5, 6), (6, 6)]
+GAMES_PER_SIZE = 75
+MAXIMUM_PLIES = 60
+
+
+class TestBatchBoardLockstep(unittest.TestCase):
+    """
+    Random games played at once on a BatchBoard and one by one on Boards: the legal moves, the win flags, the evaluation and the positions
+    have to match at every ply.
+    """
+    def test_random_lockstep_games(self):
+        generator = np.random.default_rng(0)
+
+        for rows, columns in BOARD_SIZES:
+            with self.subTest(rows=rows, columns=columns):
+                computer_first = [game % 2 == 0 for game in range(GAMES_PER_SIZE)]
+                boards = [Board(rows, columns) for _ in range(GAMES_PER_SIZE)]
+                symbols = [COMPUTER_SYMBOL if first else PLAYER_SYMBOL for first in computer_first]
+                batch = BatchBoard.from_boards(boards, computer_first)
+                # no cache, every board is evaluated from its pieces
+                evaluator = Evaluator(cache_size=1)
+
+                for _ in range(MAXIMUM_PLIES):
+                    legal = batch.legal_moves()
+                    is_won, is_lost = batch.is_won(), batch.is_lost()
+                    evaluations = batch.evaluate()
+
+                    for game, (board, symbol) in enumerate(zip(boards, symbols)):
+                        batch_board, batch_symbol = batch.to_board(game)
+                        self.assertEqual(batch_symbol, symbol)
+                        self.assertEqual(batch_board.get_pieces_mask(PLAYER_SYMBOL), board.get_pieces_mask(PLAYER_SYMBOL))
+                        self.assertEqual(batch_board.get_pieces_mask(COMPUTER_SYMBOL), board.get_pieces_mask(COMPUTER_SYMBOL))
+
+                        self.assertEqual({batch.moves[slot] for slot in np.flatnonzero(legal[game])}, set(board.get_moves(symbol)))
+                        self.assertEqual(bool(is_won[game]), board.has_won(symbol))
+                        self.assertEqual(bool(is_lost[game]), board.has_won(board.get_opponent_symbol(symbol)))
+
+                        evaluation = evaluator.evaluate(board)
+                        self.assertEqual(int(evaluations[game]), evaluation if symbol == COMPUTER_SYMBOL else -evaluation)
+
+                    slots = batch.random_moves(generator, legal)
+                    # finished games stay as they are
+                    slots[is_won | is_lost] = NO_MOVE
+                    if np.all(slots == NO_MOVE):
+                        break
+
+                    batch.apply_moves(slots)
+                    for game, slot in enumerate(slots):
+                        if slot != NO_MOVE:
+                            boards[game].apply_move(*batch.moves[slot], symbols[game])
+                            symbols[game] = boards[game].get_opponent_symbol(symbols[game])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,75 @@
+import random
+import unittest
+
+from src.constants import COMPUTER_SYMBOL, PLAYER_SYMBOL
+from src.services.bitboard import is_immobilized
+from src.services.board import Board
+
+BOARD_SIZES = [(4, 4), (3, 4), (5, 6), (6, 6)]
+GAMES_PER_SIZE = 200
+MAXIMUM_PLIES = 80
+
+
+class TestIncrementalMobility(unittest.TestCase):
+    """
+    The mobile pieces, the hash and the win queries kept up to date by Board.apply_move() and Board.undo_move() are compared with the ones
+    of a board loaded with the same pieces (Board.load_position() computes them from scratch) after every move and every undo of random games.
+    """
+    def test_random_games(self):
+        generator = random.Random(0)
+
+        for rows, columns in BOARD_SIZES:
+            board = Board(rows, columns)
+
+            for _ in range(GAMES_PER_SIZE):
+                board.load_start_board()
+                symbol = generator.choice([COMPUTER_SYMBOL, PLAYER_SYMBOL])
+                undo_records = []
+
+                for _ in range(MAXIMUM_PLIES):
+                    moves = board.get_moves(symbol)
+                    if len(moves) == 0 or board.get_winner() is not None:
+                        break
+
+                    undo_records.append(board.apply_move(*generator.choice(moves), symbol))
+                    symbol = board.get_opponent_symbol(symbol)
+                    self.assert_matches_recomputed(board)
+
+                    if generator.random() < 0.2:
+                        # take back a few moves, then go on from there
+                        for _ in range(min(generator.randint(1, 3), len(undo_records))):
+                            board.undo_move(undo_records.pop())
+                            symbol = board.get_opponent_symbol(symbol)
+                            self.assert_matches_recomputed(board)
+
+                while len(undo_records) != 0:
+                    board.undo_move(undo_records.pop())
+                    self.assert_matches_recomputed(board)
+
+    def assert_matches_recomputed(self, board: Board):
+        geometry = board.geometry
+        pieces = {symbol: board.get_pieces_mask(symbol) for symbol in (PLAYER_SYMBOL, COMPUTER_SYMBOL)}
+
+        self.assertEqual(pieces[PLAYER_SYMBOL] & pieces[COMPUTER_SYMBOL], 0)
+
+        loaded_board = Board(board.rows, board.columns)
+        loaded_board.load_position(pieces[PLAYER_SYMBOL], pieces[COMPUTER_SYMBOL])
+        self.assertEqual(board.get_mobile_pieces_mask(PLAYER_SYMBOL), loaded_board.get_mobile_pieces_mask(PLAYER_SYMBOL))
+        self.assertEqual(board.get_mobile_pieces_mask(COMPUTER_SYMBOL), loaded_board.get_mobile_pieces_mask(COMPUTER_SYMBOL))
+        self.assertEqual(board.zobrist_hash, loaded_board.zobrist_hash)
+
+        winner = None
+        for symbol in (COMPUTER_SYMBOL, PLAYER_SYMBOL):
+            opponent_symbol = board.get_opponent_symbol(symbol)
+            # the rule of the game on the whole board: the opponent has one piece left or all its pieces are surrounded
+            has_won = pieces[opponent_symbol].bit_count() == 1 or is_immobilized(geometry, pieces[opponent_symbol], pieces[symbol])
+
+            self.assertEqual(board.has_won(symbol), has_won)
+            if has_won and winner is None:
+                winner = symbol
+
+        self.assertEqual(board.get_winner(), winner)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,111 @@
+import random
+import time
+import unittest
+
+from src.constants import COMPUTER_SYMBOL, PLAYER_SYMBOL
+from src.services.bitboard import maximum_capture_gain
+from src.services.board import Board
+from src.services.computer_strategies.computer_intelligent_strategy import ComputerIntelligentStrategy
+from src.services.evaluation import Evaluator, NUMBER_PIECES_COST, CAPTURE_MOVE_COST
+from src.services.search_statistics import SearchStatistics
+
+BOARD_SIZES = [(4, 4), (3, 4), (5, 6), (6, 6), (8, 8)]
+GAMES_PER_SIZE = 100
+MAXIMUM_PLIES = 80
+
+TIME_BUDGET = 0.5
+
+
+def play_random_moves(board: Board, generator, plies):
+    """
+    Play random moves from the start board, the computer first.
+    :return: symbol of the player to move
+    """
+    board.load_start_board()
+    symbol = COMPUTER_SYMBOL
+
+    for _ in range(plies):
+        moves = board.get_moves(symbol)
+        if len(moves) == 0 or board.get_winner() is not None:
+            break
+
+        board.apply_move(*generator.choice(moves), symbol)
+        symbol = board.get_opponent_symbol(symbol)
+
+    return symbol
+
+
+class TestQuiescenceSearch(unittest.TestCase):
+    def test_delta_margin_bounds_a_capture(self):
+        """
+        A capture that does not win moves the evaluation by at most number_pieces_cost + maximum_capture_gain() * capture_move_cost
+        for the capturing side, the delta margin of the quiescence search.
+        """
+        evaluator = Evaluator(cache_size=1)
+        generator = random.Random(0)
+
+        # a player capture that raises the difference of capturing moves by 5 on the 4 x 4 board
+        board = Board(4, 4)
+        board.load_position(0xa340, 0x4c95)
+        self.assertIn((8, 10), board.get_capturing_moves(PLAYER_SYMBOL))
+        self.assert_capture_within_margin(board, evaluator, (8, 10), PLAYER_SYMBOL)
+
+        for rows, columns in BOARD_SIZES:
+            board = Board(rows, columns)
+
+            for _ in range(GAMES_PER_SIZE):
+                board.load_start_board()
+                symbol = generator.choice([COMPUTER_SYMBOL, PLAYER_SYMBOL])
+
+                for _ in range(MAXIMUM_PLIES):
+                    moves = board.get_moves(symbol)
+                    if len(moves) == 0 or board.get_winner() is not None:
+                        break
+
+                    for move in board.get_capturing_moves(symbol):
+                        self.assert_capture_within_margin(board, evaluator, move, symbol)
+
+                    board.apply_move(*generator.choice(moves), symbol)
+                    symbol = board.get_opponent_symbol(symbol)
+
+    def assert_capture_within_margin(self, board: Board, evaluator: Evaluator, move, symbol):
+        delta_margin = NUMBER_PIECES_COST + maximum_capture_gain(board.geometry) * CAPTURE_MOVE_COST
+
+        before = evaluator.evaluate(board)
+        undo_record = board.apply_move(*move, symbol)
+        after = evaluator.evaluate(board)
+        has_won = board.has_won(symbol)
+        board.undo_move(undo_record)
+
+        if not has_won:
+            gain = after - before if symbol == COMPUTER_SYMBOL else before - after
+            self.assertLessEqual(gain, delta_margin)
+
+    def test_time_budget_on_large_board(self):
+        """
+        The first iteration is not stopped by the budget, the quiescence search must not make it run past the time budget.
+        """
+        generator = random.Random(1)
+        board = Board(10, 10)
+
+        for plies in (0, 10, 20, 30):
+            symbol = play_random_moves(board, generator, plies)
+            if symbol != COMPUTER_SYMBOL or board.get_winner() is not None:
+                continue
+
+            statistics = SearchStatistics()
+            strategy = ComputerIntelligentStrategy(board, target_depth=20, time_budget=TIME_BUDGET, opening_book_path=None,
+                                                   statistics=statistics, quiescence=True)
+
+            start = time.perf_counter()
+            move = strategy.get_move()
+            seconds = time.perf_counter() - start
+
+            self.assertIsNotNone(move)
+            self.assertGreater(statistics.quiescence_nodes, 0)
+            # the budget is checked every 256 nodes, leave some room for the last ones
+            self.assertLess(seconds, 2 * TIME_BUDGET)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,78 @@
+import random
+import unittest
+
+from src.constants import COMPUTER_SYMBOL, PLAYER_SYMBOL
+from src.exceptions import NoValidMoveError
+from src.services.board import Board
+from src.services.computer_strategies.computer_random_strategy import ComputerRandomStrategy
+
+BOARD_SIZES = [(4, 4), (5, 6)]
+MAXIMUM_PLIES = 80
+
+
+def play_game(rows, columns, seed, player_generator):
+    """
+    Play the seeded strategy against random player moves.
+    :return: list of the computer moves, (piece_position, move_position)
+    """
+    board = Board(rows, columns)
+    board.load_start_board()
+    strategy = ComputerRandomStrategy(board, seed=seed)
+    symbol = COMPUTER_SYMBOL
+    computer_moves = []
+
+    for _ in range(MAXIMUM_PLIES):
+        moves = board.get_moves(symbol)
+        if len(moves) == 0 or board.get_winner() is not None:
+            break
+
+        if symbol == COMPUTER_SYMBOL:
+            piece_position, move_position = strategy.get_move()
+            computer_moves.append((piece_position, move_position))
+            board.move(piece_position, move_position, COMPUTER_SYMBOL)
+        else:
+            board.apply_move(*player_generator.choice(moves), symbol)
+        symbol = board.get_opponent_symbol(symbol)
+
+    return computer_moves
+
+
+class TestComputerRandomStrategy(unittest.TestCase):
+    def test_seed_reproduces_the_game(self):
+        for rows, columns in BOARD_SIZES:
+            computer_moves = play_game(rows, columns, 7, random.Random(0))
+
+            self.assertGreater(len(computer_moves), 1)
+            self.assertEqual(play_game(rows, columns, 7, random.Random(0)), computer_moves)
+            # the moves come from the seed, not from the player moves alone
+            self.assertNotEqual(play_game(rows, columns, 8, random.Random(0)), computer_moves)
+
+    def test_moves_are_valid_and_all_chosen(self):
+        board = Board()
+        board.load_start_board()
+        strategy = ComputerRandomStrategy(board, seed=0)
+        moves = set(board.get_moves(COMPUTER_SYMBOL))
+
+        chosen_moves = set()
+        for _ in range(50 * len(moves)):
+            piece_position, move_position = strategy.get_move()
+            chosen_moves.add((board.geometry.index(*piece_position), board.geometry.index(*move_position)))
+
+        # every valid move is chosen, and nothing else
+        self.assertEqual(chosen_moves, moves)
+
+    def test_no_valid_move(self):
+        board = Board()
+        # computer pieces in the top corners, each blocked by two player pieces and with no own piece to jump over
+        board.load_position(1 << 1 | 1 << 4 | 1 << 2 | 1 << 7, 1 << 0 | 1 << 3)
+        self.assertEqual(board.get_moves(COMPUTER_SYMBOL), [])
+        self.assertNotEqual(board.get_moves(PLAYER_SYMBOL), [])
+
+        with self.assertRaises(NoValidMoveError):
+            ComputerRandomStrategy(board, seed=0).get_move()
+        with self.assertRaises(NoValidMoveError):
+            ComputerRandomStrategy(board).get_move()
+
+
+if __name__ == "__main__":
+    unittest.main()
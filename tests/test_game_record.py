@@ -0,0 +1,149 @@
+import os
+import random
+import tempfile
+import unittest
+
+from src.constants import COMPUTER_SYMBOL, PLAYER_SYMBOL, POSITION
+from src.exceptions import BoardError
+from src.services.board import Board
+from src.services.computer_strategies.computer_random_strategy import ComputerRandomStrategy
+from src.services.game import Game
+from src.services.game_record import GameRecord, GameRecordWriter, read_game_records
+
+BOARD_SIZES = [(4, 4), (3, 4), (5, 6), (6, 6)]
+GAMES_PER_SIZE = 25
+MAXIMUM_PLIES = 80
+
+
+def play_random_game(rows, columns, generator):
+    """
+    Play a game of random moves through Game, the player moves are drawn from 'generator'.
+    :return: (Game, Board) at the end of the game
+    """
+    board = Board(rows, columns)
+    board.load_start_board()
+    game = Game(board, ComputerRandomStrategy(board, seed=generator.random()))
+    symbol = generator.choice([COMPUTER_SYMBOL, PLAYER_SYMBOL])
+
+    for _ in range(MAXIMUM_PLIES):
+        moves = board.get_moves(symbol)
+        if len(moves) == 0 or board.get_winner() is not None:
+            break
+
+        if symbol == PLAYER_SYMBOL:
+            piece_index, move_index = generator.choice(moves)
+            game.player_move(*board.geometry.row_column(piece_index), *board.geometry.row_column(move_index))
+        else:
+            game.computer_move()
+        symbol = board.get_opponent_symbol(symbol)
+
+    return game, board
+
+
+class TestGameRecord(unittest.TestCase):
+    def test_line_layout(self):
+        record = GameRecord(4, 4, 0xff00, 0xff, COMPUTER_SYMBOL, [(0, 8), (13, 5)])
+
+        self.assertEqual(record.to_line(), "4 4 ff00 ff X - 8 213")
+        self.assertEqual(GameRecord(4, 4).to_line(), "4 4 ff00 ff - -")
+
+    def test_round_trip_and_replay(self):
+        """
+        Records of random games come back unchanged from their line, and replaying them rebuilds the final board of the game.
+        """
+        generator = random.Random(0)
+
+        for rows, columns in BOARD_SIZES:
+            for _ in range(GAMES_PER_SIZE):
+                game, board = play_random_game(rows, columns, generator)
+                record = game.get_record()
+                line = record.to_line()
+
+                read_record = GameRecord.from_line(line + "\n")
+                self.assertEqual(read_record.to_line(), line)
+                self.assertEqual((read_record.rows, read_record.columns), (rows, columns))
+                self.assertEqual(read_record.moves, [(piece_index, move_index) for _, piece_index, move_index in game.history])
+                self.assertEqual(read_record.first_symbol, game.history[0][0])
+                self.assertEqual(read_record.winner, record.winner)
+
+                replayed_board = read_record.replay()
+                self.assertEqual(replayed_board.get_pieces_mask(PLAYER_SYMBOL), board.get_pieces_mask(PLAYER_SYMBOL))
+                self.assertEqual(replayed_board.get_pieces_mask(COMPUTER_SYMBOL), board.get_pieces_mask(COMPUTER_SYMBOL))
+                self.assertEqual(replayed_board.zobrist_hash, board.zobrist_hash)
+
+                # the players alternate from the first one
+                for ply, (symbol, _, _) in enumerate(game.history):
+                    self.assertEqual(read_record.get_symbol(ply), symbol)
+
+    def test_partial_replay(self):
+        board = Board()
+        board.load_start_board()
+        record = GameRecord(4, 4, board.get_pieces_mask(PLAYER_SYMBOL), board.get_pieces_mask(COMPUTER_SYMBOL), PLAYER_SYMBOL, [(12, 4), (0, 8)])
+
+        self.assertEqual(record.replay(0).get_pieces_mask(PLAYER_SYMBOL), board.get_pieces_mask(PLAYER_SYMBOL))
+
+        board.move(POSITION(3, 0), POSITION(1, 0), PLAYER_SYMBOL)
+        self.assertEqual(record.replay(1).get_pieces_mask(PLAYER_SYMBOL), board.get_pieces_mask(PLAYER_SYMBOL))
+        self.assertEqual(record.replay(1).get_pieces_mask(COMPUTER_SYMBOL), board.get_pieces_mask(COMPUTER_SYMBOL))
+
+    def test_replay_of_an_invalid_move(self):
+        # the player piece of cell 12 cannot move onto its own piece of cell 8
+        record = GameRecord(4, 4, first_symbol=PLAYER_SYMBOL, moves=[(12, 8)])
+
+        with self.assertRaises(BoardError):
+            record.replay()
+
+    def test_malformed_lines(self):
+        for line in ["", "4 4 ff00 ff X", "four 4 ff00 ff X -", "4 4 ff00 zz X -", "4 4 ff00 ff Q -", "4 4 ff00 ff X Y", "4 4 ff00 ff X - 8 two"]:
+            with self.subTest(line=line):
+                with self.assertRaises(ValueError):
+                    GameRecord.from_line(line)
+
+
+class TestGameRecordFile(unittest.TestCase):
+    def setUp(self):
+        self.path = os.path.join(tempfile.mkdtemp(), "records.txt")
+
+    def test_write_and_read(self):
+        generator = random.Random(1)
+        records = [play_random_game(rows, columns, generator)[0].get_record() for rows, columns in BOARD_SIZES]
+
+        with GameRecordWriter(self.path, append=False) as writer:
+            for record in records[:2]:
+                writer.write(record)
+
+        # appended after the first ones, with an empty line that the reader skips
+        with open(self.path, "a", encoding="ascii") as file:
+            file.write("\n")
+        with GameRecordWriter(self.path) as writer:
+            for record in records[2:]:
+                writer.write(record)
+
+        read_records = read_game_records(self.path)
+        # a generator, the records are read one at a time
+        self.assertEqual(next(read_records).to_line(), records[0].to_line())
+        self.assertEqual([record.to_line() for record in read_records], [record.to_line() for record in records[1:]])
+
+    def test_flush(self):
+        record = GameRecord(4, 4, 0xff00, 0xff, COMPUTER_SYMBOL, [(0, 8)])
+        writer = GameRecordWriter(self.path, append=False, flush=True)
+
+        try:
+            writer.write(record)
+            # on disk before the writer is closed
+            self.assertEqual([read_record.to_line() for read_record in read_game_records(self.path)], [record.to_line()])
+        finally:
+            writer.close()
+
+    def test_malformed_line_in_file(self):
+        with open(self.path, "w", encoding="ascii") as file:
+            file.write("4 4 ff00 ff X - 8\n4 4 ff00\n")
+
+        read_records = read_game_records(self.path)
+        self.assertEqual(next(read_records).moves, [(0, 8)])
+        with self.assertRaises(ValueError):
+            next(read_records)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,186 @@
+import asyncio
+import os
+import random
+import socket
+import tempfile
+import unittest
+
+from src.constants import COMPUTER_SYMBOL, PLAYER_SYMBOL, EMPTY_CELL_SYMBOL, POSITION
+from src.server.game_server import EnginePool, GameSession, MAXIMUM_LINE_LENGTH
+from src.services.board import Board
+from src.services.game_record import GameRecordWriter, read_game_records
+
+# seconds an answer may take, the easy and medium levels answer at once
+ANSWER_TIMEOUT = 30
+MAXIMUM_PLIES = 200
+
+
+def board_line(board: Board):
+    return "BOARD " + "/".join("".join(board.get_board_symbol(row, column) for column in range(board.columns)).replace(EMPTY_CELL_SYMBOL, ".")
+                               for row in range(board.rows))
+
+
+class SessionTestCase(unittest.IsolatedAsyncioTestCase):
+    """
+    Runs a GameSession on one end of a socket pair, the test is the client on the other end.
+    """
+    def create_pool(self):
+        pool = EnginePool(workers=1)
+        pool.start()
+        return pool
+
+    async def asyncSetUp(self):
+        self.pool = self.create_pool()
+        self.records_path = os.path.join(tempfile.mkdtemp(), "records.txt")
+        self.records_writer = None
+
+        server_socket, client_socket = socket.socketpair()
+        server_reader, server_writer = await asyncio.open_connection(sock=server_socket, limit=MAXIMUM_LINE_LENGTH)
+        self.reader, self.writer = await asyncio.open_connection(sock=client_socket)
+        self.session = asyncio.ensure_future(GameSession(self.pool, self.get_records_writer()).handle(server_reader, server_writer))
+
+    def get_records_writer(self):
+        return None
+
+    async def asyncTearDown(self):
+        self.writer.close()
+        await asyncio.wait_for(self.session, ANSWER_TIMEOUT)
+        await self.pool.close()
+
+    async def send(self, line: bytes, answers = 1):
+        """
+        :return: list of the next 'answers' answer lines, without the line ends
+        """
+        self.writer.write(line + b"\n")
+        await self.writer.drain()
+
+        return [await self.read_answer() for _ in range(answers)]
+
+    async def read_answer(self):
+        return (await asyncio.wait_for(self.reader.readline(), ANSWER_TIMEOUT)).decode("ascii").rstrip("\n")
+
+
+class TestGameSessionProtocol(SessionTestCase):
+    def get_records_writer(self):
+        self.records_writer = GameRecordWriter(self.records_path, flush=True)
+        return self.records_writer
+
+    async def asyncTearDown(self):
+        await super().asyncTearDown()
+        self.records_writer.close()
+
+    async def test_errors(self):
+        self.assertEqual(await self.send(b""), ["ERROR empty command"])
+        self.assertEqual(await self.send(b"JUMP 1 2"), ["ERROR unknown command JUMP"])
+        self.assertEqual(await self.send(b"MOVE 3 0 1 0"), ["ERROR no game, start one with NEW"])
+        self.assertEqual(await self.send(b"NEW"), ["ERROR usage: NEW <easy|medium|hard> [player|computer]"])
+        self.assertEqual(await self.send(b"NEW impossible"), ["ERROR usage: NEW <easy|medium|hard> [player|computer]"])
+        self.assertEqual(await self.send(b"NEW easy nobody"), ["ERROR usage: NEW <easy|medium|hard> [player|computer]"])
+        self.assertEqual(await self.send("MOVE 3 0 1 0 é".encode("utf-8")), ["ERROR commands are ASCII only"])
+
+        self.assertEqual(await self.send(b"NEW easy player"), ["OK NEW 4 4 player"])
+        self.assertEqual(await self.send(b"MOVE 3 0 one 0"), ["ERROR usage: MOVE <row> <column> <row> <column>"])
+        # a player piece cannot move onto another player piece
+        self.assertTrue((await self.send(b"MOVE 3 0 2 0"))[0].startswith("ERROR "))
+
+        # the session goes on after the errors
+        board = Board()
+        board.load_start_board()
+        self.assertEqual(await self.send(b"BOARD"), [board_line(board)])
+
+    async def test_game_against_the_computer(self):
+        """
+        Play random player moves until the game is over, the BOARD answers follow the moves played on a local board.
+        """
+        self.assertEqual(await self.send(b"NEW medium player"), ["OK NEW 4 4 player"])
+        board = Board()
+        board.load_start_board()
+        generator = random.Random(0)
+
+        answer = None
+        for _ in range(MAXIMUM_PLIES):
+            piece_index, move_index = generator.choice(board.get_moves(PLAYER_SYMBOL))
+            piece_position, move_position = board.geometry.row_column(piece_index), board.geometry.row_column(move_index)
+            board.move(POSITION(*piece_position), POSITION(*move_position), PLAYER_SYMBOL)
+
+            answer = (await self.send("MOVE {} {} {} {}".format(*piece_position, *move_position).encode("ascii")))[0]
+            if answer.startswith("GAMEOVER"):
+                break
+
+            fields = answer.split()
+            self.assertEqual(fields[0], "COMPUTER")
+            row, column, move_row, move_column = (int(field) for field in fields[1:])
+            board.move(POSITION(row, column), POSITION(move_row, move_column), COMPUTER_SYMBOL)
+
+            if board.has_won(COMPUTER_SYMBOL) or len(board.get_moves(PLAYER_SYMBOL)) == 0:
+                # announced right after the move
+                answer = await self.read_answer()
+                break
+
+            self.assertEqual(await self.send(b"BOARD"), [board_line(board)])
+
+        self.assertTrue(answer.startswith("GAMEOVER "), answer)
+        self.assertEqual(await self.send(b"MOVE 3 0 1 0"), ["ERROR no game, start one with NEW"])
+
+        # the finished game is in the records, flushed with the answer
+        records = list(read_game_records(self.records_path))
+        self.assertEqual(len(records), 1)
+        self.assertEqual(records[0].winner, answer.split()[1])
+        self.assertEqual(records[0].replay().get_pieces_mask(PLAYER_SYMBOL), board.get_pieces_mask(PLAYER_SYMBOL))
+        self.assertEqual(records[0].replay().get_pieces_mask(COMPUTER_SYMBOL), board.get_pieces_mask(COMPUTER_SYMBOL))
+
+    async def test_computer_first(self):
+        answers = await self.send(b"NEW easy computer", answers=2)
+        self.assertEqual(answers[0], "OK NEW 4 4 computer")
+        self.assertEqual(answers[1].split()[0], "COMPUTER")
+        self.assertEqual(len(answers[1].split()), 5)
+
+    async def test_quit(self):
+        self.assertEqual(await self.send(b"QUIT"), ["OK BYE"])
+        self.assertEqual(await asyncio.wait_for(self.reader.readline(), ANSWER_TIMEOUT), b"")
+        await asyncio.wait_for(self.session, ANSWER_TIMEOUT)
+
+    async def test_line_too_long(self):
+        self.writer.write(b"B" * (2 * MAXIMUM_LINE_LENGTH) + b"\n")
+        await self.writer.drain()
+
+        self.assertEqual(await asyncio.wait_for(self.reader.readline(), ANSWER_TIMEOUT), b"")
+        await asyncio.wait_for(self.session, ANSWER_TIMEOUT)
+
+
+class WaitingPool(object):
+    """
+    Engine pool that never answers, the requests stay pending until they are cancelled.
+    """
+    def __init__(self):
+        self.requests = []
+        self.requested = asyncio.Event()
+
+    async def close(self):
+        pass
+
+    async def search(self, level, board: Board):
+        future = asyncio.get_running_loop().create_future()
+        self.requests.append(future)
+        self.requested.set()
+
+        return await future
+
+
+class TestGameSessionDisconnection(SessionTestCase):
+    def create_pool(self):
+        return WaitingPool()
+
+    async def test_disconnection_cancels_the_computer_move(self):
+        self.writer.write(b"NEW hard computer\n")
+        await self.writer.drain()
+        await asyncio.wait_for(self.pool.requested.wait(), ANSWER_TIMEOUT)
+
+        self.writer.close()
+        await asyncio.wait_for(self.session, ANSWER_TIMEOUT)
+
+        self.assertTrue(self.pool.requests[0].cancelled())
+
+
+if __name__ == "__main__":
+    unittest.main()
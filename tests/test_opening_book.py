@@ -0,0 +1,112 @@
+import os
+import tempfile
+import unittest
+
+from src.constants import COMPUTER_SYMBOL, PLAYER_SYMBOL
+from src.services.board import Board
+from src.services.opening_book import OpeningBook, load_opening_book, DEFAULT_OPENING_BOOK_PATH
+from src.services.symmetry import get_symmetries
+from tests.test_symmetry import transform_board
+
+# plies of the default book (src/tools/build_opening_book.py), one more to also probe positions just out of the book
+BOOK_PLIES = 7
+
+
+def book_positions(rows, columns, plies):
+    """
+    :return: list of (Board, symbol of the player to move) of every position the first plies can reach from the start board, with either
+             player first
+    """
+    positions = {}
+    board = Board(rows, columns)
+
+    def explore(symbol, plies_left):
+        key = (board.get_pieces_mask(PLAYER_SYMBOL), board.get_pieces_mask(COMPUTER_SYMBOL), symbol)
+        if key in positions or board.get_winner() is not None:
+            return
+
+        position = Board(rows, columns)
+        position.load_position(key[0], key[1])
+        positions[key] = (position, symbol)
+
+        if plies_left == 0:
+            return
+
+        for move in board.get_moves(symbol):
+            undo_record = board.apply_move(*move, symbol)
+            explore(board.get_opponent_symbol(symbol), plies_left - 1)
+            board.undo_move(undo_record)
+
+    for first_symbol in (COMPUTER_SYMBOL, PLAYER_SYMBOL):
+        board.load_start_board()
+        explore(first_symbol, plies)
+
+    return list(positions.values())
+
+
+class TestOpeningBook(unittest.TestCase):
+    def assert_book_moves_legal(self, book: OpeningBook, positions):
+        """
+        Probe every position under every symmetry: each book move is legal and is the move of the position mapped by the symmetry.
+        :return: number of positions found in the book
+        """
+        found = 0
+
+        for board, symbol in positions:
+            move = book.get_board_move(board, symbol)
+            if move is None:
+                continue
+
+            found += 1
+            self.assertIn(move, board.get_moves(symbol))
+            self.assertEqual(book.get_move(board.get_pieces_mask(symbol), board.get_pieces_mask(board.get_opponent_symbol(symbol))), move)
+
+            symmetries = get_symmetries(board.rows, board.columns)
+            for symmetry in symmetries:
+                transformed_board = transform_board(board, symmetry)
+                transformed_move = book.get_board_move(transformed_board, symbol)
+                self.assertIn(transformed_move, transformed_board.get_moves(symbol))
+
+                # the move of the position, mapped by a symmetry that gives the transformed position (there are several if the position is
+                # symmetric itself)
+                self.assertIn(transformed_move, {other.transform_move(move) for other in symmetries if self.same_position(transform_board(board, other), transformed_board)})
+
+        return found
+
+    @staticmethod
+    def same_position(board: Board, other_board: Board):
+        return all(board.get_pieces_mask(symbol) == other_board.get_pieces_mask(symbol) for symbol in (PLAYER_SYMBOL, COMPUTER_SYMBOL))
+
+    def test_default_book(self):
+        book = load_opening_book(DEFAULT_OPENING_BOOK_PATH)
+        if book is None:
+            self.skipTest("no opening book at {}".format(DEFAULT_OPENING_BOOK_PATH))
+
+        self.assertGreater(self.assert_book_moves_legal(book, book_positions(book.rows, book.columns, BOOK_PLIES)), 0)
+
+    def test_added_moves_answer_for_symmetric_positions(self):
+        for rows, columns in [(4, 4), (3, 4), (5, 6)]:
+            book = OpeningBook(rows, columns)
+            positions = book_positions(rows, columns, 2)
+
+            for board, symbol in positions:
+                book.add(board.get_pieces_mask(symbol), board.get_pieces_mask(board.get_opponent_symbol(symbol)), board.get_moves(symbol)[-1])
+
+            self.assertEqual(self.assert_book_moves_legal(book, positions), len(positions))
+
+    def test_write_and_read(self):
+        book = OpeningBook(4, 4)
+        for board, symbol in book_positions(4, 4, 3):
+            book.add(board.get_pieces_mask(symbol), board.get_pieces_mask(board.get_opponent_symbol(symbol)), board.get_moves(symbol)[0])
+
+        path = os.path.join(tempfile.mkdtemp(), "test.book")
+        book.write(path)
+        read_book = OpeningBook.read(path)
+
+        self.assertEqual(len(read_book), len(book))
+        for board, symbol in book_positions(4, 4, 3):
+            self.assertEqual(read_book.get_board_move(board, symbol), book.get_board_move(board, symbol))
+
+
+if __name__ == "__main__":
+    unittest.main()
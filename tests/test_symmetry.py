@@ -0,0 +1,118 @@
+import random
+import unittest
+
+from src.constants import COMPUTER_SYMBOL, PLAYER_SYMBOL
+from src.services.bitboard import bit_indexes
+from src.services.board import Board
+from src.services.symmetry import get_symmetries, canonical_key, IDENTITY
+
+BOARD_SIZES = [(4, 4), (3, 4), (5, 6), (6, 6)]
+POSITIONS_PER_SIZE = 200
+MAXIMUM_PLIES = 30
+
+
+def random_positions(rows, columns, generator, count):
+    """
+    :return: list of (Board, symbol of the player to move) reached by random moves from the start board
+    """
+    positions = []
+    board = Board(rows, columns)
+
+    while len(positions) < count:
+        board.load_start_board()
+        symbol = generator.choice([COMPUTER_SYMBOL, PLAYER_SYMBOL])
+
+        for _ in range(generator.randrange(MAXIMUM_PLIES)):
+            moves = board.get_moves(symbol)
+            if len(moves) == 0 or board.get_winner() is not None:
+                break
+
+            board.apply_move(*generator.choice(moves), symbol)
+            symbol = board.get_opponent_symbol(symbol)
+
+        position = Board(rows, columns)
+        position.load_position(board.get_pieces_mask(PLAYER_SYMBOL), board.get_pieces_mask(COMPUTER_SYMBOL))
+        positions.append((position, symbol))
+
+    return positions
+
+
+def transform_board(board: Board, symmetry):
+    """
+    :return: new Board with the pieces of 'board' moved by the symmetry
+    """
+    transformed_board = Board(board.rows, board.columns)
+    transformed_board.load_position(symmetry.transform_mask(board.get_pieces_mask(PLAYER_SYMBOL)), symmetry.transform_mask(board.get_pieces_mask(COMPUTER_SYMBOL)))
+
+    return transformed_board
+
+
+class TestSymmetries(unittest.TestCase):
+    def test_symmetries_of_a_size(self):
+        for rows, columns in BOARD_SIZES + [(2, 5), (7, 7)]:
+            with self.subTest(rows=rows, columns=columns):
+                symmetries = get_symmetries(rows, columns)
+
+                self.assertEqual(len(symmetries), 8 if rows == columns else 4)
+                self.assertEqual(symmetries[0].name, IDENTITY)
+                self.assertEqual(symmetries[0].permutation, tuple(range(rows * columns)))
+                self.assertEqual(len({symmetry.permutation for symmetry in symmetries}), len(symmetries))
+
+                for symmetry in symmetries:
+                    self.assertEqual(sorted(symmetry.permutation), list(range(rows * columns)))
+                    # the symmetries are a group: the inverse of every one is one of them
+                    self.assertIn(symmetry.inverse_permutation, {other.permutation for other in symmetries})
+
+    def test_transform_mask_and_moves(self):
+        """
+        Masks are moved cell by cell, and the moves of a position are moved to exactly the moves of the transformed position.
+        """
+        generator = random.Random(0)
+
+        for rows, columns in BOARD_SIZES:
+            for board, symbol in random_positions(rows, columns, generator, POSITIONS_PER_SIZE):
+                pieces = board.get_pieces_mask(symbol)
+
+                for symmetry in get_symmetries(rows, columns):
+                    self.assertEqual(symmetry.transform_mask(pieces), sum(1 << symmetry.permutation[index] for index in bit_indexes(pieces)))
+
+                    transformed_board = transform_board(board, symmetry)
+                    moves = board.get_moves(symbol)
+                    self.assertEqual({symmetry.transform_move(move) for move in moves}, set(transformed_board.get_moves(symbol)))
+                    self.assertEqual([symmetry.restore_move(symmetry.transform_move(move)) for move in moves], moves)
+                    self.assertEqual(transformed_board.has_won(symbol), board.has_won(symbol))
+
+
+class TestCanonicalKey(unittest.TestCase):
+    def test_symmetric_boards_share_the_key(self):
+        generator = random.Random(1)
+
+        for rows, columns in BOARD_SIZES:
+            for board, symbol in random_positions(rows, columns, generator, POSITIONS_PER_SIZE):
+                key, symmetry = canonical_key(board, symbol)
+                opponent_symbol = board.get_opponent_symbol(symbol)
+
+                # the symmetry returned maps the board to the key
+                self.assertEqual(key, (symmetry.transform_mask(board.get_pieces_mask(symbol)), symmetry.transform_mask(board.get_pieces_mask(opponent_symbol))))
+
+                for other_symmetry in get_symmetries(rows, columns):
+                    transformed_board = transform_board(board, other_symmetry)
+                    self.assertEqual(canonical_key(transformed_board, symbol)[0], key)
+
+                # the key is the same whatever the colour of the player to move
+                swapped_board = Board(rows, columns)
+                swapped_board.load_position(board.get_pieces_mask(COMPUTER_SYMBOL), board.get_pieces_mask(PLAYER_SYMBOL))
+                self.assertEqual(canonical_key(swapped_board, opponent_symbol)[0], key)
+
+    def test_key_is_the_smallest_transform(self):
+        generator = random.Random(2)
+
+        for board, symbol in random_positions(4, 4, generator, POSITIONS_PER_SIZE):
+            own, opponent = board.get_pieces_mask(symbol), board.get_pieces_mask(board.get_opponent_symbol(symbol))
+            transforms = [(symmetry.transform_mask(own), symmetry.transform_mask(opponent)) for symmetry in get_symmetries(4, 4)]
+
+            self.assertEqual(canonical_key(board, symbol)[0], min(transforms))
+
+
+if __name__ == "__main__":
+    unittest.main()